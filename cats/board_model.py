@@ -0,0 +1,191 @@
+"""
+Precompiled move tables for a cats game board.
+"""
+from functools import lru_cache
+
+
+class BoardModel:
+    """
+    Move tables of one board, compiled once from (blocks, m, n).
+
+    For every free cell the model keeps the list of cells a piece standing
+    there may move to (including staying), already honoring the board bounds
+    and the blocks. Move generation then only has to check occupancy.
+
+    Parameters:
+    -----------
+    blocks : frozenset
+        Set of blocked cells
+    m : int
+        Number of rows in the board
+    n : int
+        Number of columns in the board
+    """
+    DIRS = [(-1, 0), (1, 0), (0, -1), (0, 1), (0, 0)]
+
+    def __init__(self, blocks, m, n):
+        self.blocks = blocks
+        self.m = m
+        self.n = n
+        self.destinations = {}
+        for y in range(m):
+            for x in range(n):
+                self.destinations[(y, x)] = [
+                    (y + dy, x + dx) for dy, dx in self.DIRS
+                    if 0 <= y + dy < m and 0 <= x + dx < n and (y + dy, x + dx) not in blocks
+                ]
+        # The cells a piece may have come from, for generating unmoves
+        self.sources = {}
+        for pos, targets in self.destinations.items():
+            if pos in blocks:
+                continue
+            for target in targets:
+                self.sources.setdefault(target, []).append(pos)
+        self.symmetries = self._symmetries()
+
+    def _symmetries(self):
+        # Reflections and rotations of the board that map the blocks onto themselves
+        m, n = self.m, self.n
+        transforms = [
+            lambda y, x: (y, x),
+            lambda y, x: (m - 1 - y, x),
+            lambda y, x: (y, n - 1 - x),
+            lambda y, x: (m - 1 - y, n - 1 - x),
+        ]
+        if m == n:
+            transforms += [
+                lambda y, x: (x, y),
+                lambda y, x: (n - 1 - x, n - 1 - y),
+                lambda y, x: (x, n - 1 - y),
+                lambda y, x: (n - 1 - x, y),
+            ]
+        symmetries = []
+        for transform in transforms:
+            mapping = {(y, x): transform(y, x) for y in range(m) for x in range(n)}
+            if {mapping.get(block, block) for block in self.blocks} == set(self.blocks) and mapping not in symmetries:
+                symmetries.append(mapping)
+        return symmetries
+
+    def canonical(self, state):
+        """
+        Returns the smallest image of a state under the board's symmetries.
+
+        Symmetric states have the same score, so a solver can keep one
+        representative per class. The identity is always the first symmetry.
+        """
+        if len(self.symmetries) == 1:
+            return state
+        mice_pos, cats_pos, turn = state
+        best = state
+        for mapping in self.symmetries[1:]:
+            image = (tuple(sorted(mapping[pos] for pos in mice_pos)),
+                     tuple(sorted(mapping[pos] for pos in cats_pos)), turn)
+            if image < best:
+                best = image
+        return best
+
+    def orbit(self, state):
+        """
+        Returns the set of distinct states symmetric to state (itself included).
+        """
+        mice_pos, cats_pos, turn = state
+        return {(tuple(sorted(mapping[pos] for pos in mice_pos)),
+                 tuple(sorted(mapping[pos] for pos in cats_pos)), turn) for mapping in self.symmetries}
+
+    def orbit_size(self, state):
+        """
+        Returns the number of distinct states symmetric to state (itself included).
+        """
+        return len(self.orbit(state))
+
+    def next_states(self, mice_pos, cats_pos, turn):
+        """
+        Returns the states reachable in one move, in the same order as
+        itertools.product over the pieces' options.
+
+        Mice can't move into other mice or cats; cats can't move into other
+        cats but can move into mice. Destinations already taken by an earlier
+        piece are pruned while the product is built.
+
+        Parameters:
+        -----------
+        mice_pos : tuple
+            Sorted (y, x) positions of the mice
+        cats_pos : tuple
+            Sorted (y, x) positions of the cats
+        turn : int
+            0 for mice's turn, 1 for cats' turn
+
+        Returns:
+        --------
+        list
+            List of (mice_pos, cats_pos, turn) next states
+        """
+        destinations = self.destinations
+        if turn == 0:
+            movers = mice_pos
+            own = set(mice_pos)
+            others = set(cats_pos)
+        else:
+            movers = cats_pos
+            own = set(cats_pos)
+            others = ()
+        partial = [()]
+        for pos in movers:
+            options = [npos for npos in destinations.get(pos, ())
+                       if npos not in others and (npos == pos or npos not in own)]
+            partial = [chosen + (npos,) for chosen in partial for npos in options if npos not in chosen]
+        if turn == 0:
+            return [(tuple(sorted(new_mice)), cats_pos, 1) for new_mice in partial]
+        return [(mice_pos, tuple(sorted(new_cats)), 0) for new_cats in partial]
+
+    def previous_states(self, mice_pos, cats_pos, turn):
+        """
+        Returns the distinct states from which one move reaches the given state.
+
+        This is the exact inverse of next_states: a state with the cats to
+        move was reached by a mice move, and the other way around. Every piece
+        of the side that just moved either stayed or came from a free cell
+        next to it, the pieces came from distinct cells, and no piece moved
+        into a cell that another piece of its side had left. Mice never end a
+        move on a cat, so such states with the cats to move have no
+        predecessors; cats may have moved onto mice.
+
+        Parameters:
+        -----------
+        mice_pos : tuple
+            Sorted (y, x) positions of the mice
+        cats_pos : tuple
+            Sorted (y, x) positions of the cats
+        turn : int
+            0 for mice's turn, 1 for cats' turn
+
+        Returns:
+        --------
+        list
+            List of (mice_pos, cats_pos, turn) previous states
+        """
+        if turn == 1:
+            if set(mice_pos) & set(cats_pos):
+                return []
+            movers = mice_pos
+        else:
+            movers = cats_pos
+        taken = set(movers)
+        partial = [()]
+        for pos in movers:
+            # A piece can't have moved into a cell another piece of its side left
+            options = [source for source in self.sources.get(pos, ()) if source == pos or source not in taken]
+            partial = [chosen + (source,) for chosen in partial for source in options if source not in chosen]
+        previous = {tuple(sorted(sources)) for sources in partial}
+        if turn == 1:
+            return [(sources, cats_pos, 0) for sources in previous]
+        return [(mice_pos, sources, 1) for sources in previous]
+
+
+@lru_cache(maxsize=32)
+def board_model(blocks, m, n):
+    """
+    Returns the BoardModel of a board, compiling it on first use.
+    """
+    return BoardModel(blocks, m, n)
@@ -1,9 +1,9 @@
-import itertools
 from collections import deque
 import time
 
 # Import solvers from solvers package
-from solvers import ALL_SOLVERS, BEST_SOLVER
+from solvers import ALL_SOLVERS, BEST_SOLVER, PARTIAL_SOLVERS, tablebase
+from board_model import board_model
 
 class Cats:
     def __init__(self, state):
@@ -35,49 +35,12 @@ class Cats:
         return bool(set(mice_pos) & set(cats_pos))
 
     def get_next_states(self, mice_pos, cats_pos, turn, blocks, m, n):
-        DIRS = [(-1,0),(1,0),(0,-1),(0,1),(0,0)]
-        def in_bounds(y, x):
-            return 0 <= y < m and 0 <= x < n
-        def is_free(pos, others, blocks):
-            # During mice's turn, others = other mice + cats (can't move into either)
-            # During cats' turn, others = other cats only (can move into mice's cell)
-            return pos not in others and pos not in blocks and in_bounds(*pos)
-        next_states = []
-        if turn == 0:
-            mice_moves = []
-            for pos in mice_pos:
-                options = []
-                for dy, dx in DIRS:
-                    ny, nx = pos[0]+dy, pos[1]+dx
-                    npos = (ny, nx)
-                    # Mice can't move into other mice or cats
-                    if is_free(npos, set(mice_pos)-{pos} | set(cats_pos), blocks):
-                        options.append(npos)
-                mice_moves.append(options)
-            for new_mice in itertools.product(*mice_moves):
-                if len(set(new_mice)) < len(mice_pos):
-                    continue
-                # Always flip turn to 1 (cat's turn)
-                next_states.append((tuple(sorted(new_mice)), cats_pos, 1))
-        else:
-            cats_moves = []
-            for pos in cats_pos:
-                options = []
-                for dy, dx in DIRS:
-                    ny, nx = pos[0]+dy, pos[1]+dx
-                    npos = (ny, nx)
-                    # Cats can't move into other cats, but CAN move into mice
-                    if is_free(npos, set(cats_pos)-{pos}, blocks):
-                        options.append(npos)
-                cats_moves.append(options)
-            for new_cats in itertools.product(*cats_moves):
-                if len(set(new_cats)) < len(cats_pos):
-                    continue
-                # Always flip turn to 0 (mouse's turn)
-                next_states.append((mice_pos, tuple(sorted(new_cats)), 0))
-        # Filter out any state that doesn't flip the turn (shouldn't happen, but for safety)
-        next_states = [s for s in next_states if s[2] != turn]
-        return next_states
+        # The move tables of the board are compiled once and shared by all calls
+        return board_model(blocks, m, n).next_states(mice_pos, cats_pos, turn)
+
+    def get_previous_states(self, mice_pos, cats_pos, turn, blocks, m, n):
+        # Unmoves: the exact inverse of get_next_states
+        return board_model(blocks, m, n).previous_states(mice_pos, cats_pos, turn)
 
     def print_queue_states(self, queue, visited, queue_max_size=10):
         if not hasattr(self, 'iteration_count'):
@@ -146,6 +109,8 @@ class Cats:
         mice_pos, cats_pos, turn, blocks, m, n = start_state
         result_state = (mice_pos, cats_pos, turn)
         visited[result_state] = float('inf')
+        # Both turn orders share the same state graph, so solve them in the same pass
+        visited[(mice_pos, cats_pos, 1 - turn)] = float('inf')
         
         # Combine blocks, m, n into a board tuple for the solver interface
         board = (blocks, m, n)
@@ -155,6 +120,7 @@ class Cats:
         durations = {}
         
         # Run each solver and measure time
+        self.last_complete = False
         for solver_name, solver_func in solvers:
             self.last_visited = visited_copy = visited.copy()
             start_time = time.time()
@@ -204,10 +170,11 @@ class Cats:
         
         # Store the results from the reference solver
         self.last_visited = results[reference_name]
+        self.last_complete = reference_name not in PARTIAL_SOLVERS
         
         return (reference_score - 1) / 2
 
-    def solve(self, turn=0):
+    def solve(self, turn=0, use_tablebase=False, tablebase_dir=None):
         """
         Solve the cats game starting with the given turn.
         
@@ -215,6 +182,12 @@ class Cats:
         -----------
         turn : int
             0 for mice's turn, 1 for cats' turn
+        use_tablebase : bool
+            If True, look the score up in the tablebase of the board (built
+            once per board and piece counts) instead of searching
+        tablebase_dir : str
+            Directory of saved tablebases; the board's tablebase is
+            memory-mapped from there, or built and saved there first
             
         Returns:
         --------
@@ -224,8 +197,20 @@ class Cats:
         mice, cats, blocks, m, n = self.parse_state()
         start_state = (mice, cats, turn, blocks, m, n)
         
-        # Use all available solvers from the solvers package
-        result = self.generic_solver(start_state, self.get_next_states, self.is_caught, BEST_SOLVER)
+        cached = self.cached_score(mice, cats, turn, blocks, m, n)
+        if use_tablebase:
+            table = tablebase(blocks, m, n, len(mice), len(cats), tablebase_dir)
+            self.last_visited = table
+            self.last_complete = True
+            self.last_board = (blocks, m, n)
+            result = (table.score(mice, cats, turn) - 1) / 2
+        elif cached is not None:
+            # Already scored by an earlier solve on this board (other turn, or a later position)
+            result = (cached - 1) / 2
+        else:
+            # Use all available solvers from the solvers package
+            result = self.generic_solver(start_state, self.get_next_states, self.is_caught, BEST_SOLVER)
+            self.last_board = (blocks, m, n)
 
         if result == float('inf'):
             result = None
@@ -237,6 +222,28 @@ class Cats:
 
         return result
 
+    def cached_score(self, mice, cats, turn, blocks, m, n):
+        """
+        Return the score of a state from the last solve on the same board, if any.
+
+        A solve scores every state reachable from the position with either
+        side to move, so flipping the turn or playing moves on the board is
+        answered from last_visited without another expansion. Results of a
+        partial solver (see PARTIAL_SOLVERS) hold states it never settled,
+        so they are not reused.
+
+        Returns:
+        --------
+        float
+            The raw score of the state, or None if it was not solved yet
+        """
+        visited = getattr(self, 'last_visited', None)
+        if not visited or getattr(self, 'last_board', None) != (blocks, m, n):
+            return None
+        if not getattr(self, 'last_complete', False):
+            return None
+        return visited.get((mice, cats, turn))
+
     def get_last_visited(self):
         """Return the last visited dictionary from the most recent solver run."""
         visited = getattr(self, 'last_visited', None)
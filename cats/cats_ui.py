@@ -2,16 +2,20 @@ import pygame
 import tkinter as tk
 from tkinter import messagebox
 from cats import Cats
+import os
 import threading
 import time
 from typing import List, Union
 from solvers.fast_solver import Node
+from solvers.tablebase import Tablebase
 
 CELL_SIZE = 40
 #GRID_ROWS = 6
 #GRID_COLS = 6
 GRID_ROWS = 10
 GRID_COLS = 10
+# Saved tablebases, memory-mapped when a board is solved again
+TABLEBASE_DIR = os.environ.get('CATS_TABLEBASE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'cats', 'tablebases'))
 
 
 class BoardEditor(tk.Frame):
@@ -55,6 +59,8 @@ class BoardEditor(tk.Frame):
         tk.Label(self, text='First turn:').grid(row=4, column=0)
         tk.Radiobutton(self, text='Mouse', variable=self.turn, value=0).grid(row=4, column=1)
         tk.Radiobutton(self, text='Cat', variable=self.turn, value=1).grid(row=4, column=2)
+        self.use_tablebase = tk.BooleanVar(value=False)
+        tk.Checkbutton(self, text='Tablebase', variable=self.use_tablebase).grid(row=4, column=3)
 
     def reset_board(self):
         self.board = [['.' for _ in range(GRID_COLS)] for _ in range(GRID_ROWS)]
@@ -146,6 +152,8 @@ class BoardEditor(tk.Frame):
                     # Copy visited from previous solver
                     if hasattr(self.last_cats_solver, 'last_visited'):
                         new_cats_solver.last_visited = self.last_cats_solver.last_visited
+                        new_cats_solver.last_board = getattr(self.last_cats_solver, 'last_board', None)
+                        new_cats_solver.last_complete = getattr(self.last_cats_solver, 'last_complete', False)
                     self.last_cats_solver = new_cats_solver
                     self.draw_board()
                     return
@@ -163,10 +171,19 @@ class BoardEditor(tk.Frame):
                 original_board = [row[:] for row in self.board]
                 original_turn = self.turn.get()
                 cats_solver = Cats(state_str)
+                previous_solver = getattr(self, 'last_cats_solver', None)
+                if previous_solver is not None and hasattr(previous_solver, 'last_visited'):
+                    # Flipping the turn or solving a later position reuses the last solve
+                    cats_solver.last_visited = previous_solver.last_visited
+                    cats_solver.last_board = getattr(previous_solver, 'last_board', None)
+                    cats_solver.last_complete = getattr(previous_solver, 'last_complete', False)
                 self._solver_running = True
                 self._solve_start_time = time.time()
                 def update_progress():
-                    if hasattr(cats_solver, 'last_visited') and cats_solver.last_visited is not None:
+                    if isinstance(getattr(cats_solver, 'last_visited', None), Tablebase):
+                        elapsed = int(time.time() - self._solve_start_time)
+                        self.progress_label.config(text=f'Tablebase: {len(cats_solver.last_visited)} states | Time: {elapsed}s')
+                    elif hasattr(cats_solver, 'last_visited') and cats_solver.last_visited is not None:
                         values:List[Union[float, Node]] = list(cats_solver.last_visited.values())
                         n_not_inf = sum(1 for v in values if isinstance(v, (int, float)) and v != float('inf') or hasattr(v, 'score') and v.score != float('inf'))
                         elapsed = int(time.time() - self._solve_start_time)
@@ -177,7 +194,8 @@ class BoardEditor(tk.Frame):
                     if getattr(self, '_solver_running', False):
                         self.after(500, update_progress)
                 self.after(0, update_progress)
-                result = cats_solver.solve(turn=self.turn.get())
+                result = cats_solver.solve(turn=self.turn.get(), use_tablebase=self.use_tablebase.get(),
+                                           tablebase_dir=TABLEBASE_DIR)
                 def update_ui():
                     self.original_board = original_board
                     self.original_turn = original_turn
@@ -380,6 +398,8 @@ class BoardEditor(tk.Frame):
         new_cats_solver = Cats(new_state_str)
         if hasattr(self.last_cats_solver, 'last_visited'):
             new_cats_solver.last_visited = self.last_cats_solver.last_visited
+            new_cats_solver.last_board = getattr(self.last_cats_solver, 'last_board', None)
+            new_cats_solver.last_complete = getattr(self.last_cats_solver, 'last_complete', False)
         self.last_cats_solver = new_cats_solver
         self.draw_board()
 
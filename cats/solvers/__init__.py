@@ -8,15 +8,31 @@ from .fast_solver import (
     check_visited_consistency_fast_fifo,
     check_visited_consistency_two_steps
 )
+from .retrograde_solver import check_visited_consistency_retrograde
+from .bitboard import BitboardCodec, check_visited_consistency_bitboard
+from .csr_graph import INF_SCORE, GameGraph, check_visited_consistency_csr
+from .tablebase import Tablebase, tablebase
+from .root_solver import CAPTURE, UNBOUNDED, RootSearch, check_visited_consistency_root
+from .unmove_solver import check_visited_consistency_unmove
+from .symmetry_solver import SymmetricScores, check_visited_consistency_symmetric
 
 # Dictionary of all available solvers for easy access
 SOLVERS = {
     "slow": check_visited_consistency,
     "fast_lifo": check_visited_consistency_fast_lifo,
     "fast_fifo": check_visited_consistency_fast_fifo,
-    "two_steps": check_visited_consistency_two_steps
+    "two_steps": check_visited_consistency_two_steps,
+    "retrograde": check_visited_consistency_retrograde,
+    "bitboard": check_visited_consistency_bitboard,
+    "csr": check_visited_consistency_csr,
+    "root": check_visited_consistency_root,
+    "unmove": check_visited_consistency_unmove,
+    "symmetric": check_visited_consistency_symmetric
 }
 
 # List of all available solvers as (name, function) tuples
 ALL_SOLVERS = list(SOLVERS.items()) 
-BEST_SOLVER = [("two_steps", SOLVERS["two_steps"])] 
\ No newline at end of file
+BEST_SOLVER = [("two_steps", SOLVERS["two_steps"])] 
+
+# Solvers that settle only the states they need, so their results can't answer other queries
+PARTIAL_SOLVERS = {"root"}
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""
+Integer-packed states and bitboard move generation for the cats game.
+"""
+from .retrograde_solver import retrograde_scores
+
+
+class BitboardCodec:
+    """
+    Packs cats game states of one board into single Python ints.
+
+    A cell (y, x) is the index y*n + x. A packed state holds the turn in bit 0,
+    followed by the sorted mice indices and then the sorted cats indices, each
+    in a fixed number of bits. Occupancy and blocks are bitboards (ints with
+    one bit per cell), so move generation needs no sets or tuples.
+
+    Parameters:
+    -----------
+    blocks : frozenset
+        Set of blocked cells
+    m : int
+        Number of rows in the board
+    n : int
+        Number of columns in the board
+    n_mice : int
+        Number of mice on the board
+    n_cats : int
+        Number of cats on the board
+    """
+    DIRS = [(-1, 0), (1, 0), (0, -1), (0, 1), (0, 0)]
+
+    def __init__(self, blocks, m, n, n_mice, n_cats):
+        self.m = m
+        self.n = n
+        self.n_mice = n_mice
+        self.n_cats = n_cats
+        self.bits = max(1, (m * n - 1).bit_length())
+        self.cell_mask = (1 << self.bits) - 1
+        self.blocked = 0
+        for y, x in blocks:
+            if 0 <= y < m and 0 <= x < n:
+                self.blocked |= 1 << (y * n + x)
+        # Bitboard of the destinations of a piece standing on each cell (including staying)
+        self.moves = []
+        for index in range(m * n):
+            y, x = divmod(index, n)
+            mask = 0
+            for dy, dx in self.DIRS:
+                ny, nx = y + dy, x + dx
+                if 0 <= ny < m and 0 <= nx < n:
+                    mask |= 1 << (ny * n + nx)
+            self.moves.append(mask & ~self.blocked)
+
+    def encode(self, mice, cats, turn):
+        """
+        Packs a (mice, cats, turn) state of (y, x) tuples into an int.
+        """
+        return self.pack(sorted(y * self.n + x for y, x in mice),
+                         sorted(y * self.n + x for y, x in cats), turn)
+
+    def decode(self, code):
+        """
+        Unpacks an int into the (mice, cats, turn) tuple form used by the UI.
+        """
+        mice, cats, turn = self.unpack(code)
+        n = self.n
+        return tuple(divmod(i, n) for i in mice), tuple(divmod(i, n) for i in cats), turn
+
+    def pack(self, mice, cats, turn):
+        """
+        Packs sorted mice and cats cell indices and the turn into an int.
+        """
+        code = 0
+        for index in reversed(cats):
+            code = (code << self.bits) | index
+        for index in reversed(mice):
+            code = (code << self.bits) | index
+        return (code << 1) | turn
+
+    def unpack(self, code):
+        """
+        Returns the mice indices, the cats indices and the turn of a packed state.
+        """
+        turn = code & 1
+        code >>= 1
+        pieces = []
+        for _ in range(self.n_mice + self.n_cats):
+            pieces.append(code & self.cell_mask)
+            code >>= self.bits
+        return pieces[:self.n_mice], pieces[self.n_mice:], turn
+
+    @staticmethod
+    def occupancy(indices):
+        """
+        Returns the bitboard of the given cell indices.
+        """
+        mask = 0
+        for index in indices:
+            mask |= 1 << index
+        return mask
+
+    def is_caught(self, code):
+        mice, cats, _ = self.unpack(code)
+        return bool(self.occupancy(mice) & self.occupancy(cats))
+
+    def next_codes(self, code):
+        """
+        Returns the distinct packed states reachable in one move.
+
+        Mice can't move into other mice or cats; cats can't move into other
+        cats but can move into mice. Each piece may also stay in place.
+        """
+        mice, cats, turn = self.unpack(code)
+        if turn == 0:
+            movers, others = mice, self.occupancy(cats)
+        else:
+            movers, others = cats, 0
+        own = self.occupancy(movers)
+        options = []
+        for index in movers:
+            options.append(self.moves[index] & ~((own & ~(1 << index)) | others))
+
+        results = set()
+        for destinations in self._destinations(options, 0, 0):
+            destinations.sort()
+            if turn == 0:
+                results.add(self.pack(destinations, cats, 1))
+            else:
+                results.add(self.pack(mice, destinations, 0))
+        return list(results)
+
+    def _destinations(self, options, position, used):
+        # Builds the product of the pieces' moves, skipping cells already taken
+        if position == len(options):
+            yield []
+            return
+        mask = options[position] & ~used
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            for rest in self._destinations(options, position + 1, used | low):
+                rest.append(low.bit_length() - 1)
+                yield rest
+
+
+def check_visited_consistency_bitboard(visited, get_next_states, board, is_caught):
+    """
+    Retrograde solver running on integer-packed states and bitboard moves.
+
+    The states in visited are packed on the way in and the scores are unpacked
+    back to tuple states on the way out, so callers see the same dictionary as
+    with the other solvers. The moves follow the BitboardCodec rules, which are
+    the same as Cats.get_next_states.
+
+    Parameters:
+    -----------
+    visited : dict
+        Dictionary where keys are states (tuples) and values are scores
+    get_next_states : function
+        Function that returns possible next states (unused, moves come from the bitboards)
+    board : tuple
+        A tuple containing (blocks, m, n) representing the game board
+    is_caught : function
+        Function that checks if mice are caught (unused, see above)
+
+    Returns:
+    --------
+    dict
+        The updated visited dictionary
+    """
+    if not visited:
+        return visited
+    blocks, m, n = board
+    mice, cats, _ = next(iter(visited))
+    codec = BitboardCodec(blocks, m, n, len(mice), len(cats))
+
+    def expand(code):
+        if codec.is_caught(code):
+            return []
+        return codec.next_codes(code)
+
+    roots = [codec.encode(*state) for state in visited]
+    scores = retrograde_scores(roots, expand, lambda code: code & 1)
+    visited.update((codec.decode(code), score) for code, score in scores.items())
+    return visited
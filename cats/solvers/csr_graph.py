@@ -0,0 +1,186 @@
+"""
+Array-backed game graph for the cats game solvers.
+"""
+import sys
+from array import array
+
+from .bitboard import BitboardCodec
+
+# Score of states the mice escape from forever
+INF_SCORE = 0xFFFF
+
+
+class GameGraph:
+    """
+    Game graph with dense integer ids and CSR edge arrays in both directions.
+
+    State i has children child_ids[child_offsets[i]:child_offsets[i+1]] and
+    parents parent_ids[parent_offsets[i]:parent_offsets[i+1]]. All the edge
+    arrays are array('I'), so an edge costs 4 bytes in each direction instead
+    of a pointer in a Python list plus a Node object per state.
+
+    Parameters:
+    -----------
+    roots : iterable
+        States to start the expansion from
+    expand : function
+        Returns the distinct next states of a state (empty for caught states)
+    """
+    def __init__(self, roots, expand):
+        self.states = []
+        self.ids = {}
+        for state in roots:
+            self._add(state)
+        self.child_offsets = array('I', [0])
+        self.child_ids = array('I')
+        current = 0
+        while current < len(self.states):
+            for next_state in expand(self.states[current]):
+                next_id = self.ids.get(next_state)
+                if next_id is None:
+                    next_id = self._add(next_state)
+                self.child_ids.append(next_id)
+            self.child_offsets.append(len(self.child_ids))
+            current += 1
+        self._build_parents()
+        self.scores = None
+
+    def _add(self, state):
+        self.ids[state] = len(self.states)
+        self.states.append(state)
+        return self.ids[state]
+
+    def _build_parents(self):
+        size = len(self.states)
+        counts = array('I', bytes(4 * (size + 1)))
+        for child in self.child_ids:
+            counts[child + 1] += 1
+        for i in range(size):
+            counts[i + 1] += counts[i]
+        self.parent_offsets = counts
+        self.parent_ids = array('I', bytes(4 * len(self.child_ids)))
+        fill = array('I', counts[:size])
+        for parent in range(size):
+            for edge in range(self.child_offsets[parent], self.child_offsets[parent + 1]):
+                child = self.child_ids[edge]
+                self.parent_ids[fill[child]] = parent
+                fill[child] += 1
+
+    def __len__(self):
+        return len(self.states)
+
+    def solve(self, is_cats_turn):
+        """
+        Runs counter-based retrograde analysis over the arrays.
+
+        Parameters:
+        -----------
+        is_cats_turn : function
+            Returns True if it is the cats' turn to move in a state
+
+        Returns:
+        --------
+        array
+            array('H') of scores by state id, INF_SCORE where the mice escape forever
+        """
+        size = len(self.states)
+        child_offsets, parent_offsets, parent_ids = self.child_offsets, self.parent_offsets, self.parent_ids
+        unresolved = array('I', (child_offsets[i + 1] - child_offsets[i] for i in range(size)))
+        cats_turn = bytearray(1 if is_cats_turn(state) else 0 for state in self.states)
+        best = array('H', bytes(2 * size))
+        scores = array('H', [INF_SCORE]) * size
+        resolved = array('I', (i for i in range(size) if unresolved[i] == 0))
+        for state in resolved:
+            scores[state] = 1
+
+        head = 0
+        while head < len(resolved):
+            state = resolved[head]
+            head += 1
+            score = scores[state] + 1
+            if score >= INF_SCORE:
+                raise OverflowError("Score does not fit in the uint16 score array")
+            for edge in range(parent_offsets[state], parent_offsets[state + 1]):
+                parent = parent_ids[edge]
+                if unresolved[parent] == 0:
+                    continue
+                if cats_turn[parent]:
+                    unresolved[parent] = 0
+                    scores[parent] = score
+                    resolved.append(parent)
+                else:
+                    unresolved[parent] -= 1
+                    if score > best[parent]:
+                        best[parent] = score
+                    if unresolved[parent] == 0:
+                        scores[parent] = best[parent]
+                        resolved.append(parent)
+        self.scores = scores
+        return scores
+
+    def memory_report(self):
+        """
+        Returns the memory used by the graph, to size boards before solving.
+
+        Returns:
+        --------
+        dict
+            Bytes used by the state index, the edges and the scores, the
+            number of states and edges, and the total bytes per state
+        """
+        def array_bytes(values):
+            return values.itemsize * len(values)
+
+        index = sys.getsizeof(self.ids) + sys.getsizeof(self.states) + sum(sys.getsizeof(s) for s in self.states)
+        edges = sum(array_bytes(a) for a in (self.child_offsets, self.child_ids, self.parent_offsets, self.parent_ids))
+        scores = array_bytes(self.scores) if self.scores is not None else 2 * len(self.states)
+        total = index + edges + scores
+        return {
+            "states": len(self.states),
+            "edges": len(self.child_ids),
+            "index_bytes": index,
+            "edge_bytes": edges,
+            "score_bytes": scores,
+            "bytes_per_state": total / max(1, len(self.states)),
+        }
+
+
+def check_visited_consistency_csr(visited, get_next_states, board, is_caught):
+    """
+    Retrograde solver on a CSR game graph of integer-packed states.
+
+    Parameters:
+    -----------
+    visited : dict
+        Dictionary where keys are states (tuples) and values are scores
+    get_next_states : function
+        Function that returns possible next states (unused, moves come from the bitboards)
+    board : tuple
+        A tuple containing (blocks, m, n) representing the game board
+    is_caught : function
+        Function that checks if mice are caught (unused, see above)
+
+    Returns:
+    --------
+    dict
+        The updated visited dictionary
+    """
+    if not visited:
+        return visited
+    blocks, m, n = board
+    mice, cats, _ = next(iter(visited))
+    codec = BitboardCodec(blocks, m, n, len(mice), len(cats))
+
+    def expand(code):
+        if codec.is_caught(code):
+            return []
+        return codec.next_codes(code)
+
+    graph = GameGraph([codec.encode(*state) for state in visited], expand)
+    scores = graph.solve(lambda code: code & 1)
+    report = graph.memory_report()
+    print(f"csr graph: {report['states']} states, {report['edges']} edges, "
+          f"{report['bytes_per_state']:.1f} bytes/state")
+    for code, score in zip(graph.states, scores):
+        visited[codec.decode(code)] = float('inf') if score == INF_SCORE else score
+    return visited
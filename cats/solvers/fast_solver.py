@@ -3,8 +3,13 @@ Fast solver implementations for the cats game.
 """
 from collections import deque
 
+from board_model import board_model
+from .symmetry_solver import symmetric_scores
+
 class Node:
     """Node class for representing a game state in the fast solver."""
+    __slots__ = ('key', 'score', 'parents', 'children', 'is_updated', 'did_call_get_next_states', 'turn')
+
     def __init__(self, key, turn):
         self.key = key
         self.score = float('inf')
@@ -150,6 +155,12 @@ def check_visited_consistency_two_steps(visited, get_next_states, board, is_caug
     Fast solver implementation using a two-step approach:
     1. Build the complete graph
     2. Update scores in a separate pass
+
+    On boards with reflections or rotations that map the blocks onto
+    themselves, the graph is built over canonical states only (see
+    BoardModel.canonical), and the scores come back as SymmetricScores,
+    which answer for every symmetric state; their stats report the
+    reduction.
     
     Parameters:
     -----------
@@ -164,11 +175,23 @@ def check_visited_consistency_two_steps(visited, get_next_states, board, is_caug
         
     Returns:
     --------
-    dict
+    dict or SymmetricScores
         The updated visited dictionary
     """
     blocks, m, n = board
-    return two_steps_solver(visited, get_next_states, blocks, m, n, is_caught, use_popleft=True)
+    model = board_model(blocks, m, n)
+    if len(model.symmetries) == 1:
+        return two_steps_solver(visited, get_next_states, blocks, m, n, is_caught, use_popleft=True)
+
+    def get_canonical_next_states(mice, cats, turn, blocks, m, n):
+        return list({model.canonical(state) for state in get_next_states(mice, cats, turn, blocks, m, n)})
+
+    # Solve in place on the canonical roots, so progress stays visible in visited
+    roots = {model.canonical(state) for state in visited}
+    visited.clear()
+    visited.update(dict.fromkeys(roots, float('inf')))
+    scores = two_steps_solver(visited, get_canonical_next_states, blocks, m, n, is_caught, use_popleft=True)
+    return symmetric_scores(model, scores)
 
 def two_steps_solver(visited, get_next_states, blocks, m, n, is_caught, use_popleft=True):
     """
@@ -0,0 +1,140 @@
+"""
+Retrograde solver implementation for the cats game.
+"""
+from collections import deque
+
+
+def check_visited_consistency_retrograde(visited, get_next_states, board, is_caught):
+    """
+    Retrograde solver implementation that resolves every node exactly once.
+
+    Parameters:
+    -----------
+    visited : dict
+        Dictionary where keys are states (tuples) and values are scores
+    get_next_states : function
+        Function that returns possible next states
+    board : tuple
+        A tuple containing (blocks, m, n) representing the game board
+    is_caught : function
+        Function that checks if mice are caught
+
+    Returns:
+    --------
+    dict
+        The updated visited dictionary
+    """
+    blocks, m, n = board
+    return retrograde_solver(visited, get_next_states, blocks, m, n, is_caught)
+
+
+def retrograde_solver(visited, get_next_states, blocks, m, n, is_caught):
+    """
+    Helper function implementing counter-based retrograde analysis.
+
+    The first pass expands the reachable graph once and records, for every
+    node, its parents and the number of children that are still unresolved.
+    The second pass starts from the caught states and walks the parents in
+    increasing score order (a FIFO queue, since every edge adds exactly 1):
+
+    - a cats node is resolved by its first resolved child, which is the
+      minimum because children arrive in distance order;
+    - a mice node is resolved when its last child is resolved, with the best
+      (maximum) value seen so far.
+
+    Each node enters the queue once and each edge is followed once in each
+    direction, so the total work is O(V+E) instead of recomputing min/max
+    over all children every time one of them changes. Nodes that are never
+    resolved keep an infinite score (the mice escape forever).
+
+    Parameters:
+    -----------
+    visited : dict
+        Dictionary where keys are states (tuples) and values are scores
+    get_next_states : function
+        Function that returns possible next states
+    blocks : frozenset
+        Set of blocked cells
+    m : int
+        Number of rows in the board
+    n : int
+        Number of columns in the board
+    is_caught : function
+        Function that checks if mice are caught
+
+    Returns:
+    --------
+    dict
+        The updated visited dictionary
+    """
+    def expand(state):
+        mice, cats, turn = state
+        if is_caught(mice, cats):
+            return []
+        return get_next_states(mice, cats, turn, blocks, m, n)
+
+    visited.update(retrograde_scores(visited, expand, lambda state: state[2] == 1))
+    return visited
+
+
+def retrograde_scores(roots, expand, is_cats_turn):
+    """
+    Runs the two passes of the retrograde solver on any hashable state type.
+
+    Parameters:
+    -----------
+    roots : iterable
+        States to start the expansion from
+    expand : function
+        Returns the list of next states of a state (empty for caught states)
+    is_cats_turn : function
+        Returns True if it is the cats' turn to move in a state
+
+    Returns:
+    --------
+    dict
+        Score of every reachable state (float('inf') if the mice escape forever)
+    """
+    parents = {state: [] for state in roots}
+    unresolved = {}
+    best = {}
+    resolved = deque()
+
+    # Step 1: expand the reachable graph once
+    queue = deque(parents)
+    while queue:
+        state = queue.popleft()
+        next_states = expand(state)
+        for next_state in next_states:
+            if next_state not in parents:
+                parents[next_state] = []
+                queue.append(next_state)
+            parents[next_state].append(state)
+        unresolved[state] = len(next_states)
+        best[state] = 0
+        if not next_states:
+            resolved.append(state)
+
+    # Step 2: resolve the nodes in distance order, starting from the leaves
+    scores = dict.fromkeys(parents, float('inf'))
+    for state in resolved:
+        scores[state] = 1
+    while resolved:
+        state = resolved.popleft()
+        score = scores[state]
+        for parent in parents[state]:
+            if unresolved[parent] == 0:
+                continue
+            if is_cats_turn(parent):
+                # Cats move: the first resolved child is the minimum
+                unresolved[parent] = 0
+                scores[parent] = score + 1
+                resolved.append(parent)
+            else:
+                # Mice move: wait for the last child, keeping the maximum
+                unresolved[parent] -= 1
+                best[parent] = max(best[parent], score)
+                if unresolved[parent] == 0:
+                    scores[parent] = best[parent] + 1
+                    resolved.append(parent)
+    return scores
@@ -0,0 +1,232 @@
+"""
+Goal-directed solver for the cats game that answers only the root query.
+"""
+from collections import deque
+
+from board_model import board_model
+from .retrograde_solver import retrograde_scores
+
+# Outcome of a position the mice escape from forever
+UNBOUNDED = "unbounded"
+# Outcome of a position the cats win in a finite number of moves
+CAPTURE = "capture"
+# Deepest limit searched recursively before falling back to the retrograde pass
+MAX_LIMIT = 400
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class RootSearch:
+    """
+    Iterative-deepening minimax on "can the cats capture within limit?".
+
+    Scores follow the other solvers: a caught state scores 1 and every move
+    adds 1. An iteration asks whether the root's score is at most limit; the
+    cats need one child within limit-1, the mice need every child within
+    limit-1. The transposition table keeps, per state, a proven lower and
+    upper bound on its score, so later iterations skip everything that was
+    already settled and the next limit jumps straight to the root's proven
+    lower bound.
+
+    A state's score is at least 1 + the BFS distance (on the blocked board)
+    between its closest cat and mouse, because every move brings them at
+    most one cell closer. States under the limit are pruned with this bound,
+    and states where no cat can ever reach a mouse are proven unbounded
+    without search. Escapes that rely on running in circles can't be proven
+    by deepening; once an iteration reaches no new states or the node budget
+    runs out, the search falls back to a full retrograde pass over the
+    reachable graph.
+
+    Parameters:
+    -----------
+    get_next_states : function
+        Function that returns possible next states
+    board : tuple
+        A tuple containing (blocks, m, n) representing the game board
+    is_caught : function
+        Function that checks if mice are caught
+    max_nodes : int
+        Number of expanded states after which the search falls back to the
+        full retrograde pass
+    """
+    def __init__(self, get_next_states, board, is_caught, max_nodes=200000):
+        self.get_next_states = get_next_states
+        self.blocks, self.m, self.n = board
+        self.is_caught = is_caught
+        self.max_nodes = max_nodes
+        self.lower = {}
+        self.upper = {}
+        self.children = {}
+        self.iterations = 0
+        self.fallback = False
+        self.distances = self._distances()
+
+    def _distances(self):
+        # BFS distance between every pair of free cells, ignoring the pieces
+        destinations = board_model(self.blocks, self.m, self.n).destinations
+        distances = {}
+        for source in destinations:
+            if source in self.blocks:
+                continue
+            found = {source: 0}
+            queue = deque([source])
+            while queue:
+                cell = queue.popleft()
+                for next_cell in destinations[cell]:
+                    if next_cell not in found:
+                        found[next_cell] = found[cell] + 1
+                        queue.append(next_cell)
+            distances[source] = found
+        return distances
+
+    def lower_bound(self, state):
+        """
+        Returns 1 + the distance between the closest cat and mouse (inf if none can meet).
+        """
+        mice, cats, _ = state
+        best = float('inf')
+        for cat in cats:
+            reachable = self.distances.get(cat, {})
+            for mouse in mice:
+                best = min(best, reachable.get(mouse, float('inf')))
+        return best + 1
+
+    def _expand(self, state):
+        children = self.children.get(state)
+        if children is None:
+            if self.max_nodes is not None and len(self.children) >= self.max_nodes:
+                raise _BudgetExceeded()
+            mice, cats, turn = state
+            children = self.get_next_states(mice, cats, turn, self.blocks, self.m, self.n)
+            self.children[state] = children
+        return children
+
+    def _lower(self, state):
+        lower = self.lower.get(state)
+        if lower is None:
+            mice, cats, _ = state
+            lower = 1 if self.is_caught(mice, cats) else self.lower_bound(state)
+            self.lower[state] = lower
+            if lower == 1:
+                self.upper[state] = 1
+        return lower
+
+    def within(self, state, limit):
+        """
+        Returns True if the cats can force a capture with score at most limit.
+        """
+        if self.upper.get(state, float('inf')) <= limit:
+            return True
+        if self._lower(state) > limit:
+            return False
+
+        children = self._expand(state)
+        if not children:
+            self.lower[state] = self.upper[state] = 1
+            return True
+        cats_turn = state[2] == 1
+        # Try the most promising children first: the cats look for a quick win,
+        # the mice for the child that is hardest to win
+        children = sorted(children, key=self._lower, reverse=not cats_turn)
+        if cats_turn:
+            for child in children:
+                if self.within(child, limit - 1):
+                    self.upper[state] = 1 + self.upper[child]
+                    return True
+            self.lower[state] = max(self.lower[state], 1 + min(self.lower[child] for child in children))
+            return False
+        for child in children:
+            if not self.within(child, limit - 1):
+                self.lower[state] = max(self.lower[state], 1 + self.lower[child])
+                return False
+        self.upper[state] = 1 + max(self.upper[child] for child in children)
+        return True
+
+    def solve(self, state):
+        """
+        Returns the score of state and its outcome (CAPTURE or UNBOUNDED).
+        """
+        limit = self._lower(state)
+        while limit != float('inf'):
+            if limit > MAX_LIMIT:
+                return self._solve_fallback(state)
+            self.iterations += 1
+            expanded = len(self.children)
+            try:
+                found = self.within(state, limit)
+            except _BudgetExceeded:
+                return self._solve_fallback(state)
+            if found:
+                self.lower[state] = limit
+                return limit, CAPTURE
+            if len(self.children) == expanded:
+                # Deepening no longer reaches new states: the mice are most
+                # likely running in circles, which only the full pass can prove
+                return self._solve_fallback(state)
+            limit = self.lower[state]
+        return float('inf'), UNBOUNDED
+
+    def _solve_fallback(self, state):
+        self.fallback = True
+        self.max_nodes = None
+
+        def expand(node):
+            mice, cats, _ = node
+            if self.is_caught(mice, cats):
+                return []
+            return self._expand(node)
+
+        scores = retrograde_scores([state], expand, lambda node: node[2] == 1)
+        for node, score in scores.items():
+            self.lower[node] = self.upper[node] = score
+        score = scores[state]
+        return score, UNBOUNDED if score == float('inf') else CAPTURE
+
+    def exact_scores(self):
+        """
+        Returns the states whose score has been settled exactly, including
+        the ones proven unbounded by their lower bound.
+        """
+        scores = {state: upper for state, upper in self.upper.items() if self.lower.get(state) == upper}
+        scores.update((state, lower) for state, lower in self.lower.items() if lower == float('inf'))
+        return scores
+
+
+def check_visited_consistency_root(visited, get_next_states, board, is_caught):
+    """
+    Root-only solver: settles the score of the first state in visited and
+    returns it together with every other score the search settled exactly.
+    The other states of visited are dropped unless the search settled them
+    too, so an unsettled state is never mistaken for an escape (inf).
+
+    Parameters:
+    -----------
+    visited : dict
+        Dictionary where keys are states (tuples) and values are scores
+    get_next_states : function
+        Function that returns possible next states
+    board : tuple
+        A tuple containing (blocks, m, n) representing the game board
+    is_caught : function
+        Function that checks if mice are caught
+
+    Returns:
+    --------
+    dict
+        The updated visited dictionary
+    """
+    if not visited:
+        return visited
+    root = next(iter(visited))
+    search = RootSearch(get_next_states, board, is_caught)
+    score, outcome = search.solve(root)
+    print(f"root search: {outcome}, {search.iterations} iterations, {len(search.children)} states expanded"
+          + (", retrograde fallback" if search.fallback else ""))
+    scores = search.exact_scores()
+    scores[root] = score
+    for state in [state for state in visited if state not in scores]:
+        del visited[state]
+    visited.update(scores)
+    return visited
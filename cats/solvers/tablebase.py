@@ -0,0 +1,358 @@
+"""
+Full-board tablebases for the cats game.
+"""
+import hashlib
+import itertools
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+
+from board_model import board_model
+from .csr_graph import INF_SCORE
+
+# Rules the scores were computed with; part of the key of a saved tablebase
+RULES = "moves=up,down,left,right,stay;mice-blocked-by=mice,cats;cats-blocked-by=cats;caught=any-mouse"
+
+TABLEBASE_MAGIC = b"CATSTB\x00\x00"
+TABLEBASE_FORMAT = 1
+# magic, format, m, n, n_mice, n_cats, free cells, key, scores offset
+_HEADER = struct.Struct("<8sHHHHHH32sQ")
+
+
+def tablebase_key(blocks, m, n, n_mice, n_cats):
+    """
+    Returns the SHA-256 digest identifying a tablebase of a board.
+    """
+    text = repr((sorted(blocks), m, n, n_mice, n_cats, RULES))
+    return hashlib.sha256(text.encode()).digest()
+
+
+class Tablebase(Mapping):
+    """
+    Scores of every position of a board with a fixed number of mice and cats.
+
+    The free cells are numbered 0..f-1 in row order, and a sorted combination
+    of free cells (c1 < c2 < ... < ck) is ranked with the combinatorial number
+    system as comb(c1, 1) + comb(c2, 2) + ... + comb(ck, k). The ranks of the
+    mice placements and the cats placements are dense, so the scores of both
+    turns live in one array of shape (2, comb(f, n_mice), comb(f, n_cats))
+    with no hashing. Mice and cats may share cells (caught positions).
+
+    A Tablebase is also a read-only mapping from (mice, cats, turn) tuples to
+    scores, like the visited dictionary the other solvers return.
+
+    Parameters:
+    -----------
+    blocks : frozenset
+        Set of blocked cells
+    m : int
+        Number of rows in the board
+    n : int
+        Number of columns in the board
+    n_mice : int
+        Number of mice on the board
+    n_cats : int
+        Number of cats on the board
+    """
+    def __init__(self, blocks, m, n, n_mice, n_cats):
+        self.blocks = blocks
+        self.m = m
+        self.n = n
+        self.n_mice = n_mice
+        self.n_cats = n_cats
+        self.cells = [(y, x) for y in range(m) for x in range(n) if (y, x) not in blocks]
+        self.cell_index = {cell: i for i, cell in enumerate(self.cells)}
+        self.scores = None
+
+    def rank(self, positions):
+        """
+        Returns the dense rank of a placement of pieces on free cells.
+        """
+        indices = sorted(self.cell_index[pos] for pos in positions)
+        return sum(comb(index, i + 1) for i, index in enumerate(indices))
+
+    def unrank(self, rank, k):
+        """
+        Returns the sorted (y, x) cells of the placement of k pieces with this rank.
+        """
+        positions = []
+        for i in range(k, 0, -1):
+            index = i - 1
+            while comb(index + 1, i) <= rank:
+                index += 1
+            rank -= comb(index, i)
+            positions.append(self.cells[index])
+        return tuple(reversed(positions))
+
+    def _placements(self, k):
+        # Free cell indices of every placement of k pieces, ordered by rank
+        placements = np.zeros((comb(len(self.cells), k), k), dtype=np.int64)
+        for combo in itertools.combinations(range(len(self.cells)), k):
+            placements[sum(comb(index, i + 1) for i, index in enumerate(combo))] = combo
+        return placements
+
+    def _transitions(self, placements, turn):
+        # (from, to) rank pairs of one side's moves, ignoring the other side's pieces
+        model = board_model(self.blocks, self.m, self.n)
+        sources, targets = [], []
+        for source, combo in enumerate(placements):
+            positions = tuple(self.cells[i] for i in combo)
+            if turn == 0:
+                next_states = model.next_states(positions, (), 0)
+                moved = {state[0] for state in next_states}
+            else:
+                next_states = model.next_states((), positions, 1)
+                moved = {state[1] for state in next_states}
+            for new_positions in moved:
+                sources.append(source)
+                targets.append(self.rank(new_positions))
+        return np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64)
+
+    @staticmethod
+    def _reverse(sources, targets, size):
+        # CSR table of the sources of every target
+        order = np.argsort(targets, kind='stable')
+        offsets = np.zeros(size + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(targets, minlength=size))
+        return offsets, sources[order]
+
+    @staticmethod
+    def _gather(offsets, ids, keys):
+        # For every key, all of ids[offsets[key]:offsets[key+1]], with the position of its key
+        counts = offsets[keys + 1] - offsets[keys]
+        owners = np.repeat(np.arange(len(keys)), counts)
+        starts = np.repeat(offsets[keys] - (np.cumsum(counts) - counts), counts)
+        return owners, ids[starts + np.arange(len(owners))]
+
+    @staticmethod
+    def _chunks(level, keys, offsets, edges=1 << 20):
+        # Splits a level's index pairs so that the keys of each piece have about this many parents
+        if not len(keys):
+            return
+        counts = np.cumsum(offsets[keys + 1] - offsets[keys])
+        bounds = np.searchsorted(counts, np.arange(edges, counts[-1], edges))
+        for piece_a, piece_b in zip(np.split(level[0], bounds), np.split(level[1], bounds)):
+            if len(piece_a):
+                yield piece_a, piece_b
+
+    @staticmethod
+    def _unique(a, c, size):
+        # The distinct (a, c) index pairs and how often each one occurs
+        flat, counts = np.unique(a * size + c, return_counts=True)
+        return flat // size, flat % size, counts
+
+    def build(self):
+        """
+        Computes the scores of every position with a level-by-level retrograde pass.
+
+        Level L holds the positions with score L. Caught positions are level 1.
+        A cats position joins level L+1 as soon as one of its children is in
+        level L (the minimum). A mice position joins level L+1 when its last
+        unresolved child is in level L (the maximum); the number of unresolved
+        children is kept per position and decremented with NumPy scatter
+        operations. Only the positions that joined the current level are
+        expanded, and the counters are built from the move lists, so memory
+        is linear in the number of positions and moves. Positions never
+        reached keep INF_SCORE.
+
+        Returns:
+        --------
+        Tablebase
+            self, with the scores array filled in
+        """
+        mice = self._placements(self.n_mice)
+        cats = self._placements(self.n_cats)
+        n_mice, n_cats = len(mice), len(cats)
+
+        caught = np.zeros((n_mice, n_cats), dtype=bool)
+        for i in range(self.n_mice):
+            for j in range(self.n_cats):
+                caught |= mice[:, i][:, None] == cats[:, j][None, :]
+
+        mice_from, mice_to = self._transitions(mice, 0)
+        cats_from, cats_to = self._transitions(cats, 1)
+        mice_offsets, mice_parents = self._reverse(mice_from, mice_to, n_mice)
+        cats_offsets, cats_parents = self._reverse(cats_from, cats_to, n_cats)
+
+        # Children of a mice position: the mice moves that don't land on a cat.
+        # The moves are grouped by source, so the counts are summed over runs
+        # of whole sources at a time and memory stays linear in the moves
+        unresolved = np.zeros((n_mice, n_cats), dtype=np.int32)
+        free = ~caught
+        starts = np.searchsorted(mice_from, np.arange(n_mice + 1))
+        step = max(1, (1 << 22) // (n_cats * max(1, len(mice_from) // n_mice)))
+        for first in range(0, n_mice, step):
+            last = min(first + step, n_mice)
+            edges = slice(starts[first], starts[last])
+            unresolved[first:last] = np.add.reduceat(free[mice_to[edges]], starts[first:last] - starts[first],
+                                                     axis=0, dtype=np.int32)
+
+        scores = np.full((2, n_mice, n_cats), INF_SCORE, dtype=np.uint16)
+        scores[:, caught] = 1
+        scores[0][(unresolved == 0) & free] = 1
+
+        # The positions of the current level, as (mice rank, cats rank) index pairs.
+        # Caught positions are leaves, so level 1 has no cats positions to expand
+        mice_level = np.nonzero(scores[0] == 1)
+        empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+        cats_level = empty
+        level = 1
+        while len(mice_level[0]) or len(cats_level[0]):
+            if level + 1 >= INF_SCORE:
+                raise OverflowError("Score does not fit in the uint16 score array")
+
+            # Cats positions with a child in this level
+            next_cats = [empty]
+            for a, d in self._chunks(mice_level, mice_level[1], cats_offsets):
+                owners, c = self._gather(cats_offsets, cats_parents, d)
+                a = a[owners]
+                open_parents = scores[1, a, c] == INF_SCORE
+                a, c, _ = self._unique(a[open_parents], c[open_parents], n_cats)
+                scores[1, a, c] = level + 1
+                next_cats.append((a, c))
+
+            # Mice positions whose last child is in this level
+            next_mice = [empty]
+            for b, c in self._chunks(cats_level, cats_level[0], mice_offsets):
+                owners, a = self._gather(mice_offsets, mice_parents, b)
+                c = c[owners]
+                open_parents = scores[0, a, c] == INF_SCORE
+                # A position may lose several children in one level
+                a, c, counts = self._unique(a[open_parents], c[open_parents], n_cats)
+                unresolved[a, c] -= counts
+                done = unresolved[a, c] == 0
+                scores[0, a[done], c[done]] = level + 1
+                next_mice.append((a[done], c[done]))
+
+            mice_level = tuple(np.concatenate(part) for part in zip(*next_mice))
+            cats_level = tuple(np.concatenate(part) for part in zip(*next_cats))
+            level += 1
+
+        self.scores = scores
+        return self
+
+    def score(self, mice, cats, turn):
+        """
+        Returns the score of a position, float('inf') if the mice escape forever.
+        """
+        value = int(self.scores[turn, self.rank(mice), self.rank(cats)])
+        return float('inf') if value == INF_SCORE else value
+
+    def save(self, path):
+        """
+        Writes the tablebase to a binary file.
+
+        The file holds a fixed header (magic, format, board size, piece
+        counts, key and scores offset), the state index as the (y, x) pairs of
+        the free cells in rank order, and the uint16 scores array aligned to 8
+        bytes. The file is written under a temporary name and then renamed, so
+        readers never see a partial file.
+        """
+        index = np.array(self.cells, dtype='<u2').reshape(-1, 2)
+        offset = _HEADER.size + index.nbytes
+        offset += -offset % 8
+        header = _HEADER.pack(TABLEBASE_MAGIC, TABLEBASE_FORMAT, self.m, self.n, self.n_mice, self.n_cats,
+                              len(self.cells), tablebase_key(self.blocks, self.m, self.n, self.n_mice, self.n_cats),
+                              offset)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(header)
+            f.write(index.tobytes())
+            f.write(bytes(offset - _HEADER.size - index.nbytes))
+            f.write(self.scores.astype('<u2', copy=False).tobytes())
+        os.replace(temp_path, path)
+
+    @classmethod
+    def open(cls, path, key=None):
+        """
+        Opens a saved tablebase with the scores memory-mapped, read-only.
+
+        Only the entries that are looked up are read from the file, so the UI
+        can query a large table without loading it into Python objects.
+
+        Parameters:
+        -----------
+        path : str
+            Path of a file written by Tablebase.save
+        key : bytes
+            If given, the expected tablebase_key of the file
+
+        Returns:
+        --------
+        Tablebase
+            The opened tablebase
+
+        Raises:
+        -------
+        ValueError
+            If the file is not a tablebase, has another format or key
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) < _HEADER.size:
+            raise ValueError(f"{path} is not a cats tablebase")
+        magic, version, m, n, n_mice, n_cats, n_cells, file_key, offset = _HEADER.unpack_from(mapped)
+        if magic != TABLEBASE_MAGIC:
+            raise ValueError(f"{path} is not a cats tablebase")
+        if version != TABLEBASE_FORMAT:
+            raise ValueError(f"{path} has tablebase format {version}, expected {TABLEBASE_FORMAT}")
+        if key is not None and file_key != key:
+            raise ValueError(f"{path} holds a tablebase of another board")
+
+        index = np.frombuffer(mapped, dtype='<u2', count=2 * n_cells, offset=_HEADER.size).reshape(-1, 2)
+        cells = [(int(y), int(x)) for y, x in index]
+        blocks = frozenset((y, x) for y in range(m) for x in range(n)) - frozenset(cells)
+        table = cls(blocks, m, n, n_mice, n_cats)
+        table.cells = cells
+        table.cell_index = {cell: i for i, cell in enumerate(cells)}
+        shape = (2, comb(n_cells, n_mice), comb(n_cells, n_cats))
+        table.scores = np.frombuffer(mapped, dtype='<u2', count=shape[0] * shape[1] * shape[2],
+                                     offset=offset).reshape(shape)
+        table._mapped = mapped
+        return table
+
+    def __getitem__(self, state):
+        try:
+            mice, cats, turn = state
+        except (TypeError, ValueError):
+            raise KeyError(state) from None
+        if len(mice) != self.n_mice or len(cats) != self.n_cats or turn not in (0, 1):
+            raise KeyError(state)
+        try:
+            return self.score(mice, cats, turn)
+        except KeyError:
+            raise KeyError(state) from None
+
+    def __iter__(self):
+        for turn in (0, 1):
+            for a in range(self.scores.shape[1]):
+                mice = self.unrank(a, self.n_mice)
+                for c in range(self.scores.shape[2]):
+                    yield mice, self.unrank(c, self.n_cats), turn
+
+    def __len__(self):
+        return self.scores.size
+
+
+@lru_cache(maxsize=8)
+def tablebase(blocks, m, n, n_mice, n_cats, directory=None):
+    """
+    Returns the built Tablebase of a board, building it on first use.
+
+    With a directory, tablebases persist across runs: the file named by the
+    board's key is memory-mapped if it exists, otherwise the tablebase is
+    built, saved there and then memory-mapped.
+    """
+    if directory is None:
+        return Tablebase(blocks, m, n, n_mice, n_cats).build()
+    key = tablebase_key(blocks, m, n, n_mice, n_cats)
+    path = os.path.join(directory, f"{key.hex()[:32]}.cattb")
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        Tablebase(blocks, m, n, n_mice, n_cats).build().save(path)
+    return Tablebase.open(path, key)
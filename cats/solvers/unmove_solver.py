@@ -0,0 +1,107 @@
+"""
+Pure retrograde solver for the cats game, walking unmoves from the caught states.
+"""
+import itertools
+from collections import deque
+
+from board_model import board_model
+
+
+def check_visited_consistency_unmove(visited, get_next_states, board, is_caught):
+    """
+    Retrograde solver that starts from every caught state of the board and
+    generates predecessors on the fly with unmoves, so no parents lists are
+    stored. It scores every position of the board with the same numbers of
+    mice and cats as the first state in visited, not only the reachable ones.
+
+    Parameters:
+    -----------
+    visited : dict
+        Dictionary where keys are states (tuples) and values are scores
+    get_next_states : function
+        Function that returns possible next states (used to count the mice's moves)
+    board : tuple
+        A tuple containing (blocks, m, n) representing the game board
+    is_caught : function
+        Function that checks if mice are caught
+
+    Returns:
+    --------
+    dict
+        The updated visited dictionary
+    """
+    if not visited:
+        return visited
+    blocks, m, n = board
+    mice, cats, _ = next(iter(visited))
+    scores = unmove_scores(get_next_states, board, is_caught, len(mice), len(cats))
+    for state in visited:
+        visited[state] = float('inf')
+    visited.update(scores)
+    return visited
+
+
+def unmove_scores(get_next_states, board, is_caught, n_mice, n_cats):
+    """
+    Helper function implementing retrograde analysis over unmoves.
+
+    The caught states are the leaves (score 1). They are resolved in
+    distance order like in the counter-based retrograde solver; a mice
+    state's counter of unresolved children is only created, from its number
+    of distinct forward moves, the first time one of its children resolves.
+
+    Parameters:
+    -----------
+    get_next_states : function
+        Function that returns possible next states
+    board : tuple
+        A tuple containing (blocks, m, n) representing the game board
+    is_caught : function
+        Function that checks if mice are caught
+    n_mice : int
+        Number of mice on the board
+    n_cats : int
+        Number of cats on the board
+
+    Returns:
+    --------
+    dict
+        Score of every state the cats can win; all other states score float('inf')
+    """
+    blocks, m, n = board
+    model = board_model(blocks, m, n)
+    cells = [(y, x) for y in range(m) for x in range(n) if (y, x) not in blocks]
+
+    scores = {}
+    resolved = deque()
+    for mice in itertools.combinations(cells, n_mice):
+        for cats in itertools.combinations(cells, n_cats):
+            if is_caught(mice, cats):
+                for turn in (0, 1):
+                    scores[(mice, cats, turn)] = 1
+                    resolved.append((mice, cats, turn))
+
+    unresolved = {}
+    while resolved:
+        state = resolved.popleft()
+        score = scores[state]
+        for parent in model.previous_states(*state):
+            if parent in scores:
+                continue
+            mice, cats, turn = parent
+            if is_caught(mice, cats):
+                continue  # Caught states are leaves, they have no moves
+            if turn == 1:
+                # Cats move: the first resolved child is the minimum
+                scores[parent] = score + 1
+                resolved.append(parent)
+                continue
+            # Mice move: wait for the last child
+            if parent not in unresolved:
+                unresolved[parent] = len(set(get_next_states(mice, cats, turn, blocks, m, n)))
+            unresolved[parent] -= 1
+            if unresolved[parent] == 0:
+                del unresolved[parent]
+                scores[parent] = score + 1
+                resolved.append(parent)
+    return scores
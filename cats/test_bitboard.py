@@ -0,0 +1,49 @@
+import random
+import unittest
+from cats import Cats
+from solvers import SOLVERS, BitboardCodec
+from test_cats import BOARDS
+from test_utils import random_position
+
+
+class TestBitboardCodec(unittest.TestCase):
+    def test_encode_decode_round_trip(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            m, n = rng.randint(1, 6), rng.randint(2, 6)
+            mice, cats, blocks = random_position(rng, m, n, 1, 1)
+            codec = BitboardCodec(blocks, m, n, len(mice), len(cats))
+            for turn in (0, 1):
+                self.assertEqual(codec.decode(codec.encode(mice, cats, turn)), (mice, cats, turn))
+
+    def test_next_states_match_get_next_states(self):
+        rng = random.Random(1)
+        c = Cats("M")
+        for _ in range(300):
+            m, n = rng.randint(3, 5), rng.randint(3, 5)
+            n_mice, n_cats = rng.randint(1, 2), rng.randint(1, 3)
+            mice, cats, blocks = random_position(rng, m, n, n_mice, n_cats)
+            codec = BitboardCodec(blocks, m, n, n_mice, n_cats)
+            for turn in (0, 1):
+                expected = set(c.get_next_states(mice, cats, turn, blocks, m, n))
+                code = codec.encode(mice, cats, turn)
+                result = [codec.decode(next_code) for next_code in codec.next_codes(code)]
+                self.assertEqual(len(result), len(set(result)))
+                self.assertEqual(set(result), expected)
+                self.assertEqual(codec.is_caught(code), c.is_caught(mice, cats))
+
+    def test_solver_matches_retrograde(self):
+        for state in BOARDS:
+            with self.subTest(state=state):
+                c = Cats(state)
+                mice, cats, blocks, m, n = c.parse_state()
+                board = (blocks, m, n)
+                for turn in (0, 1):
+                    root = (mice, cats, turn)
+                    expected = SOLVERS["retrograde"]({root: float('inf')}, c.get_next_states, board, c.is_caught)
+                    result = SOLVERS["bitboard"]({root: float('inf')}, c.get_next_states, board, c.is_caught)
+                    self.assertEqual(result, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import itertools
+import random
+import unittest
+from board_model import BoardModel, board_model
+from test_utils import random_position
+
+
+def reference_next_states(mice_pos, cats_pos, turn, blocks, m, n):
+    # Move generation as it was before the board tables: filter the full product
+    def options(pos, others):
+        result = []
+        for dy, dx in BoardModel.DIRS:
+            npos = (pos[0] + dy, pos[1] + dx)
+            if 0 <= npos[0] < m and 0 <= npos[1] < n and npos not in blocks and npos not in others:
+                result.append(npos)
+        return result
+    if turn == 0:
+        moves = [options(pos, set(mice_pos) - {pos} | set(cats_pos)) for pos in mice_pos]
+        return [(tuple(sorted(new)), cats_pos, 1) for new in itertools.product(*moves) if len(set(new)) == len(new)]
+    moves = [options(pos, set(cats_pos) - {pos}) for pos in cats_pos]
+    return [(mice_pos, tuple(sorted(new)), 0) for new in itertools.product(*moves) if len(set(new)) == len(new)]
+
+
+class TestBoardModel(unittest.TestCase):
+    def test_destinations_honor_bounds_and_blocks(self):
+        model = BoardModel(frozenset({(0, 1)}), 2, 3)
+        self.assertEqual(model.destinations[(0, 0)], [(1, 0), (0, 0)])
+        self.assertEqual(model.destinations[(1, 1)], [(1, 0), (1, 2), (1, 1)])
+
+    def test_matches_reference_on_random_boards(self):
+        rng = random.Random(2)
+        for _ in range(300):
+            m, n = rng.randint(2, 5), rng.randint(2, 5)
+            mice, cats, blocks = random_position(rng, m, n, rng.randint(1, 3), rng.randint(1, 3))
+            for turn in (0, 1):
+                self.assertEqual(board_model(blocks, m, n).next_states(mice, cats, turn),
+                                 reference_next_states(mice, cats, turn, blocks, m, n))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,49 @@
 import unittest
+from unittest import mock
 from cats import Cats
+from solvers import SOLVERS
 import time
 
 
+BOARDS = [
+    """
+    .....
+    .....
+    ...C.
+    ..C..
+    ....M
+    """,
+    """
+    .....
+    .....
+    ...CX
+    ..CX.
+    ....M
+    """,
+    """
+    ..X..
+    ..C..
+    ....X
+    ..CX.
+    ....M
+    """,
+    """
+    .....
+    .....
+    ...CX
+    ..CX.
+    ..X.M
+    """,
+    """
+    .....
+    ...C.
+    ...XX
+    ..XC.
+    ..X.M
+    """,
+]
+
+
 class TestsCat(unittest.TestCase):
     def test_case1(self):
         c = Cats("""
@@ -154,3 +195,43 @@ class TestsCat(unittest.TestCase):
             # Restore the original function
             solvers.fast_solver.two_steps_solver = original_two_steps
 
+    def test_both_turns_from_one_solve(self):
+        c = Cats(BOARDS[0])
+        calls = []
+        original_generic_solver = c.generic_solver
+        def counting_generic_solver(*args, **kwargs):
+            calls.append(args[0])
+            return original_generic_solver(*args, **kwargs)
+        c.generic_solver = counting_generic_solver
+
+        self.assertEqual(c.solve(turn=0), 3)
+        self.assertEqual(c.solve(turn=1), Cats(BOARDS[0]).solve(turn=1))
+        self.assertEqual(len(calls), 1)
+
+        # A position reached by playing moves is answered from the same solve
+        mice, cats, blocks, m, n = c.parse_state()
+        next_mice, next_cats, next_turn = c.get_next_states(mice, cats, 0, blocks, m, n)[0]
+        self.assertIsNotNone(c.cached_score(next_mice, next_cats, next_turn, blocks, m, n))
+
+    def test_turn_switch_after_root_solve(self):
+        # The root solver never settles the other turn's root, so it must be solved again
+        for state in BOARDS:
+            with self.subTest(state=state):
+                expected = [Cats(state).solve(turn=turn) for turn in (0, 1)]
+                c = Cats(state)
+                with mock.patch(f"{Cats.__module__}.BEST_SOLVER", [("root", SOLVERS["root"])]):
+                    self.assertEqual([c.solve(turn=turn) for turn in (0, 1)], expected)
+
+
+class TestRetrogradeSolver(unittest.TestCase):
+    def test_matches_slow_solver(self):
+        # The graph reached from the mice's turn holds the cats' turn states too
+        for state in BOARDS:
+            with self.subTest(state=state):
+                c = Cats(state)
+                mice, cats, blocks, m, n = c.parse_state()
+                root = (mice, cats, 0)
+                board = (blocks, m, n)
+                expected, _ = SOLVERS["slow"]({root: float('inf')}, c.get_next_states, board, c.is_caught)
+                result = SOLVERS["retrograde"]({root: float('inf')}, c.get_next_states, board, c.is_caught)
+                self.assertEqual(result, expected)
@@ -0,0 +1,42 @@
+import unittest
+from cats import Cats
+from solvers import SOLVERS, INF_SCORE, GameGraph
+from test_cats import BOARDS
+
+
+class TestGameGraph(unittest.TestCase):
+    def test_edges_in_both_directions(self):
+        # 0 -> 1 -> 2, 0 -> 2
+        edges = {0: [1, 2], 1: [2], 2: []}
+        graph = GameGraph([0], edges.__getitem__)
+        self.assertEqual(list(graph.child_ids), [1, 2, 2])
+        self.assertEqual(list(graph.parent_offsets), [0, 0, 1, 3])
+        self.assertEqual(list(graph.parent_ids), [0, 0, 1])
+
+    def test_scores_and_sentinel(self):
+        # Mice (even) states 0 and 2, cats (odd) states 1 and 3; 3 can only go back to 2
+        edges = {0: [1], 1: [4, 0], 2: [3], 3: [2], 4: []}
+        graph = GameGraph([0, 2], edges.__getitem__)
+        scores = graph.solve(lambda state: state % 2 == 1)
+        self.assertEqual(scores.typecode, 'H')
+        by_state = dict(zip(graph.states, scores))
+        self.assertEqual(by_state, {0: 3, 1: 2, 2: INF_SCORE, 3: INF_SCORE, 4: 1})
+        report = graph.memory_report()
+        self.assertEqual(report["states"], 5)
+        self.assertEqual(report["edges"], 5)
+        self.assertGreater(report["bytes_per_state"], 0)
+
+    def test_solver_matches_retrograde(self):
+        for state in BOARDS:
+            with self.subTest(state=state):
+                c = Cats(state)
+                mice, cats, blocks, m, n = c.parse_state()
+                root = (mice, cats, 0)
+                board = (blocks, m, n)
+                expected = SOLVERS["retrograde"]({root: float('inf')}, c.get_next_states, board, c.is_caught)
+                result = SOLVERS["csr"]({root: float('inf')}, c.get_next_states, board, c.is_caught)
+                self.assertEqual(result, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
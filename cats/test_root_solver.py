@@ -0,0 +1,64 @@
+import unittest
+from cats import Cats
+from solvers import SOLVERS, CAPTURE, UNBOUNDED, RootSearch
+from test_cats import BOARDS
+
+
+def search_board(state, turn):
+    c = Cats(state)
+    mice, cats, blocks, m, n = c.parse_state()
+    search = RootSearch(c.get_next_states, (blocks, m, n), c.is_caught)
+    return search, search.solve((mice, cats, turn))
+
+
+class TestRootSearch(unittest.TestCase):
+    def test_matches_retrograde(self):
+        for state in BOARDS:
+            c = Cats(state)
+            mice, cats, blocks, m, n = c.parse_state()
+            for turn in (0, 1):
+                with self.subTest(state=state, turn=turn):
+                    root = (mice, cats, turn)
+                    expected = SOLVERS["retrograde"]({root: float('inf')}, c.get_next_states, (blocks, m, n), c.is_caught)
+                    search, (score, outcome) = search_board(state, turn)
+                    self.assertEqual(score, expected[root])
+                    self.assertEqual(outcome, UNBOUNDED if score == float('inf') else CAPTURE)
+                    for key, value in search.exact_scores().items():
+                        self.assertEqual(value, expected[key])
+
+    def test_solver_drops_unsettled_states(self):
+        c = Cats(BOARDS[0])
+        mice, cats, blocks, m, n = c.parse_state()
+        board = (blocks, m, n)
+        root, other = (mice, cats, 0), (mice, cats, 1)
+        expected = SOLVERS["retrograde"]({root: float('inf')}, c.get_next_states, board, c.is_caught)
+        result = SOLVERS["root"]({root: float('inf'), other: float('inf')}, c.get_next_states, board, c.is_caught)
+        self.assertEqual(result[root], expected[root])
+        self.assertNotEqual(result.get(other, expected[other]), float('inf'))
+        self.assertEqual({key: expected[key] for key in result}, result)
+
+    def test_quick_capture_expands_a_fraction_of_the_graph(self):
+        search, (score, outcome) = search_board(BOARDS[0], 0)
+        self.assertEqual((score, outcome), (7, CAPTURE))
+        self.assertFalse(search.fallback)
+        self.assertLess(len(search.children), 14400 // 10)
+
+    def test_sealed_mice_are_unbounded_without_search(self):
+        search, result = search_board(BOARDS[3], 0)
+        self.assertEqual(result, (float('inf'), UNBOUNDED))
+        self.assertEqual(len(search.children), 0)
+
+    def test_mice_running_in_circles(self):
+        # The mouse keeps the 2x2 block between itself and the cat
+        search, result = search_board("""
+                 ....
+                 .XX.
+                 .XXM
+                 C...
+                """, 0)
+        self.assertEqual(result, (float('inf'), UNBOUNDED))
+        self.assertTrue(search.fallback)
+
+
+if __name__ == '__main__':
+    unittest.main()
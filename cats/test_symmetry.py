@@ -0,0 +1,67 @@
+import unittest
+from board_model import BoardModel, board_model
+from cats import Cats
+from solvers import SOLVERS, SymmetricScores
+from test_cats import BOARDS
+
+
+class TestSymmetry(unittest.TestCase):
+    def test_detects_board_symmetries(self):
+        self.assertEqual(len(BoardModel(frozenset(), 5, 5).symmetries), 8)
+        self.assertEqual(len(BoardModel(frozenset(), 3, 5).symmetries), 4)
+        self.assertEqual(len(BoardModel(frozenset({(0, 0), (4, 4)}), 5, 5).symmetries), 4)
+        self.assertEqual(len(BoardModel(frozenset({(0, 2)}), 5, 5).symmetries), 2)
+        self.assertEqual(len(BoardModel(frozenset({(0, 1), (1, 3)}), 5, 5).symmetries), 1)
+
+    def test_canonical_state_is_shared_by_symmetric_states(self):
+        model = BoardModel(frozenset(), 4, 4)
+        state = (((0, 1),), ((2, 3), (3, 3)), 0)
+        mirrored = (((0, 2),), ((2, 0), (3, 0)), 0)
+        self.assertEqual(model.canonical(state), model.canonical(mirrored))
+        self.assertEqual(model.orbit_size(state), 8)
+
+    def test_solver_matches_retrograde(self):
+        boards = BOARDS + ["""
+                 .....
+                 .....
+                 ..C..
+                 .....
+                 M...M
+                """]
+        for state in boards:
+            with self.subTest(state=state):
+                c = Cats(state)
+                mice, cats, blocks, m, n = c.parse_state()
+                board = (blocks, m, n)
+                root = (mice, cats, 0)
+                expected = SOLVERS["retrograde"]({root: float('inf')}, c.get_next_states, board, c.is_caught)
+                result = SOLVERS["symmetric"]({root: float('inf')}, c.get_next_states, board, c.is_caught)
+                self.assertEqual({key: result[key] for key in expected}, expected)
+                self.assertLessEqual(len(result.scores), len(expected))
+                self.assertEqual(dict(result.items()), {key: result[key] for key in result})
+                self.assertGreaterEqual(len(result), len(expected))
+
+    def test_reduction_is_reported(self):
+        c = Cats(BOARDS[0])
+        mice, cats, blocks, m, n = c.parse_state()
+        result = SOLVERS["symmetric"]({(mice, cats, 0): float('inf')}, c.get_next_states, (blocks, m, n), c.is_caught)
+        self.assertEqual(result.stats["symmetries"], 8)
+        self.assertGreater(result.stats["reduction"], 6)
+        self.assertEqual(result.stats["canonical_states"], len(result.scores))
+        self.assertEqual(result.stats["states"], len(result))
+
+    def test_default_solver_uses_canonical_states(self):
+        c = Cats(BOARDS[0])
+        c.solve()
+        self.assertIsInstance(c.last_visited, SymmetricScores)
+        self.assertEqual(c.last_visited.stats["symmetries"], 8)
+        self.assertGreater(c.last_visited.stats["reduction"], 1)
+        self.assertEqual(c.last_visited.stats["canonical_states"], len(c.last_visited.scores))
+        mice, cats, blocks, m, n = c.parse_state()
+        model = board_model(blocks, m, n)
+        self.assertTrue(all(model.canonical(state) == state for state in c.last_visited.scores))
+        self.assertEqual(c.solve(), Cats(BOARDS[0]).solve(use_tablebase=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
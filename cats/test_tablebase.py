@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from cats import Cats
+from solvers import SOLVERS, Tablebase, tablebase
+from solvers.tablebase import tablebase_key
+from solvers.unmove_solver import unmove_scores
+from test_cats import BOARDS
+
+
+class TestTablebase(unittest.TestCase):
+    def test_rank_is_dense(self):
+        table = Tablebase(frozenset({(1, 1)}), 3, 3, 2, 1)
+        ranks = set()
+        for a in range(len(table.cells)):
+            for b in range(a):
+                positions = (table.cells[b], table.cells[a])
+                rank = table.rank(positions)
+                self.assertEqual(table.unrank(rank, 2), positions)
+                ranks.add(rank)
+        self.assertEqual(ranks, set(range(28)))
+
+    def test_matches_retrograde(self):
+        for state in BOARDS:
+            with self.subTest(state=state):
+                c = Cats(state)
+                mice, cats, blocks, m, n = c.parse_state()
+                board = (blocks, m, n)
+                table = tablebase(blocks, m, n, len(mice), len(cats))
+                for turn in (0, 1):
+                    root = (mice, cats, turn)
+                    expected = SOLVERS["retrograde"]({root: float('inf')}, c.get_next_states, board, c.is_caught)
+                    self.assertEqual({key: table[key] for key in expected}, expected)
+
+    def test_matches_unmoves_on_every_position(self):
+        # Three mice: mice positions with many moves and several caught children
+        c = Cats(BOARDS[0])
+        blocks, m, n = frozenset({(1, 2)}), 4, 4
+        table = Tablebase(blocks, m, n, 3, 1).build()
+        expected = unmove_scores(c.get_next_states, (blocks, m, n), c.is_caught, 3, 1)
+        self.assertEqual({key: value for key, value in table.items() if value != float('inf')}, expected)
+
+    def test_solve_with_tablebase(self):
+        for state in BOARDS:
+            with self.subTest(state=state):
+                self.assertEqual(Cats(state).solve(use_tablebase=True), Cats(state).solve())
+
+    def test_save_and_open(self):
+        blocks = frozenset({(0, 1), (2, 2)})
+        table = Tablebase(blocks, 3, 4, 1, 2).build()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "board.cattb")
+            table.save(path)
+            opened = Tablebase.open(path, tablebase_key(blocks, 3, 4, 1, 2))
+            self.assertEqual(opened.blocks, blocks)
+            self.assertFalse(opened.scores.flags.writeable)
+            self.assertTrue((opened.scores == table.scores).all())
+            state = (((1, 0),), ((0, 0), (2, 3)), 1)
+            self.assertEqual(opened[state], table[state])
+            with self.assertRaises(ValueError):
+                Tablebase.open(path, tablebase_key(blocks, 3, 4, 2, 1))
+
+    def test_solve_from_saved_tablebase(self):
+        c = Cats(BOARDS[1])
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(c.solve(use_tablebase=True, tablebase_dir=directory), 4)
+            self.assertEqual(len(os.listdir(directory)), 1)
+            tablebase.cache_clear()
+            self.assertEqual(Cats(BOARDS[1]).solve(turn=1, use_tablebase=True, tablebase_dir=directory), c.solve(turn=1))
+            self.assertEqual(len(os.listdir(directory)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import random
+import unittest
+from cats import Cats
+from solvers import SOLVERS
+from test_cats import BOARDS
+from test_utils import random_position
+
+
+class TestUnmoves(unittest.TestCase):
+    def test_unmoves_invert_moves_on_random_boards(self):
+        rng = random.Random(3)
+        c = Cats("M")
+        for _ in range(300):
+            m, n = rng.randint(2, 5), rng.randint(2, 5)
+            mice, cats, blocks = random_position(rng, m, n, rng.randint(1, 2), rng.randint(1, 3))
+            for turn in (0, 1):
+                state = (mice, cats, turn)
+                next_states = c.get_next_states(mice, cats, turn, blocks, m, n)
+                for next_state in next_states:
+                    self.assertIn(state, c.get_previous_states(*next_state, blocks, m, n))
+                previous = c.get_previous_states(mice, cats, turn, blocks, m, n)
+                self.assertEqual(len(previous), len(set(previous)))
+                for previous_state in previous:
+                    self.assertIn(state, c.get_next_states(*previous_state, blocks, m, n))
+
+    def test_solver_matches_retrograde(self):
+        for state in BOARDS:
+            with self.subTest(state=state):
+                c = Cats(state)
+                mice, cats, blocks, m, n = c.parse_state()
+                board = (blocks, m, n)
+                for turn in (0, 1):
+                    root = (mice, cats, turn)
+                    expected = SOLVERS["retrograde"]({root: float('inf')}, c.get_next_states, board, c.is_caught)
+                    result = SOLVERS["unmove"]({root: float('inf')}, c.get_next_states, board, c.is_caught)
+                    self.assertEqual({key: result.get(key, float('inf')) for key in expected}, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,15 @@
+"""
+Helpers shared by the cats tests.
+"""
+
+
+def random_position(rng, m, n, n_mice, n_cats):
+    """
+    Returns random (mice, cats, blocks) on an m x n board, with up to a quarter of the cells blocked.
+    """
+    cells = [(y, x) for y in range(m) for x in range(n)]
+    blocks = frozenset(rng.sample(cells, rng.randint(0, len(cells) // 4)))
+    free = [cell for cell in cells if cell not in blocks]
+    mice = tuple(sorted(rng.sample(free, n_mice)))
+    cats = tuple(sorted(rng.sample(free, n_cats)))
+    return mice, cats, blocks
@@ -0,0 +1,91 @@
+"""
+רכיבי תצוגה ללוחות של משחק החיים: עורך לוח כרכיב יחיד ותמונת SVG לכל לוח.
+
+במקום כפתור Streamlit לכל תא (מאות ווידג'טים ו-rerun לכל לחיצה), כל הלוח
+הוא canvas אחד בתוך רכיב, וכל גרירה של העכבר נשלחת לפייתון כעדכון אחד.
+"""
+import os
+
+import numpy as np
+import streamlit as st
+import streamlit.components.v1 as components
+
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+_grid_component = components.declare_component("life_grid", path=_FRONTEND_DIR)
+
+ALIVE_COLOR = "#4CAF50"
+DEAD_COLOR = "#f8f9fa"
+LINE_COLOR = "#ddd"
+DONT_CARE_COLOR = "#b0b7c3"
+
+# ערך התא שמסמן "לא משנה" (כמו life.rules.DONT_CARE)
+DONT_CARE = -1
+
+
+def grid_editor(grid, key="grid_editor", dont_care_mode=False):
+    """
+    מציג את הלוח כרכיב יחיד שבו צובעים תאים בלחיצה ובגרירה.
+
+    גרירה שמתחילה בתא מת צובעת תאים כחיים, וגרירה שמתחילה בתא חי מוחקת.
+    במצב "לא משנה" גרירה מסמנת תאים כ-DONT_CARE, וגרירה שמתחילה בתא כזה
+    מחזירה תאים למצב מת.
+
+    Args:
+        grid: מערך דו ממדי NumPy של הלוח הנוכחי
+        key: מפתח ה-Streamlit של הרכיב
+        dont_care_mode: האם המכחול צובע תאים כ"לא משנה"
+
+    Returns:
+        הלוח החדש אם המשתמש שינה אותו מאז הקריאה הקודמת, אחרת None
+    """
+    value = _grid_component(grid=grid.tolist(), mode="dont_care" if dont_care_mode else "toggle",
+                            key=key, default=None)
+    if value is None:
+        return None
+
+    # הרכיב זוכר את הערך האחרון שלו בין reruns; מחילים כל עריכה פעם אחת בלבד
+    applied_key = f"_{key}_applied_edit"
+    if st.session_state.get(applied_key) == value["edit"]:
+        return None
+    st.session_state[applied_key] = value["edit"]
+
+    edited = np.array(value["grid"], dtype=int)
+    if edited.shape != grid.shape:
+        return None  # עריכה של לוח בגודל קודם
+    return edited
+
+
+def grid_svg(grid, cell_size=None, max_width=560):
+    """
+    מחזיר מחרוזת SVG אחת שמציגה את הלוח.
+
+    כל התאים החיים מצוירים כ-path אחד, כך שגודל ה-SVG תלוי במספר התאים החיים
+    ולא בגודל הלוח.
+    """
+    rows, cols = grid.shape
+    if cell_size is None:
+        cell_size = max(4, min(40, max_width // max(cols, 1)))
+    width, height = cols * cell_size, rows * cell_size
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width + 1}" height="{height + 1}" '
+        f'viewBox="0 0 {width + 1} {height + 1}">',
+        f'<rect x="0" y="0" width="{width}" height="{height}" fill="{DEAD_COLOR}"/>',
+    ]
+
+    alive = [f"M{c * cell_size} {r * cell_size}h{cell_size}v{cell_size}h-{cell_size}z"
+             for r, c in zip(*np.nonzero(grid == 1))]
+    if alive:
+        parts.append(f'<path d="{"".join(alive)}" fill="{ALIVE_COLOR}"/>')
+    unknown = [f"M{c * cell_size} {r * cell_size}h{cell_size}v{cell_size}h-{cell_size}z"
+               for r, c in zip(*np.nonzero(grid == DONT_CARE))]
+    if unknown:
+        parts.append(f'<path d="{"".join(unknown)}" fill="{DONT_CARE_COLOR}"/>')
+
+    if cell_size >= 6:
+        lines = [f"M0 {r * cell_size + 0.5}H{width}" for r in range(rows + 1)]
+        lines += [f"M{c * cell_size + 0.5} 0V{height}" for c in range(cols + 1)]
+        parts.append(f'<path d="{"".join(lines)}" stroke="{LINE_COLOR}" stroke-width="1" fill="none"/>')
+
+    parts.append("</svg>")
+    return "".join(parts)
@@ -0,0 +1,37 @@
+import unittest
+
+import numpy as np
+
+from grid_widget import ALIVE_COLOR, DONT_CARE, DONT_CARE_COLOR, grid_svg
+
+
+class TestGridSvg(unittest.TestCase):
+    def test_one_path_for_all_alive_cells(self):
+        grid = np.zeros((64, 64), dtype=int)
+        grid[10, 10:20] = 1
+        svg = grid_svg(grid, cell_size=4)
+        self.assertTrue(svg.startswith("<svg"))
+        self.assertEqual(svg.count("<path"), 1)  # תאים חיים בלבד, בלי קווי רשת בגודל הזה
+        self.assertIn(f'fill="{ALIVE_COLOR}"', svg)
+        self.assertEqual(svg.count("z"), 10)
+
+    def test_empty_board(self):
+        svg = grid_svg(np.zeros((5, 5), dtype=int))
+        self.assertEqual(svg.count("<rect"), 1)
+        self.assertEqual(svg.count("<path"), 1)  # קווי רשת
+
+    def test_dont_care_cells(self):
+        grid = np.zeros((8, 8), dtype=int)
+        grid[0, 0] = 1
+        grid[5, :] = DONT_CARE
+        svg = grid_svg(grid, cell_size=4)
+        self.assertIn(f'fill="{DONT_CARE_COLOR}"', svg)
+        self.assertEqual(svg.count("z"), 9)
+
+    def test_cell_size(self):
+        svg = grid_svg(np.ones((2, 3), dtype=int), cell_size=10)
+        self.assertIn('width="31" height="21"', svg)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+"""
+מנוע משחק החיים: מציאת מצבים קודמים וחיפוש תבניות בעזרת SAT Solver.
+
+השמות הציבוריים נטענים בעצלות (PEP 562): import life לא טוען את NumPy או
+את ה-SAT Solvers, וכל מודול נטען רק בפעם הראשונה שמשתמשים בשם ממנו. כך
+תהליכי עבודה וכלים שצריכים רק חלק מהמנוע עולים מהר.
+"""
+import importlib
+
+# שם ציבורי -> המודול שבו הוא מוגדר
+_EXPORTS = {
+    'DONT_CARE': 'rules',
+    'matches_target': 'rules',
+    'next_state': 'rules',
+    'encode_preimage': 'preimage',
+    'find_preimage': 'preimage',
+    'PeriodicSearch': 'periodic',
+    'find_periodic': 'periodic',
+    'HashLife': 'hashlife',
+    'sample_preimages': 'sampling',
+    'find_preimage_parallel': 'parallel',
+    'iter_preimages_parallel': 'parallel',
+    'SolveStats': 'stats',
+    'PreimageJob': 'jobs',
+    'PoolBusy': 'pool',
+    'SolverPool': 'pool',
+    'AncestrySearch': 'ancestry',
+    'eden_depth': 'ancestry',
+    'read_dimacs': 'dimacs',
+    'solve_external': 'dimacs',
+    'write_dimacs': 'dimacs',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,142 @@
+"""
+עומק "גן העדן" של תבנית: כמה דורות אחורה אפשר לשחזר אותה.
+
+תבנית בעומק d היא תבנית שיש לה שרשרת של d אבות: מצב קודם, מצב קודם
+למצב הקודם, וכן הלאה. החיפוש מעמיק דור אחד בכל פעם על אותו Solver: בכל
+שלב נוספת שכבת מעבר אחת מעל השכבה הקודמת, והפסוקיות שה-Solver למד
+בשלבים הקודמים נשמרות. כך אין צורך לנסות כל מצב קודם בנפרד (מספר
+השרשראות גדל באופן מעריכי עם העומק).
+"""
+import time
+
+from .encoding import cell_to_var, transition_clauses
+from .preprocess import propagate
+from .rules import DONT_CARE
+from .search import limited_solve, model_to_grid, new_solver
+from .stats import SolveStats
+
+# מספר הקונפליקטים בכל פרוסה של קריאה ל-solve, בין בדיקות של מגבלת הזמן
+DEPTH_SLICE = 5000
+
+
+class AncestrySearch:
+    """
+    Solver אינקרמנטלי לשרשראות אבות של מצב מטרה על לוח rows x cols.
+
+    שכבה 0 היא מצב המטרה (תאים ידועים מקובעים, תאי DONT_CARE חופשיים), ושכבה
+    k היא האב ה-k. כמו ב-find_preimage, תאים מחוץ ללוח נחשבים מתים.
+    """
+
+    def __init__(self, target_state, solver_name='glucose4'):
+        self.target_state = target_state
+        self.rows, self.cols = target_state.shape
+        self.solver = new_solver(solver_name)
+        self.stats = SolveStats()
+        self.layers = [0]
+        self.top = self.rows * self.cols
+        self.eden = False
+
+        with self.stats.phase('encode'):
+            units = [[cell_to_var(r, c, self.cols) if target_state[r, c] else -cell_to_var(r, c, self.cols)]
+                     for r in range(self.rows) for c in range(self.cols) if target_state[r, c] != DONT_CARE]
+            self._append(units)
+
+        # העיבוד המקדים של find_preimage מקבע תאים בשכבה 1, או מוכיח מיד שאין אף אב
+        with self.stats.phase('preprocess'):
+            values = propagate(target_state, counters=self.stats.preprocess)
+        self.forced = values
+
+    def _append(self, clauses):
+        self.solver.append_formula(clauses)
+        self.stats.clauses += len(clauses)
+        self.stats.variables = self.top
+
+    @property
+    def depth(self):
+        """
+        מספר השכבות שכבר קודדו מעל מצב המטרה.
+        """
+        return len(self.layers) - 1
+
+    def deepen(self, deadline=None, cancel=None):
+        """
+        מוסיף שכבת אבות אחת ובודק אם יש שרשרת באורך החדש.
+
+        Returns:
+            True אם יש שרשרת, False אם הוכח שאין, None אם הזמן נגמר או שהחיפוש בוטל
+        """
+        if self.eden:
+            return False
+        with self.stats.phase('encode'):
+            offset = self.top
+            self.top += self.rows * self.cols
+            self._append(transition_clauses(self.rows, self.cols, offset, self.layers[-1]))
+            if len(self.layers) == 1 and self.forced is not None:
+                self._append([[cell_to_var(r, c, self.cols, offset) * (1 if self.forced[r, c] else -1)]
+                              for r in range(self.rows) for c in range(self.cols) if self.forced[r, c] >= 0])
+            self.layers.append(offset)
+
+        if len(self.layers) == 2 and self.forced is None:
+            self.stats.preprocess['eden'] = 1
+            self.eden = True
+            return False
+
+        solve_start = time.perf_counter()
+        result = limited_solve(self.solver, deadline=deadline, cancel=cancel, conflict_slice=DEPTH_SLICE)
+        self.stats.solve_times.append(time.perf_counter() - solve_start)
+        if result is False:
+            self.eden = True  # לאב העמוק ביותר שקודד אין אב משלו: זה גן עדן
+        return result
+
+    def chain(self):
+        """
+        מחזיר את שרשרת האבות מהמודל האחרון, מהאב העמוק ביותר ועד מצב המטרה.
+        """
+        model = self.solver.get_model()
+        with self.stats.phase('decode'):
+            return [model_to_grid(model, self.rows, self.cols, offset) for offset in reversed(self.layers)]
+
+    def delete(self):
+        self.stats.record_solver(self.solver)
+        self.solver.delete()
+
+
+def eden_depth(target_state, max_depth=None, time_limit=30, return_stats=False, cancel=None):
+    """
+    מוצא כמה דורות אחורה אפשר לשחזר את target_state, עד מגבלת הזמן.
+
+    Args:
+        target_state: מערך דו ממדי NumPy המייצג את מצב המטרה (אפשר עם DONT_CARE)
+        max_depth: עומק מקסימלי לבדיקה (None = עד שמגיעים לגן עדן או שהזמן נגמר)
+        time_limit: תקציב זמן כולל בשניות
+        return_stats: האם להחזיר גם אובייקט SolveStats
+        cancel: אובייקט Cancellation אופציונלי
+
+    Returns:
+        שלשה (depth, chain, exact):
+        depth - העומק הגדול ביותר שנמצאה לו שרשרת (0 אם המצב עצמו גן עדן)
+        chain - רשימת הלוחות מהאב העמוק ביותר ועד מצב המטרה (באורך depth + 1)
+        exact - True אם הוכח שאין שרשרת ארוכה יותר, False אם החיפוש נעצר לפני כן
+        אם return_stats=True: רביעייה עם stats בסוף
+    """
+    deadline = time.time() + time_limit if time_limit is not None else None
+    search = AncestrySearch(target_state)
+    chain = [target_state.copy()]
+    exact = False
+    try:
+        while max_depth is None or search.depth < max_depth:
+            result = search.deepen(deadline=deadline, cancel=cancel)
+            if result is None:
+                break
+            if not result:
+                exact = True
+                break
+            chain = search.chain()
+            if deadline is not None and time.time() > deadline:
+                break
+    finally:
+        search.delete()
+
+    depth = len(chain) - 1
+    result = (depth, chain, exact)
+    return result + (search.stats,) if return_stats else result
@@ -0,0 +1,353 @@
+"""
+מדידת ביצועים של מציאת מצב קודם, על אוסף קבוע של מצבי מטרה, עם השוואה לתוצאות בסיס.
+
+לכל מצב מטרה ולכל Solver נמדדים בנפרד: הקידוד, הזמן עד הפתרון הראשון,
+המנייה של כל הפתרונות (עד ENUMERATION_LIMIT) והאימות שלהם עם next_state.
+
+    python -m life.bench                       # השוואה לבסיס השמור (BASELINE_PATH)
+    python -m life.bench --update-baseline     # שמירת התוצאות כבסיס החדש
+    python -m life.bench --out results.json --baseline other.json --threshold 0.25
+
+בנוסף נמדד זמן הייבוא (python -X importtime) של מודולי המנוע בתהליך נקי,
+מול תקציב קבוע (IMPORT_BUDGETS) ומול הבסיס.
+
+האוסף נוצר באופן דטרמיניסטי מזרעים קבועים. כל שינוי בו חייב להעלות את
+CORPUS_VERSION, כי אין משמעות להשוואה בין תוצאות של אוספים שונים. קובץ
+הבסיס שמור במאגר וממופה לפי CORPUS_VERSION, כך שאחרי שינוי באוסף צריך
+לשמור בסיס חדש (--update-baseline).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from .preimage import iter_preimages
+from .rules import matches_target
+from .stats import SolveStats
+
+CORPUS_VERSION = 1
+
+# תוצאות הבסיס השמורות, לפי גרסת האוסף
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+
+# ה-Solvers שנמדדים כברירת מחדל (שמות ב-pysat)
+DEFAULT_SOLVERS = ('glucose4', 'cadical153', 'minisat22')
+
+# מספר הפתרונות המקסימלי ומגבלת הזמן (בשניות) למנייה של מצב מטרה אחד
+ENUMERATION_LIMIT = 200
+ENUMERATION_TIME_LIMIT = 20
+
+# המדדים שמושווים לבסיס
+METRICS = ('encode', 'preprocess', 'first_solution', 'enumerate', 'verify')
+
+# הפרש מוחלט (בשניות) שמתחתיו שינוי נחשב לרעש מדידה
+MIN_DELTA = 0.005
+
+# תקציב זמן הייבוא (בשניות, מצטבר) של מודולי המנוע בתהליך נקי. import life
+# לא טוען כלום מראש; השאר נשלטים בעיקר על ידי NumPy ו-pysat.
+IMPORT_BUDGETS = {
+    'life': 0.01,
+    'life.rules': 0.25,
+    'life.pool': 0.35,
+    'life.preimage': 0.35,
+}
+
+# מודולים כבדים שאסור שייטענו בייבוא של המודול (ייבוא -> מודולים אסורים)
+IMPORT_FORBIDDEN = {
+    'life': ('numpy', 'pysat', 'streamlit'),
+    'life.pool': ('pysat.solvers', 'streamlit'),
+}
+
+
+def _random_board(size, density, seed):
+    return (np.random.default_rng(seed).random((size, size)) < density).astype(int)
+
+
+def _placed(pattern, size):
+    board = np.zeros((size, size), dtype=int)
+    top = (size - pattern.shape[0]) // 2
+    left = (size - pattern.shape[1]) // 2
+    board[top:top + pattern.shape[0], left:left + pattern.shape[1]] = pattern
+    return board
+
+
+def corpus(quick=False):
+    """
+    מחזיר את אוסף מצבי המטרה כרשימה של זוגות (name, target_state).
+
+    Args:
+        quick: אוסף מצומצם ללוחות קטנים בלבד, לבדיקה מהירה
+    """
+    cases = []
+
+    # הדוגמאות המובנות של האפליקציה
+    line = np.ones((3, 1), dtype=int)
+    cases.append(('example/blinker_vertical', _placed(line, 5)))
+    cases.append(('example/blinker_horizontal', _placed(line.T, 5)))
+    cases.append(('example/block', _placed(np.ones((2, 2), dtype=int), 4)))
+    cases.append(('example/ui_eden_5x5', np.array([
+        [1, 1, 0, 1, 1],
+        [1, 0, 0, 1, 0],
+        [0, 0, 0, 0, 0],
+        [1, 1, 0, 1, 1],
+        [1, 0, 0, 1, 0],
+    ])))
+
+    # גני עדן ידועים על לוח חסום
+    cases.append(('eden/corner_pair', np.array([[1, 0]])))
+    cases.append(('eden/full_3x3', np.ones((3, 3), dtype=int)))
+
+    # לוחות אקראיים בכמה גדלים וצפיפויות
+    sizes = (8,) if quick else (8, 12, 16)
+    for size in sizes:
+        for density in (0.1, 0.2, 0.35):
+            seed = size * 1000 + int(density * 100)
+            cases.append((f'random/{size}x{size}_d{int(density * 100)}', _random_board(size, density, seed)))
+
+    # מצבי מטרה סימטריים
+    size = 8 if quick else 12
+    half = _random_board(size, 0.25, 7)[:, :size // 2]
+    cases.append((f'symmetric/mirror_{size}', np.hstack([half, half[:, ::-1]])))
+    quarter = _random_board(size // 2, 0.25, 11)
+    top = np.hstack([quarter, np.rot90(quarter, -1)])
+    cases.append((f'symmetric/rot90_{size}', np.vstack([top, np.rot90(top, 2)])))
+
+    return cases
+
+
+def measure(target_state, solver_name='glucose4'):
+    """
+    מודד מצב מטרה אחד עם Solver אחד.
+
+    Returns:
+        מילון עם זמני השלבים (בשניות), מספר הפתרונות, והאם המנייה הושלמה
+    """
+    stats = SolveStats()
+    start = time.perf_counter()
+    solutions = list(iter_preimages(target_state, max_solutions=ENUMERATION_LIMIT,
+                                    time_limit=ENUMERATION_TIME_LIMIT, stats=stats, solver_name=solver_name))
+    elapsed = time.perf_counter() - start
+
+    verify_start = time.perf_counter()
+    valid = all(matches_target(s, target_state) for s in solutions)
+    verify_time = time.perf_counter() - verify_start
+
+    return {
+        'encode': stats.encode_time,
+        'preprocess': stats.preprocess_time,
+        'forced': stats.preprocess.get('forced', 0),
+        'first_solution': stats.solve_times[0] if stats.solve_times else 0.0,
+        'enumerate': stats.solve_time,
+        'verify': verify_time,
+        'total': elapsed + verify_time,
+        'solutions': len(solutions),
+        'complete': len(solutions) < ENUMERATION_LIMIT and stats.solve_time < ENUMERATION_TIME_LIMIT,
+        'valid': valid,
+        'variables': stats.variables,
+        'clauses': stats.clauses,
+    }
+
+
+def measure_import(module, repeat=3):
+    """
+    מודד את זמן הייבוא המצטבר של module בתהליך Python נקי (python -X importtime).
+
+    Returns:
+        זוג (seconds, forbidden): הזמן המינימלי מבין repeat הרצות, ורשימת
+        המודולים מ-IMPORT_FORBIDDEN שנטענו בכל זאת
+    """
+    forbidden = IMPORT_FORBIDDEN.get(module, ())
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    check = f"import sys; print(','.join(m for m in {forbidden!r} if m in sys.modules))"
+    best = None
+    loaded = []
+    for _ in range(repeat):
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}; {check}'],
+                                 capture_output=True, text=True, check=True, cwd=root)
+        for line in process.stderr.splitlines():
+            # import time: <self us> | <cumulative us> | <name>
+            parts = line.split('|')
+            if len(parts) == 3 and parts[2].strip() == module:
+                seconds = int(parts[1]) / 1e6
+                best = seconds if best is None else min(best, seconds)
+        loaded = [m for m in process.stdout.strip().split(',') if m]
+    return best, loaded
+
+
+def import_times(modules=IMPORT_BUDGETS, repeat=3):
+    """
+    Returns:
+        מילון module -> {'seconds': ..., 'forbidden': [...]}
+    """
+    results = {}
+    for module in modules:
+        seconds, loaded = measure_import(module, repeat)
+        results[module] = {'seconds': seconds, 'forbidden': loaded}
+    return results
+
+
+def check_import_budget(imports, budgets=IMPORT_BUDGETS):
+    """
+    Returns:
+        רשימת מחרוזות, אחת לכל מודול שחרג מהתקציב או טען מודול אסור
+    """
+    problems = []
+    for module, result in imports.items():
+        budget = budgets.get(module)
+        if budget is not None and result['seconds'] > budget:
+            problems.append(f"import {module}: {result['seconds'] * 1000:.1f} ms, budget {budget * 1000:.0f} ms")
+        if result['forbidden']:
+            problems.append(f"import {module}: loads {', '.join(result['forbidden'])}")
+    return problems
+
+
+def run(solvers=DEFAULT_SOLVERS, quick=False, repeat=3, cases=None, log=None, imports=True):
+    """
+    מריץ את כל האוסף עם כל ה-Solvers.
+
+    כל מדידה חוזרת repeat פעמים ונשמר החציון של כל זמן, כדי לצמצם רעש.
+    אם imports=True נמדדים גם זמני הייבוא.
+
+    Returns:
+        מילון תוצאות שאפשר לשמור כ-JSON ולהשוות בעזרת compare
+    """
+    results = {}
+    for name, target in (cases if cases is not None else corpus(quick)):
+        for solver_name in solvers:
+            runs = [measure(target, solver_name) for _ in range(repeat)]
+            result = dict(runs[0])
+            for key in METRICS + ('total',):
+                result[key] = statistics.median(r[key] for r in runs)
+            results[f'{name}@{solver_name}'] = result
+            if log is not None:
+                log(f"{name:32} {solver_name:12} first {result['first_solution'] * 1000:8.2f} ms  "
+                    f"all {result['enumerate'] * 1000:8.2f} ms  ({result['solutions']} solutions)")
+
+    return {
+        'corpus_version': CORPUS_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'platform': {'python': platform.python_version(), 'machine': platform.machine(),
+                     'system': platform.system()},
+        'quick': quick,
+        'results': results,
+        'imports': import_times(repeat=repeat) if imports else {},
+    }
+
+
+def compare(current, baseline, threshold=0.25, min_delta=MIN_DELTA):
+    """
+    משווה תוצאות לתוצאות הבסיס.
+
+    Args:
+        current, baseline: מילונים שהחזירה run
+        threshold: האטה יחסית מותרת (0.25 = עד 25% יותר זמן)
+        min_delta: הפרש מוחלט בשניות שמתחתיו לא מדווחים
+
+    Returns:
+        רשימת מחרוזות, אחת לכל האטה או שינוי במספר הפתרונות (ריקה אם הכל תקין)
+
+    Raises:
+        ValueError: אם התוצאות נמדדו על גרסאות שונות של האוסף
+    """
+    if current['corpus_version'] != baseline['corpus_version']:
+        raise ValueError(f"corpus version mismatch: {current['corpus_version']} vs {baseline['corpus_version']}")
+
+    problems = []
+    for key, result in current['results'].items():
+        base = baseline['results'].get(key)
+        if base is None:
+            continue
+        if not result['valid']:
+            problems.append(f"{key}: invalid solution")
+        if result['complete'] and base['complete'] and result['solutions'] != base['solutions']:
+            problems.append(f"{key}: {result['solutions']} solutions, baseline had {base['solutions']}")
+        for metric in METRICS:
+            problems += _slower(f"{key}: {metric}", result[metric], base[metric], threshold, min_delta)
+
+    for module, result in current.get('imports', {}).items():
+        base = baseline.get('imports', {}).get(module)
+        if base is not None:
+            problems += _slower(f"import {module}", result['seconds'], base['seconds'], threshold, min_delta)
+    return problems
+
+
+def load_baseline(path=BASELINE_PATH, version=CORPUS_VERSION):
+    """
+    מחזיר את תוצאות הבסיס של גרסת האוסף מקובץ הבסיס, או None אם אין כאלה.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as fp:
+        baselines = json.load(fp)
+    return baselines.get(str(version))
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    """
+    שומר תוצאות כבסיס של גרסת האוסף שלהן, בלי לגעת בבסיסים של גרסאות אחרות.
+    """
+    baselines = {}
+    if os.path.exists(path):
+        with open(path) as fp:
+            baselines = json.load(fp)
+    baselines[str(results['corpus_version'])] = results
+    with open(path, 'w') as fp:
+        json.dump(baselines, fp, indent=2, sort_keys=True)
+        fp.write('\n')
+
+
+def _slower(label, new, old, threshold, min_delta):
+    if new - old > min_delta and new > old * (1 + threshold):
+        increase = (new / old - 1) * 100 if old else float('inf')
+        return [f"{label} {old * 1000:.2f} ms -> {new * 1000:.2f} ms (+{increase:.0f}%)"]
+    return []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Game of Life preimage pipeline")
+    parser.add_argument('--solvers', nargs='+', default=list(DEFAULT_SOLVERS))
+    parser.add_argument('--quick', action='store_true', help="small boards only")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--out', help="write the results to this JSON file")
+    parser.add_argument('--baseline', default=BASELINE_PATH,
+                        help="compare against the baseline stored in this JSON file for the corpus version "
+                             "(default: the committed baseline; '' skips the comparison)")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="store the results as the baseline for the corpus version")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument('--min-delta', type=float, default=MIN_DELTA, help="ignore slowdowns below this (seconds)")
+    args = parser.parse_args(argv)
+
+    results = run(args.solvers, args.quick, args.repeat, log=print)
+    for module, result in results['imports'].items():
+        print(f"import {module:28} {result['seconds'] * 1000:8.2f} ms")
+    if args.out:
+        with open(args.out, 'w') as fp:
+            json.dump(results, fp, indent=2)
+
+    problems = check_import_budget(results['imports'])
+    if args.update_baseline:
+        save_baseline(results, args.baseline or BASELINE_PATH)
+        print(f"baseline for corpus version {CORPUS_VERSION} saved to {args.baseline or BASELINE_PATH}")
+    elif args.baseline:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            print(f"REGRESSION no baseline for corpus version {CORPUS_VERSION} in {args.baseline}")
+            return 1
+        problems += compare(results, baseline, args.threshold, args.min_delta)
+    for problem in problems:
+        print("REGRESSION", problem)
+    if problems:
+        return 1
+    print("no regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
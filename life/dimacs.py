@@ -0,0 +1,200 @@
+"""
+ייצוא וייבוא של נוסחת המצב הקודם בפורמט DIMACS, והרצה של Solver חיצוני עליה.
+
+הקובץ כולל הערות שמתארות את מצב המטרה ואת המיפוי בין משתנים לתאים, כך
+שאפשר לשחזר את הלוח מכל מודל בלי לקודד את הבעיה מחדש:
+
+    c life-preimage <rows> <cols>
+    c target <שורה של מצב המטרה, למשל 01110; ? לתא DONT_CARE>
+    c var <v> cell <r> <c>
+"""
+import gzip
+import mmap
+import os
+import shutil
+import subprocess
+import tempfile
+
+import numpy as np
+from pysat.formula import CNF
+
+from .encoding import cell_to_var
+from .preimage import encode_preimage
+from .rules import DONT_CARE
+from .search import model_to_grid
+
+# קודי היציאה המקובלים של Solvers בתחרויות SAT
+SAT_EXIT_CODE = 10
+UNSAT_EXIT_CODE = 20
+
+
+def _open(path, mode):
+    if str(path).endswith('.gz'):
+        return gzip.open(path, mode + 't')
+    return open(path, mode)
+
+
+def preimage_comments(target_state):
+    """
+    מחזיר את שורות ההערה שמתארות את מצב המטרה ואת מיפוי המשתנים.
+    """
+    rows, cols = target_state.shape
+    comments = [f'c life-preimage {rows} {cols}']
+    comments += ['c target ' + ''.join('?' if v == DONT_CARE else str(int(v)) for v in row)
+                 for row in target_state]
+    comments += [f'c var {cell_to_var(r, c, cols)} cell {r} {c}' for r in range(rows) for c in range(cols)]
+    return comments
+
+
+def write_dimacs(target_state, path, formula=None):
+    """
+    כותב את נוסחת המצב הקודם של target_state לקובץ DIMACS.
+
+    Args:
+        target_state: מערך דו ממדי NumPy המייצג את מצב המטרה
+        path: נתיב הקובץ; אם הוא מסתיים ב-.gz הקובץ נדחס ב-gzip
+        formula: נוסחה שכבר קודדה (אחרת היא נבנית מ-target_state)
+
+    Returns:
+        הנוסחה שנכתבה
+    """
+    if formula is None:
+        formula = encode_preimage(target_state)
+    with _open(path, 'w') as fp:
+        formula.to_fp(fp, comments=preimage_comments(target_state))
+    return formula
+
+
+def _parse_lines(lines):
+    """
+    מפרק שורות DIMACS (כ-bytes) לפסוקיות ולהערות. פסוקית יכולה להתפרס על כמה שורות.
+    """
+    clauses, comments = [], []
+    current = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line[:1] == b'c':
+            comments.append(line.decode())
+            continue
+        if line[:1] in (b'p', b'%'):
+            continue
+        for lit in map(int, line.split()):
+            if lit == 0:
+                clauses.append(current)
+                current = []
+            else:
+                current.append(lit)
+    if current:
+        clauses.append(current)
+    return clauses, comments
+
+
+def _iter_mapped_lines(path):
+    with open(path, 'rb') as fp:
+        if os.fstat(fp.fileno()).st_size == 0:
+            return
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from iter(mm.readline, b'')
+
+
+def read_dimacs(path):
+    """
+    קורא קובץ DIMACS (רגיל או .gz).
+
+    קובץ רגיל ממופה לזיכרון (mmap) ונקרא שורה אחר שורה, כך שגם קבצים גדולים
+    לא נטענים לזיכרון כמחרוזת אחת.
+
+    Returns:
+        זוג (formula, target_state); target_state הוא None אם הקובץ לא נכתב
+        על ידי write_dimacs
+    """
+    if str(path).endswith('.gz'):
+        with gzip.open(path, 'rb') as fp:
+            clauses, comments = _parse_lines(fp)
+    else:
+        clauses, comments = _parse_lines(_iter_mapped_lines(path))
+
+    formula = CNF(from_clauses=clauses)
+    return formula, target_from_comments(comments)
+
+
+def target_from_comments(comments):
+    """
+    משחזר את מצב המטרה מההערות של write_dimacs, או מחזיר None אם הן חסרות.
+    """
+    header = [c.split() for c in comments if c.startswith('c life-preimage')]
+    if not header:
+        return None
+    rows, cols = int(header[0][2]), int(header[0][3])
+    lines = [c.split()[2] for c in comments if c.startswith('c target ')]
+    if len(lines) != rows or any(len(line) != cols for line in lines):
+        raise ValueError("target comments do not match the header")
+    return np.array([[DONT_CARE if ch == '?' else int(ch) for ch in line] for line in lines], dtype=int)
+
+
+def parse_solver_output(output):
+    """
+    מפרק את הפלט של Solver בפורמט של תחרויות SAT (שורות 's' ו-'v').
+
+    Returns:
+        זוג (status, model): status הוא True, False או None (לא הוכרע),
+        ו-model הוא רשימת הליטרלים (או None)
+    """
+    status = None
+    model = []
+    for line in output.splitlines():
+        if line.startswith('s '):
+            answer = line[2:].strip()
+            if answer == 'SATISFIABLE':
+                status = True
+            elif answer == 'UNSATISFIABLE':
+                status = False
+        elif line.startswith('v '):
+            model.extend(int(lit) for lit in line[2:].split() if lit != '0')
+    return status, (model if status else None)
+
+
+def solve_external(target_state, solver='kissat', args=(), time_limit=None, path=None):
+    """
+    מריץ Solver חיצוני על נוסחת המצב הקודם ומחזיר את הלוח שהוא מצא.
+
+    Args:
+        target_state: מערך דו ממדי NumPy המייצג את מצב המטרה
+        solver: שם של קובץ הרצה ב-PATH (או נתיב מלא)
+        args: ארגומנטים נוספים שמועברים ל-Solver לפני שם הקובץ
+        time_limit: מגבלת זמן בשניות (None = ללא הגבלה)
+        path: קובץ DIMACS שכבר נכתב עבור target_state; אחרת נכתב קובץ זמני
+
+    Returns:
+        מצב קודם כמערך NumPy, או None אם ה-Solver הוכיח שאין פתרון
+
+    Raises:
+        FileNotFoundError: אם ה-Solver לא נמצא
+        subprocess.TimeoutExpired: אם עברה מגבלת הזמן
+        RuntimeError: אם ה-Solver הסתיים בלי תשובה
+    """
+    executable = shutil.which(solver)
+    if executable is None:
+        raise FileNotFoundError(f"SAT solver '{solver}' was not found on PATH")
+
+    rows, cols = target_state.shape
+    with tempfile.TemporaryDirectory() as tmp:
+        if path is None:
+            path = os.path.join(tmp, 'preimage.cnf')
+            write_dimacs(target_state, path)
+        result = subprocess.run(
+            [executable, *args, str(path)],
+            capture_output=True, text=True, timeout=time_limit
+        )
+
+    status, model = parse_solver_output(result.stdout)
+    if status is None:
+        # חלק מה-Solvers מדווחים רק בקוד היציאה
+        status = {SAT_EXIT_CODE: True, UNSAT_EXIT_CODE: False}.get(result.returncode)
+    if status is None or (status and not model):
+        raise RuntimeError(f"{solver} exited with code {result.returncode} without an answer")
+    if not status:
+        return None
+    return model_to_grid(model, rows, cols)
@@ -0,0 +1,135 @@
+"""
+קידוד חוקי המעבר של משחק החיים כפסוקיות CNF.
+
+כל תא בדור מסוים מיוצג כמשתנה בוליאני. דור שלם תופס בלוק רציף של
+rows * cols משתנים שמתחיל אחרי offset.
+"""
+from itertools import combinations as iter_combinations
+
+from .rules import DONT_CARE, next_cell_value, neighbor_cells
+
+
+def cell_to_var(r, c, cols, offset=0):
+    """
+    ממיר מיקום תא למספר משתנה (המספור מתחיל מ-1, כמקובל ב-DIMACS).
+    """
+    return offset + 1 + r * cols + c
+
+
+def layer_vars(rows, cols, offset=0):
+    """
+    מחזיר את רשימת המשתנים של דור שלם לפי סדר השורות.
+    """
+    return list(range(offset + 1, offset + rows * cols + 1))
+
+
+def preimage_vars(target_state):
+    """
+    מחזיר את משתני המצב הקודם שמשפיעים על תא ידוע כלשהו במצב המטרה.
+
+    תא שכל התאים בסביבתו הם DONT_CARE לא מופיע באף פסוקית, ולכן אין טעם
+    לחסום עליו פתרונות (אחרת כל השמה שלו הייתה נספרת כפתרון נפרד).
+    """
+    rows, cols = target_state.shape
+    known = target_state != DONT_CARE
+    return [
+        cell_to_var(r, c, cols) for r in range(rows) for c in range(cols)
+        if known[max(r - 1, 0):r + 2, max(c - 1, 0):c + 2].any()
+    ]
+
+
+def neighbor_vars(r, c, rows, cols, offset=0):
+    """
+    מחזיר את משתני השכנים של התא (r, c) בתוך הלוח.
+    """
+    return [cell_to_var(nr, nc, cols, offset) for nr, nc in neighbor_cells(r, c, rows, cols)]
+
+
+def _cases(center_var, neighbors):
+    """
+    עובר על כל ההשמות האפשריות לתא ולשכניו.
+
+    מחזיר שלשות (case, center_alive, alive_count), כאשר case היא רשימת
+    הליטרלים שמתארת את ההשמה.
+    """
+    for center_alive in (True, False):
+        for alive_count in range(len(neighbors) + 1):
+            for alive_combo in iter_combinations(neighbors, alive_count):
+                case = [center_var if center_alive else -center_var]
+                for n in neighbors:
+                    if n in alive_combo:
+                        case.append(n)  # שכן חי
+                    else:
+                        case.append(-n)  # שכן מת
+                yield case, center_alive, alive_count
+
+
+def cell_clauses(center_var, neighbors, target_cell):
+    """
+    יוצר פסוקיות שמבטיחות שהתא יהיה במצב target_cell בדור הבא.
+
+    כל השמה לתא ולשכניו שמובילה לערך אחר נפסלת בפסוקית אחת (ההיפוך שלה).
+
+    Args:
+        center_var: משתנה התא במצב הקודם
+        neighbors: משתני השכנים במצב הקודם
+        target_cell: 1 אם התא חי במצב המטרה, 0 אם הוא מת
+
+    Returns:
+        רשימת פסוקיות
+    """
+    clauses = []
+    for case, center_alive, alive_count in _cases(center_var, neighbors):
+        if next_cell_value(center_alive, alive_count) != target_cell:
+            clauses.append([-lit for lit in case])
+    return clauses
+
+
+def step_clauses(center_var, neighbors, out_var):
+    """
+    יוצר פסוקיות שקושרות את משתנה התא בדור הבא (out_var) לתא ולשכניו בדור הנוכחי.
+
+    זהו אותו קידוד כמו cell_clauses, אלא שמצב המטרה הוא משתנה ולא קבוע,
+    ולכן כל השמה מחייבת את out_var לערך הנכון במקום להיפסל.
+
+    Returns:
+        רשימת פסוקיות
+    """
+    clauses = []
+    for case, center_alive, alive_count in _cases(center_var, neighbors):
+        out_lit = out_var if next_cell_value(center_alive, alive_count) else -out_var
+        clauses.append([-lit for lit in case] + [out_lit])
+    return clauses
+
+
+def transition_clauses(rows, cols, offset, next_offset):
+    """
+    יוצר את כל הפסוקיות של צעד אחד בין שני דורות משתנים על לוח rows x cols.
+    """
+    clauses = []
+    for r in range(rows):
+        for c in range(cols):
+            clauses.extend(step_clauses(
+                cell_to_var(r, c, cols, offset),
+                neighbor_vars(r, c, rows, cols, offset),
+                cell_to_var(r, c, cols, next_offset)
+            ))
+    return clauses
+
+
+def border_clauses(rows, cols, offset=0):
+    """
+    יוצר פסוקיות שמונעות לידה של תאים מחוץ ללוח.
+
+    תא מחוץ ללוח נולד אם בדיוק 3 משכניו חיים. לתא כזה יש לכל היותר 3 שכנים
+    בתוך הלוח, ולכן מספיק לאסור ששלושתם יהיו חיים יחד.
+    """
+    clauses = []
+    for r in range(-1, rows + 1):
+        for c in range(-1, cols + 1):
+            if 0 <= r < rows and 0 <= c < cols:
+                continue
+            inside = neighbor_vars(r, c, rows, cols, offset)
+            if len(inside) == 3:
+                clauses.append([-v for v in inside])
+    return clauses
@@ -0,0 +1,311 @@
+"""
+מנוע HashLife לסימולציה קדימה של תבניות גדולות או לאורך דורות רבים.
+
+הלוח מיוצג כעץ רבעים (quadtree) שבו כל צומת קנוני: שני אזורים זהים
+מיוצגים באותו אובייקט, והתוצאה של קידום כל צומת נשמרת בזיכרון מטמון.
+בניגוד ל-next_state, הלוח כאן אינסופי ואין הנחה שהתאים מחוץ ללוח מתים.
+"""
+import numpy as np
+
+from .rules import next_cell_value
+
+
+class Node:
+    """
+    צומת קנוני בעץ הרבעים. צומת ברמה level מכסה ריבוע בגודל 2**level.
+    עלים (level=0) הם תא חי או תא מת.
+    """
+    __slots__ = ('nw', 'ne', 'sw', 'se', 'level', 'population')
+
+    def __init__(self, nw, ne, sw, se, level, population):
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.level = level
+        self.population = population
+
+    def __repr__(self):
+        return f"Node(level={self.level}, population={self.population})"
+
+
+class HashLife:
+    """
+    יקום של משחק החיים שמקודם בעזרת HashLife.
+
+    הקואורדינטות (שורה, עמודה) של היקום זהות לאלו של הלוח שממנו נבנה:
+    התא (0, 0) של from_array הוא התא (0, 0) של היקום.
+    """
+
+    def __init__(self, max_nodes=1_000_000):
+        """
+        Args:
+            max_nodes: מספר הצמתים המקסימלי בטבלה; כשעוברים אותו אחרי קידום,
+                צמתים שאינם נגישים מהשורש נאספים
+        """
+        self.max_nodes = max_nodes
+        self._table = {}
+        self._results = {}
+        self._empty = []
+        self.off = Node(None, None, None, None, 0, 0)
+        self.on = Node(None, None, None, None, 0, 1)
+        self.root = self.empty(2)
+        self.origin = (0, 0)
+        self.shape = (0, 0)
+        self.generation = 0
+
+    # --- בניית צמתים ---
+
+    def join(self, nw, ne, sw, se):
+        """
+        מחזיר את הצומת הקנוני שהרבעים שלו הם nw, ne, sw, se.
+        """
+        key = (nw, ne, sw, se)
+        node = self._table.get(key)
+        if node is None:
+            node = Node(nw, ne, sw, se, nw.level + 1,
+                        nw.population + ne.population + sw.population + se.population)
+            self._table[key] = node
+        return node
+
+    def empty(self, level):
+        """
+        מחזיר צומת ריק ברמה level.
+        """
+        while len(self._empty) <= level:
+            if not self._empty:
+                self._empty.append(self.off)
+            else:
+                e = self._empty[-1]
+                self._empty.append(self.join(e, e, e, e))
+        return self._empty[level]
+
+    def centre(self, node):
+        """
+        מחזיר צומת ברמה אחת מעל, שבמרכזו node ומסביבו תאים מתים.
+        """
+        e = self.empty(node.level - 1)
+        return self.join(
+            self.join(e, e, e, node.nw),
+            self.join(e, e, node.ne, e),
+            self.join(e, node.sw, e, e),
+            self.join(node.se, e, e, e)
+        )
+
+    def _inner(self, node):
+        """
+        מחזיר את חצי הצומת שבמרכזו (רמה אחת מתחת).
+        """
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    # --- קידום ---
+
+    def _life_4x4(self, node):
+        """
+        מקדם צומת 4x4 בדור אחד ומחזיר את מרכזו בגודל 2x2.
+        """
+        cells = [[0] * 4 for _ in range(4)]
+        for qr, qc, quad in ((0, 0, node.nw), (0, 2, node.ne), (2, 0, node.sw), (2, 2, node.se)):
+            for r, c, leaf in ((0, 0, quad.nw), (0, 1, quad.ne), (1, 0, quad.sw), (1, 1, quad.se)):
+                cells[qr + r][qc + c] = leaf.population
+
+        leaves = []
+        for r in (1, 2):
+            for c in (1, 2):
+                live_neighbors = sum(cells[r + dr][c + dc]
+                                     for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc)
+                leaves.append(self.on if next_cell_value(cells[r][c], live_neighbors) else self.off)
+        return self.join(*leaves)
+
+    def successor(self, node, j):
+        """
+        מחזיר את המרכז של node (רמה אחת מתחת) אחרי 2**j דורות.
+
+        אם j גדול מ-node.level - 2, הקפיצה מוגבלת ל-2**(node.level - 2) דורות.
+        """
+        if node.population == 0:
+            return node.nw
+        j = min(j, node.level - 2)
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            a, b, c, d = node.nw, node.ne, node.sw, node.se
+            join = self.join
+            c1 = self.successor(join(a.nw, a.ne, a.sw, a.se), j)
+            c2 = self.successor(join(a.ne, b.nw, a.se, b.sw), j)
+            c3 = self.successor(join(b.nw, b.ne, b.sw, b.se), j)
+            c4 = self.successor(join(a.sw, a.se, c.nw, c.ne), j)
+            c5 = self.successor(join(a.se, b.sw, c.ne, d.nw), j)
+            c6 = self.successor(join(b.sw, b.se, d.nw, d.ne), j)
+            c7 = self.successor(join(c.nw, c.ne, c.sw, c.se), j)
+            c8 = self.successor(join(c.ne, d.nw, c.se, d.sw), j)
+            c9 = self.successor(join(d.nw, d.ne, d.sw, d.se), j)
+            if j < node.level - 2:
+                # שלב אחד: כל אחד מתשעת החלקים כבר קודם ב-2**j דורות
+                result = join(
+                    join(c1.se, c2.sw, c4.ne, c5.nw),
+                    join(c2.se, c3.sw, c5.ne, c6.nw),
+                    join(c4.se, c5.sw, c7.ne, c8.nw),
+                    join(c5.se, c6.sw, c8.ne, c9.nw)
+                )
+            else:
+                # שני שלבים של 2**(level-3) דורות כל אחד
+                result = join(
+                    self.successor(join(c1, c2, c4, c5), j),
+                    self.successor(join(c2, c3, c5, c6), j),
+                    self.successor(join(c4, c5, c7, c8), j),
+                    self.successor(join(c5, c6, c8, c9), j)
+                )
+
+        self._results[key] = result
+        return result
+
+    def step(self, k):
+        """
+        מקדם את היקום ב-2**k דורות בקפיצה אחת.
+        """
+        root = self.root
+        row, col = self.origin
+        # מרחיבים עד שהתבנית כולה במחצית הפנימית והרמה מספיקה לקפיצה
+        while root.level < k + 2 or self._inner(root).population != root.population:
+            half = 1 << (root.level - 1)
+            root = self.centre(root)
+            row, col = row - half, col - half
+        # ריפוד נוסף מבטיח שהתבנית לא תצא מהמרכז שמוחזר
+        half = 1 << (root.level - 1)
+        root = self.centre(root)
+        row, col = row - half, col - half
+
+        self.root = self.successor(root, k)
+        quarter = 1 << (root.level - 2)
+        self.origin = (row + quarter, col + quarter)
+        self.generation += 1 << k
+
+        if len(self._table) > self.max_nodes:
+            self.collect()
+
+    def advance(self, generations):
+        """
+        מקדם את היקום במספר דורות כלשהו, כסכום של קפיצות בחזקות של 2.
+        """
+        k = 0
+        while generations:
+            if generations & 1:
+                self.step(k)
+            generations >>= 1
+            k += 1
+
+    # --- ניהול זיכרון ---
+
+    def collect(self):
+        """
+        משחרר את כל הצמתים ותוצאות המטמון שאינם נגישים מהשורש.
+        """
+        alive = set()
+        stack = [self.root] + self._empty
+        while stack:
+            node = stack.pop()
+            if node.level == 0 or node in alive:
+                continue
+            alive.add(node)
+            stack.extend((node.nw, node.ne, node.sw, node.se))
+
+        self._table = {key: node for key, node in self._table.items() if node in alive}
+        self._results = {key: result for key, result in self._results.items()
+                         if key[0] in alive and (result.level == 0 or result in alive)}
+
+    @property
+    def node_count(self):
+        return len(self._table)
+
+    @property
+    def population(self):
+        return self.root.population
+
+    # --- המרה ללוחות צפופים ---
+
+    @classmethod
+    def from_array(cls, grid, max_nodes=1_000_000):
+        """
+        בונה יקום מלוח צפוף (כמו הלוחות שמחזירה find_preimage).
+        """
+        universe = cls(max_nodes=max_nodes)
+        rows, cols = grid.shape
+        level = 2
+        while (1 << level) < max(rows, cols):
+            level += 1
+
+        def build(level, top, left):
+            if top >= rows or left >= cols:
+                return universe.empty(level)
+            if level == 0:
+                return universe.on if grid[top, left] == 1 else universe.off
+            half = 1 << (level - 1)
+            return universe.join(
+                build(level - 1, top, left),
+                build(level - 1, top, left + half),
+                build(level - 1, top + half, left),
+                build(level - 1, top + half, left + half)
+            )
+
+        universe.root = build(level, 0, 0)
+        universe.shape = (rows, cols)
+        return universe
+
+    def to_array(self, top=0, left=0, rows=None, cols=None):
+        """
+        מחזיר לוח צפוף של החלון שמתחיל ב-(top, left) בקואורדינטות היקום.
+
+        ברירת המחדל היא החלון של הלוח המקורי שממנו נבנה היקום.
+        """
+        rows = self.shape[0] if rows is None else rows
+        cols = self.shape[1] if cols is None else cols
+        grid = np.zeros((rows, cols), dtype=int)
+
+        stack = [(self.root, self.origin[0] - top, self.origin[1] - left)]
+        while stack:
+            node, r, c = stack.pop()
+            size = 1 << node.level
+            if node.population == 0 or r >= rows or c >= cols or r + size <= 0 or c + size <= 0:
+                continue
+            if node.level == 0:
+                grid[r, c] = 1
+                continue
+            half = size >> 1
+            stack.append((node.nw, r, c))
+            stack.append((node.ne, r, c + half))
+            stack.append((node.sw, r + half, c))
+            stack.append((node.se, r + half, c + half))
+        return grid
+
+    def bounding_box(self):
+        """
+        מחזיר (top, left, rows, cols) של המלבן הקטן ביותר שמכיל את כל התאים החיים,
+        או None אם היקום ריק.
+        """
+        if self.root.population == 0:
+            return None
+        bounds = [None, None, None, None]  # top, left, bottom, right
+        stack = [(self.root, self.origin[0], self.origin[1])]
+        while stack:
+            node, r, c = stack.pop()
+            if node.population == 0:
+                continue
+            if node.level == 0:
+                bounds[0] = r if bounds[0] is None else min(bounds[0], r)
+                bounds[1] = c if bounds[1] is None else min(bounds[1], c)
+                bounds[2] = r if bounds[2] is None else max(bounds[2], r)
+                bounds[3] = c if bounds[3] is None else max(bounds[3], c)
+                continue
+            half = 1 << (node.level - 1)
+            stack.append((node.nw, r, c))
+            stack.append((node.ne, r, c + half))
+            stack.append((node.sw, r + half, c))
+            stack.append((node.se, r + half, c + half))
+        top, left, bottom, right = bounds
+        return top, left, bottom - top + 1, right - left + 1
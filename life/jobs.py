@@ -0,0 +1,126 @@
+"""
+הרצת שאילתת מצב קודם ברקע, עם דיווח התקדמות וביטול.
+
+ה-SAT Solver משחרר את ה-GIL בזמן הפתרון, ולכן thread ברקע לא חוסם את
+ה-threads של sessions אחרים באותו שרת Streamlit.
+"""
+import threading
+import time
+
+from .rules import matches_target
+from .search import Cancellation
+from .stats import SolveStats
+
+
+def query_solutions(target_state, max_solutions, time_limit, diverse=False, stats=None, cancel=None,
+                    on_progress=None):
+    """
+    מחזיר את זרם הפתרונות של שאילתה אחת, במצב הרגיל או במצב הפתרונות המגוונים.
+    """
+    # מיובאים כאן ולא בראש המודול, כדי שהממשק ומאגר התהליכים לא יטענו את pysat
+    from .preimage import iter_preimages
+    from .sampling import PROGRESS_SLICE, iter_samples
+
+    if diverse:
+        return iter_samples(
+            target_state, k=max_solutions, time_limit=time_limit,
+            stats=stats, cancel=cancel, on_progress=on_progress
+        )
+    return iter_preimages(
+        target_state, max_solutions=max_solutions, time_limit=time_limit,
+        stats=stats, cancel=cancel, conflict_slice=PROGRESS_SLICE, on_progress=on_progress
+    )
+
+
+class PreimageJob:
+    """
+    שאילתת מצב קודם שרצה ב-thread נפרד.
+
+    כל השדות הציבוריים נקראים ישירות מה-thread של הממשק:
+    status הוא אחד מ-'pending', 'queued', 'running', 'done', 'cancelled', 'error';
+    solutions מתמלאת בזמן החיפוש; conflicts מתעדכן אחרי כל פרוסת קונפליקטים.
+    """
+
+    def __init__(self, target_state, max_solutions=10, time_limit=10, diverse=False):
+        self.target_state = target_state.copy()
+        self.max_solutions = max_solutions
+        self.time_limit = time_limit
+        self.diverse = diverse
+        self.status = 'pending'
+        self.solutions = []
+        self.conflicts = 0
+        self.stats = SolveStats()
+        self.error = None
+        self.valid = None
+        self.start_time = None
+        self.end_time = None
+        self._cancel = Cancellation()
+        self._thread = None
+
+    def start(self):
+        self.status = 'running'
+        self.start_time = time.time()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """
+        מבקש לעצור את החיפוש; ה-Solver שרץ כרגע נקטע מיד.
+        """
+        self._cancel.cancel()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _on_progress(self, solver):
+        self.conflicts = solver.accum_stats().get('conflicts', 0)
+
+    def _run(self):
+        try:
+            solutions = query_solutions(
+                self.target_state, self.max_solutions, self.time_limit, self.diverse,
+                stats=self.stats, cancel=self._cancel, on_progress=self._on_progress
+            )
+            for solution in solutions:
+                self.solutions.append(solution)
+            self.status = 'cancelled' if self._cancel.is_set() else 'done'
+        except Exception as e:
+            self.error = e
+            self.status = 'error'
+        finally:
+            self.end_time = time.time()
+
+    def verify(self):
+        """
+        בודק (פעם אחת, אחרי שהחיפוש הסתיים) שכל פתרון אכן מוביל למצב המטרה.
+
+        Returns:
+            רשימה של ערכי אמת, אחד לכל פתרון
+        """
+        if self.valid is None and not self.running:
+            with self.stats.phase('verify'):
+                self.valid = [matches_target(s, self.target_state) for s in self.solutions]
+        return self.valid
+
+    @property
+    def running(self):
+        return self.status in ('pending', 'queued', 'running')
+
+    @property
+    def elapsed(self):
+        if self.start_time is None:
+            return 0.0
+        return (self.end_time or time.time()) - self.start_time
+
+    @property
+    def progress(self):
+        """
+        הערכת התקדמות בין 0 ל-1: לפי מספר הפתרונות או לפי הזמן, הגבוה מביניהם.
+        """
+        if not self.running:
+            return 1.0
+        by_solutions = len(self.solutions) / self.max_solutions if self.max_solutions else 0.0
+        by_time = self.elapsed / self.time_limit if self.time_limit else 0.0
+        return min(max(by_solutions, by_time), 1.0)
@@ -0,0 +1,189 @@
+"""
+מניה מקבילית של מצבים קודמים בשיטת Cube-and-Conquer.
+
+מרחב החיפוש מחולק לקוביות (cubes) זרות על ידי קיבוע של כמה תאים בעלי
+השפעה גבוהה במצב הקודם. כל קובייה נפתרת בתהליך נפרד עם Solver משלו, וזרמי
+הפתרונות מתמזגים. מאחר שכל השמה לתאים המקובעים מופיעה בדיוק בקובייה אחת,
+האיחוד שלם וללא כפילויות.
+"""
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+from .encoding import cell_to_var, preimage_vars
+from .preimage import encode_preimage
+from .rules import neighbor_cells
+from .search import Cancellation, iter_models, model_to_grid, new_solver
+from .stats import SolveStats
+
+
+def select_cube_cells(target_state, depth):
+    """
+    בוחר depth תאים לקיבוע, לפי מספר התאים החיים במצב המטרה שהם משפיעים עליהם.
+
+    תא שמשפיע על הרבה תאים חיים במצב המטרה מאולץ מאוד, ולכן קיבוע שלו
+    מפצל את מרחב החיפוש לחלקים מאוזנים יחסית. בשוויון מעדיפים תאים קרובים
+    למרכז הלוח. תאים שלא משפיעים על אף תא ידוע לא נבחרים, כי קיבוע שלהם
+    רק היה משכפל את אותם פתרונות בכמה קוביות.
+    """
+    rows, cols = target_state.shape
+    relevant = set(preimage_vars(target_state))
+    scores = []
+    for r in range(rows):
+        for c in range(cols):
+            if cell_to_var(r, c, cols) not in relevant:
+                continue
+            live = int(target_state[r, c] == 1) + sum(
+                1 for nr, nc in neighbor_cells(r, c, rows, cols) if target_state[nr, nc] == 1)
+            distance = abs(2 * r - rows + 1) + abs(2 * c - cols + 1)
+            scores.append((-live, distance, r, c))
+    scores.sort()
+    return [(r, c) for _, _, r, c in scores[:depth]]
+
+
+def make_cubes(target_state, depth):
+    """
+    מחזיר את רשימת הקוביות: כל קובייה היא רשימת ליטרלים שמקבעת את התאים שנבחרו.
+    """
+    cols = target_state.shape[1]
+    cells = [cell_to_var(r, c, cols) for r, c in select_cube_cells(target_state, depth)]
+    return [[v if bit else -v for v, bit in zip(cells, bits)]
+            for bits in product((0, 1), repeat=len(cells))]
+
+
+def _solve_cube(index, target_state, cube, max_solutions, deadline, events, stop):
+    """
+    פותר קובייה אחת בתהליך נפרד ומדווח על כל פתרון בתור האירועים ברגע שנמצא.
+
+    בסוף נשלח אירוע 'done' עם הסטטיסטיקות. אירוע העצירה המשותף נבדק בין
+    קריאות ל-solve, ו-thread צדדי קוטע את ה-Solver גם באמצע קריאה.
+    """
+    rows, cols = target_state.shape
+    stats = SolveStats()
+    cancel = Cancellation()
+    finished = threading.Event()
+
+    def watch():
+        # העצירה מגיעה מהתהליך הראשי דרך ה-Event המשותף; קוטעים את ה-Solver מיד
+        while not finished.wait(0.2):
+            if stop.is_set():
+                cancel.cancel()
+                return
+
+    threading.Thread(target=watch, daemon=True).start()
+    with stats.phase('encode'):
+        formula = encode_preimage(target_state)
+    stats.record_formula(formula)
+    solver = new_solver('glucose4')
+    solver.append_formula(formula)
+    for lit in cube:
+        solver.add_clause([lit])
+    time_limit = max(deadline - time.time(), 0) if deadline is not None else None
+    try:
+        for model in iter_models(solver, preimage_vars(target_state), max_solutions=max_solutions,
+                                 time_limit=time_limit, stats=stats, cancel=cancel):
+            with stats.phase('decode'):
+                solution = model_to_grid(model, rows, cols)
+            events.put(('solution', index, solution))
+            if stop.is_set():
+                break
+        stats.record_solver(solver)
+    finally:
+        finished.set()
+        solver.delete()
+    events.put(('done', index, stats))
+
+
+def iter_preimages_parallel(target_state, max_solutions=None, time_limit=30, workers=None, cube_depth=None,
+                            stats=None):
+    """
+    מחזיר את המצבים הקודמים של target_state כשהחיפוש מתחלק בין כמה תהליכים.
+
+    כל פתרון מוחזר ברגע שתהליך כלשהו מצא אותו, ולא לפי סדר כלשהו על הלוח.
+    רק workers קוביות רצות בכל רגע; קובייה חדשה מקבלת את מה שנשאר
+    מ-max_solutions ומ-time_limit, ולא את התקציב המלא. כשהמחולל נסגר
+    (הגענו ל-max_solutions, נגמר הזמן או שהצרכן הפסיק לקרוא) נשלח אירוע
+    עצירה לכל התהליכים, והם נקטעים במקום להמשיך לפתור ברקע.
+
+    Args:
+        target_state: מערך דו ממדי NumPy המייצג את מצב המטרה
+        max_solutions: מקסימום פתרונות (None = כל הפתרונות)
+        time_limit: מגבלת זמן בשניות לכל החיפוש
+        workers: מספר התהליכים (ברירת מחדל: מספר הליבות)
+        cube_depth: מספר התאים המקובעים; ברירת המחדל יוצרת בערך פי 4 קוביות
+            ממספר התהליכים, כדי לאזן עומסים בין קוביות קלות לקשות
+        stats: אובייקט SolveStats אופציונלי שאליו מתווספות הסטטיסטיקות של כל
+            קובייה שהסתיימה (הזמנים מסוכמים על פני כל התהליכים)
+
+    Yields:
+        מצבים קודמים כמערכי NumPy
+    """
+    workers = workers or os.cpu_count() or 1
+    if cube_depth is None:
+        cube_depth = max(workers - 1, 1).bit_length() + 2
+    cube_depth = min(cube_depth, target_state.size)
+    deadline = time.time() + time_limit if time_limit is not None else None
+    cubes = list(enumerate(make_cubes(target_state, cube_depth)))
+    cubes.reverse()
+    found = 0
+
+    manager = multiprocessing.Manager()
+    events = manager.Queue()
+    stop = manager.Event()
+    pool = ProcessPoolExecutor(max_workers=workers)
+    running = {}
+
+    def submit():
+        while cubes and len(running) < workers:
+            index, cube = cubes.pop()
+            remaining = max_solutions - found if max_solutions is not None else None
+            running[index] = pool.submit(_solve_cube, index, target_state, cube, remaining, deadline,
+                                         events, stop)
+
+    try:
+        submit()
+        while running:
+            wait_time = 0.5
+            if deadline is not None:
+                wait_time = min(wait_time, deadline - time.time())
+                if wait_time <= 0:
+                    break
+            try:
+                kind, index, payload = events.get(timeout=wait_time)
+            except queue.Empty:
+                # תהליך שנכשל לא ישלח 'done'; מעבירים את החריגה שלו הלאה
+                for future in running.values():
+                    if future.done() and future.exception() is not None:
+                        raise future.exception()
+                continue
+            if kind == 'solution':
+                yield payload
+                found += 1
+                if max_solutions is not None and found >= max_solutions:
+                    return
+            else:
+                running.pop(index).result()
+                if stats is not None:
+                    stats.merge(payload)
+                submit()
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+        manager.shutdown()
+
+
+def find_preimage_parallel(target_state, max_solutions=100, time_limit=30, workers=None, cube_depth=None,
+                           return_stats=False):
+    """
+    כמו find_preimage עם return_first=False, אבל בחלוקה לקוביות בין כמה תהליכים.
+
+    Returns:
+        רשימה של מצבים קודמים, או זוג (הרשימה, stats) אם return_stats=True
+    """
+    stats = SolveStats()
+    solutions = list(iter_preimages_parallel(target_state, max_solutions, time_limit, workers, cube_depth, stats))
+    return (solutions, stats) if return_stats else solutions
@@ -0,0 +1,229 @@
+"""
+חיפוש תבניות מחזוריות: דוממים (still lifes), מתנדים (oscillators) וחלליות (spaceships).
+
+תבנית x היא מחזורית עם מחזור p והזזה (dx, dy) אם אחרי p דורות היא חוזרת
+לעצמה כשהיא מוזזת ב-dx עמודות וב-dy שורות. החיפוש משתמש באותו קידוד מעברים
+כמו find_preimage, אלא שכל הדורות הם משתנים.
+"""
+from pysat.card import CardEnc, EncType
+
+from .encoding import border_clauses, cell_to_var, layer_vars, transition_clauses
+from .search import iter_models, model_to_grid, new_solver
+from .stats import SolveStats
+
+
+class PeriodicSearch:
+    """
+    Solver אינקרמנטלי לחיפוש תבניות מחזוריות על לוח rows x cols.
+
+    הלוח מוקף בתאים מתים שחייבים להישאר מתים בכל הדורות, כך שכל פתרון הוא
+    תבנית מחזורית גם על לוח אינסופי. שכבות המעבר נבנות לפי הצורך, ופסוקיות
+    הסגירה של כל מחזור מוגנות במשתנה בורר, כך שאותו Solver (ופסוקיות הלמידה
+    שלו) משמש את כל המחזורים.
+    """
+
+    def __init__(self, rows, cols, shift=(0, 0), min_population=1, max_population=None,
+                 exact_period=True, solver_name='glucose4'):
+        """
+        Args:
+            rows, cols: גודל הלוח
+            shift: ההזזה (dx, dy) אחרי מחזור שלם; (0, 0) לדוממים ולמתנדים
+            min_population: מספר מינימלי של תאים חיים בדור הראשון
+            max_population: מספר מקסימלי של תאים חיים בדור הראשון (None = ללא הגבלה)
+            exact_period: האם לפסול תבניות שהמחזור שלהן הוא מחלק ממש של המחזור המבוקש
+            solver_name: שם ה-Solver ב-pysat
+        """
+        self.rows = rows
+        self.cols = cols
+        self.dx, self.dy = shift
+        self.exact_period = exact_period
+        self.solver = new_solver(solver_name)
+        self.stats = SolveStats()
+        self.top = 0
+        self.layers = []
+        self.selectors = {}
+
+        with self.stats.phase('encode'):
+            first = self._new_layer()
+            lits = layer_vars(rows, cols, first)
+            if min_population > 0:
+                self._add_cardinality(CardEnc.atleast(lits, bound=min_population, top_id=self.top,
+                                                      encoding=EncType.seqcounter))
+            if max_population is not None:
+                self._add_cardinality(CardEnc.atmost(lits, bound=max_population, top_id=self.top,
+                                                     encoding=EncType.seqcounter))
+
+    def _append(self, clauses):
+        self.solver.append_formula(clauses)
+        self.stats.clauses += len(clauses)
+        self.stats.variables = self.top
+
+    def _new_var(self):
+        self.top += 1
+        return self.top
+
+    def _new_layer(self):
+        """
+        מקצה בלוק משתנים לדור חדש, ומוסיף את פסוקיות המעבר מהדור הקודם.
+        """
+        offset = self.top
+        self.top += self.rows * self.cols
+        if self.layers:
+            self._append(transition_clauses(self.rows, self.cols, self.layers[-1], offset))
+        self._append(border_clauses(self.rows, self.cols, offset))
+        self.layers.append(offset)
+        return offset
+
+    def _add_cardinality(self, formula):
+        self.top = max(self.top, formula.nv)
+        self._append(formula.clauses)
+
+    def _shifted_source(self, r, c, generation, period):
+        """
+        מחזיר את התא בדור הראשון שאמור להגיע ל-(r, c) אחרי generation דורות,
+        או None אם הוא מחוץ ללוח. ההזזה מתחלקת באופן שווה על פני המחזור.
+        """
+        sr = r - self.dy * generation // period
+        sc = c - self.dx * generation // period
+        if 0 <= sr < self.rows and 0 <= sc < self.cols:
+            return sr, sc
+        return None
+
+    def _equal_clauses(self, guard, generation, period):
+        """
+        פסוקיות שמחייבות את הדור generation להיות שווה לדור הראשון המוזז.
+        """
+        clauses = []
+        first, last = self.layers[0], self.layers[generation]
+        dy = self.dy * generation // period
+        dx = self.dx * generation // period
+        for r in range(self.rows):
+            for c in range(self.cols):
+                var = cell_to_var(r, c, self.cols, last)
+                source = self._shifted_source(r, c, generation, period)
+                if source is None:
+                    clauses.append([-guard, -var])
+                else:
+                    src = cell_to_var(*source, self.cols, first)
+                    clauses.append([-guard, -var, src])
+                    clauses.append([-guard, var, -src])
+                # תא בדור הראשון שיוצא מהלוח אחרי ההזזה חייב להיות מת
+                if not (0 <= r + dy < self.rows and 0 <= c + dx < self.cols):
+                    clauses.append([-guard, -cell_to_var(r, c, self.cols, first)])
+        return clauses
+
+    def _differ_clauses(self, guard, generation, period):
+        """
+        פסוקיות שמחייבות את הדור generation להיות שונה מהדור הראשון המוזז.
+        """
+        clauses = []
+        first, last = self.layers[0], self.layers[generation]
+        witnesses = []
+        for r in range(self.rows):
+            for c in range(self.cols):
+                var = cell_to_var(r, c, self.cols, last)
+                source = self._shifted_source(r, c, generation, period)
+                witness = self._new_var()
+                witnesses.append(witness)
+                if source is None:
+                    clauses.append([-witness, var])
+                else:
+                    src = cell_to_var(*source, self.cols, first)
+                    clauses.append([-witness, var, src])
+                    clauses.append([-witness, -var, -src])
+        clauses.append([-guard] + witnesses)
+        return clauses
+
+    def selector(self, period):
+        """
+        מחזיר את המשתנה הבורר של המחזור period, ובונה את השכבות החסרות אם צריך.
+        """
+        if period < 1:
+            raise ValueError("period must be positive")
+        if period in self.selectors:
+            return self.selectors[period]
+
+        with self.stats.phase('encode'):
+            while len(self.layers) <= period:
+                self._new_layer()
+
+            guard = self._new_var()
+            self._append(self._equal_clauses(guard, period, period))
+            if self.exact_period:
+                for d in range(1, period):
+                    # מחזור קטן יותר אפשרי רק אם גם ההזזה מתחלקת בהתאם
+                    if period % d == 0 and (self.dx * d) % period == 0 and (self.dy * d) % period == 0:
+                        self._append(self._differ_clauses(guard, d, period))
+        self.selectors[period] = guard
+        return guard
+
+    def iter_solutions(self, period, max_solutions=None, time_limit=None):
+        """
+        מחזיר את הדור הראשון של כל תבנית עם המחזור המבוקש, בזה אחר זה.
+
+        הפתרונות נחסמים רק עבור המחזור הזה, כך שאפשר להמשיך לשאול על מחזורים אחרים.
+        """
+        guard = self.selector(period)
+        models = iter_models(
+            self.solver,
+            layer_vars(self.rows, self.cols, self.layers[0]),
+            max_solutions=max_solutions,
+            time_limit=time_limit,
+            assumptions=[guard],
+            guard=guard,
+            stats=self.stats
+        )
+        for model in models:
+            with self.stats.phase('decode'):
+                pattern = model_to_grid(model, self.rows, self.cols, self.layers[0])
+            yield pattern
+
+    def search(self, max_period, time_limit=None):
+        """
+        מנסה את המחזורים 1 עד max_period לפי הסדר על אותו Solver.
+
+        Returns:
+            זוג (period, pattern) עבור המחזור הראשון שנמצאה לו תבנית, או None
+        """
+        for period in range(1, max_period + 1):
+            for pattern in self.iter_solutions(period, max_solutions=1, time_limit=time_limit):
+                return period, pattern
+        return None
+
+    def delete(self):
+        self.stats.record_solver(self.solver)
+        self.solver.delete()
+
+
+def find_periodic(rows, cols, period, shift=(0, 0), min_population=1, max_population=None,
+                  return_first=True, max_solutions=100, time_limit=30, return_stats=False):
+    """
+    מחפש תבנית שחוזרת לעצמה אחרי period דורות, מוזזת ב-shift.
+
+    Args:
+        rows, cols: גודל הלוח
+        period: המחזור (1 לדומם)
+        shift: ההזזה (dx, dy) אחרי מחזור שלם
+        min_population, max_population: גבולות לאוכלוסייה של הדור הראשון
+        return_first: האם להחזיר רק את הפתרון הראשון (True) או את כל הפתרונות (False)
+        max_solutions: מקסימום פתרונות לחפש אם return_first=False
+        time_limit: מגבלת זמן בשניות
+        return_stats: האם להחזיר גם אובייקט SolveStats
+
+    Returns:
+        אם return_first=True: התבנית כמערך NumPy, או None אם לא נמצאה
+        אם return_first=False: רשימה של תבניות
+        אם return_stats=True: זוג (התוצאה, stats)
+    """
+    search = PeriodicSearch(rows, cols, shift, min_population, max_population)
+    try:
+        solutions = list(search.iter_solutions(
+            period,
+            max_solutions=1 if return_first else max_solutions,
+            time_limit=time_limit
+        ))
+    finally:
+        search.delete()
+
+    result = (solutions[0] if solutions else None) if return_first else solutions
+    return (result, search.stats) if return_stats else result
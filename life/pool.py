@@ -0,0 +1,328 @@
+"""
+מאגר תהליכים משותף לכל המשתמשים, עם תור חסום, הוגנות בין משתמשים ואיחוד שאילתות.
+
+המאגר נוצר פעם אחת לכל תהליך שרת (למשל דרך st.cache_resource). שאילתות
+נכנסות לתור של המשתמש ששלח אותן, ובכל פעם שמתפנה תהליך נבחרת השאילתה
+הבאה בסבב בין המשתמשים, כך שמשתמש ששלח הרבה שאילתות לא מעכב את האחרים.
+שאילתה זהה לשאילתה שכבר ממתינה או רצה לא נפתרת שוב: השולח מקבל את אותו
+אובייקט עבודה.
+"""
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .jobs import PreimageJob, query_solutions
+from .search import Cancellation
+from .stats import SolveStats
+
+# מרווח הזמן (בשניות) בין דיווחי התקדמות מתהליך העבודה
+PROGRESS_INTERVAL = 0.25
+
+
+class PoolBusy(RuntimeError):
+    """
+    נזרקת כשהתור מלא או כשלמשתמש כבר יש יותר מדי שאילתות ממתינות.
+    """
+
+
+def _run_query(job_id, target_state, max_solutions, time_limit, diverse, events, cancelled):
+    """
+    מריץ שאילתה אחת בתהליך עבודה ומדווח על כל פתרון ועל ההתקדמות בתור האירועים.
+    """
+    cancel = Cancellation()
+    finished = threading.Event()
+
+    def watch():
+        # הביטול מגיע מהתהליך הראשי דרך המילון המשותף; קוטעים את ה-Solver מיד
+        while not finished.wait(0.2):
+            if job_id in cancelled:
+                cancel.cancel()
+                return
+
+    threading.Thread(target=watch, daemon=True).start()
+    stats = SolveStats()
+    last_report = [0.0]
+
+    def on_progress(solver):
+        now = time.time()
+        if now - last_report[0] >= PROGRESS_INTERVAL:
+            last_report[0] = now
+            events.put(('progress', job_id, solver.accum_stats().get('conflicts', 0)))
+
+    try:
+        for solution in query_solutions(target_state, max_solutions, time_limit, diverse,
+                                        stats=stats, cancel=cancel, on_progress=on_progress):
+            events.put(('solution', job_id, solution))
+        events.put(('done', job_id, (stats, cancel.is_set())))
+    finally:
+        finished.set()
+
+
+class PoolJob(PreimageJob):
+    """
+    עבודה שרצה במאגר התהליכים. הממשק זהה ל-PreimageJob, כך שהדף לא צריך
+    לדעת איפה השאילתה רצה. מצב 'queued' אומר שהעבודה ממתינה לתהליך פנוי.
+    """
+
+    def __init__(self, pool, job_id, key, user, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = pool
+        self.job_id = job_id
+        self.key = key
+        self.user = user
+        self.subscribers = 1
+        self.status = 'queued'
+        self.submit_time = time.time()
+        self._finished = threading.Event()
+        self._callbacks = []
+
+    def start(self):
+        return self  # המאגר מתחיל את העבודה כשמתפנה תהליך
+
+    def cancel(self):
+        """
+        מבטל את העבודה עבור שולח אחד; היא נעצרת רק כשכל השולחים ביטלו.
+        """
+        self.pool.cancel(self)
+
+    def join(self, timeout=None):
+        self._finished.wait(timeout)
+
+    def add_done_callback(self, fn):
+        """
+        קורא ל-fn(job) כשהעבודה מסתיימת (מיד, אם היא כבר הסתיימה).
+        """
+        with self.pool._lock:
+            if self.running:
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def _finish(self, status):
+        """
+        מסמן שהעבודה הסתיימה. נקרא כשהנעילה של המאגר מוחזקת, ולכן לא קורא
+        ל-callbacks; מי שקרא לו קורא ל-_notify אחרי שחרור הנעילה.
+        """
+        self.status = status
+        self.end_time = time.time()
+        self._finished.set()
+
+    def _notify(self):
+        """
+        קורא ל-callbacks של עבודה שהסתיימה, פעם אחת בלבד.
+        """
+        with self.pool._lock:
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            fn(self)
+
+    @property
+    def position(self):
+        """
+        מספר העבודות שממתינות לפני עבודה זו בתור של אותו משתמש (None אם היא כבר רצה).
+        """
+        return self.pool.position(self)
+
+
+class SolverPool:
+    """
+    מאגר תהליכים לפתרון שאילתות מצב קודם.
+
+    Args:
+        workers: מספר התהליכים (ברירת מחדל: מספר הליבות)
+        max_queue: מספר העבודות המקסימלי שממתינות בתור בכל רגע
+        max_per_user: מספר העבודות המקסימלי (ממתינות ורצות) לכל משתמש
+    """
+
+    def __init__(self, workers=None, max_queue=64, max_per_user=2):
+        self.workers = workers or multiprocessing.cpu_count()
+        self.max_queue = max_queue
+        self.max_per_user = max_per_user
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._manager = multiprocessing.Manager()
+        self._events = self._manager.Queue()
+        self._cancelled = self._manager.dict()
+        # RLock: add_done_callback של future שכבר הסתיים קורא ל-_on_done מיד,
+        # באותו thread, בזמן ש-_dispatch עדיין מחזיק את הנעילה
+        self._lock = threading.RLock()
+        self._ids = itertools.count()
+        self._jobs = {}        # job_id -> PoolJob, לכל עבודה שממתינה או רצה
+        self._by_key = {}      # מפתח השאילתה -> PoolJob, לאיחוד שאילתות זהות
+        self._queues = {}      # משתמש -> deque של עבודות ממתינות
+        self._turns = deque()  # סדר הסבב בין המשתמשים שיש להם עבודות ממתינות
+        self._running = 0
+        self._closed = False
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+
+    @staticmethod
+    def query_key(target_state, max_solutions, time_limit, diverse):
+        return (target_state.shape, target_state.tobytes(), max_solutions, time_limit, bool(diverse))
+
+    def submit(self, target_state, max_solutions=10, time_limit=10, diverse=False, user=None):
+        """
+        מכניס שאילתה לתור ומחזיר PoolJob.
+
+        אם שאילתה זהה כבר ממתינה או רצה, מוחזרת אותה עבודה.
+
+        Raises:
+            PoolBusy: אם התור מלא או שלמשתמש יש יותר מדי עבודות
+        """
+        key = self.query_key(target_state, max_solutions, time_limit, diverse)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("pool is closed")
+            job = self._by_key.get(key)
+            if job is not None:
+                job.subscribers += 1
+                return job
+
+            queued = sum(len(q) for q in self._queues.values())
+            if queued >= self.max_queue:
+                raise PoolBusy("the solver queue is full")
+            if sum(1 for j in self._jobs.values() if j.user == user) >= self.max_per_user:
+                raise PoolBusy("too many queries in progress for this user")
+
+            job = PoolJob(self, next(self._ids), key, user, target_state, max_solutions, time_limit, diverse)
+            self._jobs[job.job_id] = job
+            self._by_key[key] = job
+            if user not in self._queues:
+                self._queues[user] = deque()
+                self._turns.append(user)
+            self._queues[user].append(job)
+            self._dispatch()
+        return job
+
+    def cancel(self, job):
+        with self._lock:
+            if not job.running:
+                return
+            job.subscribers -= 1
+            if job.subscribers > 0:
+                return
+            self._by_key.pop(job.key, None)
+            if job.status != 'queued':
+                self._cancelled[job.job_id] = True
+                return
+            self._queues[job.user].remove(job)
+            self._jobs.pop(job.job_id, None)
+            job._finish('cancelled')
+        job._notify()
+
+    def position(self, job):
+        with self._lock:
+            if job.status != 'queued':
+                return None
+            return list(self._queues[job.user]).index(job)
+
+    @property
+    def queue_depth(self):
+        with self._lock:
+            return sum(len(q) for q in self._queues.values())
+
+    @property
+    def running_count(self):
+        with self._lock:
+            return self._running
+
+    def _next_job(self):
+        """
+        בוחר את העבודה הבאה בסבב בין המשתמשים. נקרא כשהנעילה מוחזקת.
+        """
+        while self._turns:
+            user = self._turns.popleft()
+            user_queue = self._queues[user]
+            if not user_queue:
+                del self._queues[user]
+                continue
+            job = user_queue.popleft()
+            if user_queue:
+                self._turns.append(user)
+            else:
+                del self._queues[user]
+            return job
+        return None
+
+    def _dispatch(self):
+        """
+        מתחיל עבודות ממתינות כל עוד יש תהליכים פנויים. נקרא כשהנעילה מוחזקת.
+        """
+        while self._running < self.workers:
+            job = self._next_job()
+            if job is None:
+                return
+            job.status = 'running'
+            job.start_time = time.time()
+            self._running += 1
+            future = self._executor.submit(
+                _run_query, job.job_id, job.target_state, job.max_solutions, job.time_limit,
+                job.diverse, self._events, self._cancelled
+            )
+            future.add_done_callback(lambda f, job=job: self._on_done(job, f))
+
+    def _on_done(self, job, future):
+        with self._lock:
+            self._running -= 1
+            error = future.exception() if not future.cancelled() else None
+            if error is not None and job.running:
+                job.error = error
+                self._forget(job)
+                job._finish('error')
+            if not self._closed:
+                self._dispatch()
+        if not job.running:
+            job._notify()
+
+    def _forget(self, job):
+        """
+        מסיר עבודה שהסתיימה מהטבלאות. נקרא כשהנעילה מוחזקת.
+        """
+        self._jobs.pop(job.job_id, None)
+        if self._by_key.get(job.key) is job:
+            del self._by_key[job.key]
+        self._cancelled.pop(job.job_id, None)
+
+    def _collect(self):
+        """
+        thread שקורא את אירועי תהליכי העבודה ומעדכן את העבודות.
+        """
+        while True:
+            try:
+                kind, job_id, payload = self._events.get(timeout=0.5)
+            except queue.Empty:
+                if self._closed:
+                    return
+                continue
+            except (EOFError, OSError):
+                return  # ה-Manager נסגר
+
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    continue
+                if kind == 'solution':
+                    job.solutions.append(payload)
+                elif kind == 'progress':
+                    job.conflicts = payload
+                elif kind == 'done':
+                    stats, was_cancelled = payload
+                    job.stats = stats
+                    job.conflicts = stats.solver_stats.get('conflicts', job.conflicts)
+                    self._forget(job)
+                    job._finish('cancelled' if was_cancelled else 'done')
+            if kind == 'done':
+                job._notify()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            for job in list(self._jobs.values()):
+                if job.status == 'running':
+                    self._cancelled[job.job_id] = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._collector.join(timeout=2)
+        self._manager.shutdown()
@@ -0,0 +1,131 @@
+"""
+מציאת מצב קודם (preimage) במשחק החיים בעזרת SAT Solver.
+"""
+from pysat.formula import CNF
+
+from .encoding import cell_to_var, cell_clauses, neighbor_vars, preimage_vars
+from .preprocess import forced_literals, propagate
+from .rules import DONT_CARE
+from .search import iter_models, model_to_grid, new_solver
+from .stats import SolveStats
+
+
+def encode_preimage(target_state):
+    """
+    בונה נוסחת CNF שהמודלים שלה הם בדיוק המצבים הקודמים של target_state.
+
+    המשתנה של התא (r, c) במצב הקודם הוא cell_to_var(r, c, cols). תאים שערכם
+    DONT_CARE לא מוסיפים פסוקיות בכלל.
+    """
+    rows, cols = target_state.shape
+    formula = CNF()
+
+    # יוצר אילוצים עבור כל תא במצב המטרה
+    for r in range(rows):
+        for c in range(cols):
+            if target_state[r, c] == DONT_CARE:
+                continue
+            center_var = cell_to_var(r, c, cols)
+            neighbors = neighbor_vars(r, c, rows, cols)
+            formula.extend(cell_clauses(center_var, neighbors, target_state[r, c]))
+
+    return formula
+
+
+def iter_preimages(target_state, max_solutions=None, time_limit=None, stats=None, cancel=None,
+                   conflict_slice=None, on_progress=None, solver_name='glucose4', preprocess=True):
+    """
+    מחזיר את המצבים הקודמים של target_state בזה אחר זה.
+
+    Args:
+        target_state: מערך דו ממדי NumPy המייצג את מצב המטרה (1 חי, 0 מת, DONT_CARE לא משנה)
+        max_solutions: מקסימום פתרונות (None = כל הפתרונות)
+        time_limit: מגבלת זמן בשניות
+        stats: אובייקט SolveStats אופציונלי למילוי
+        cancel, conflict_slice, on_progress: ביטול ודיווח התקדמות, כמו ב-iter_models
+        solver_name: שם ה-Solver ב-pysat
+        preprocess: האם לקבע תאים מראש בהיסק מקומי (ראו preprocess.propagate); התאים
+            שקובעו נוספים כפסוקיות יחידה ולא נכללים בפסוקיות החסימה
+
+    Yields:
+        מצבים קודמים כמערכי NumPy; תאים שלא משפיעים על אף תא ידוע הם תמיד 0
+    """
+    rows, cols = target_state.shape
+    if stats is None:
+        stats = SolveStats()
+    with stats.phase('encode'):
+        formula = encode_preimage(target_state)
+    stats.record_formula(formula)
+
+    variables = preimage_vars(target_state)
+    units = []
+    if preprocess:
+        with stats.phase('preprocess'):
+            values = propagate(target_state, counters=stats.preprocess)
+        if values is None:
+            stats.preprocess['eden'] = 1  # גן עדן, בלי להריץ את ה-Solver
+            return
+        units = forced_literals(values)
+        forced = set(abs(lit) for lit in units)
+        variables = [v for v in variables if v not in forced]
+
+    # פותר את הנוסחה
+    solver = new_solver(solver_name)
+    solver.append_formula(formula)
+    for lit in units:
+        solver.add_clause([lit])
+    stats.clauses += len(units)
+
+    try:
+        models = iter_models(
+            solver,
+            variables,
+            max_solutions=max_solutions,
+            time_limit=time_limit,
+            stats=stats,
+            cancel=cancel,
+            conflict_slice=conflict_slice,
+            on_progress=on_progress
+        )
+        for model in models:
+            with stats.phase('decode'):
+                preimage = model_to_grid(model, rows, cols)
+            yield preimage
+    finally:
+        stats.record_solver(solver)
+        solver.delete()
+
+
+def find_preimage(target_state, return_first=True, max_solutions=100, time_limit=30, return_stats=False,
+                  preprocess=True):
+    """
+    מחפש מצב קודם שיוביל למצב המטרה אחרי צעד אחד במשחק החיים.
+
+    Args:
+        target_state: מערך דו ממדי NumPy המייצג את מצב המטרה (1 לתאים חיים, 0 לתאים מתים,
+            DONT_CARE לתאים שלא משנה מה יהיה בהם)
+        return_first: האם להחזיר רק את הפתרון הראשון (True) או את כל הפתרונות (False)
+        max_solutions: מקסימום פתרונות לחפש אם return_first=False
+        time_limit: מגבלת זמן בשניות
+        return_stats: האם להחזיר גם אובייקט SolveStats עם זמני השלבים ומוני ה-Solver
+        preprocess: האם לקבע תאים מראש בהיסק מקומי לפני ה-Solver
+
+    Returns:
+        אם return_first=True: preimage_state מצב קודם כמערך NumPy, או None אם לא נמצא פתרון
+        אם return_first=False: רשימה של preimage_states
+        אם return_stats=True: זוג (התוצאה, stats)
+    """
+    stats = SolveStats()
+    solutions = list(iter_preimages(
+        target_state,
+        max_solutions=1 if return_first else max_solutions,
+        time_limit=time_limit,
+        stats=stats,
+        preprocess=preprocess
+    ))
+
+    if return_first:
+        result = solutions[0] if solutions else None  # None = אין פתרון
+    else:
+        result = solutions
+    return (result, stats) if return_stats else result
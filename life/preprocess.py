@@ -0,0 +1,177 @@
+"""
+עיבוד מקדים לפני ה-SAT Solver: קיבוע תאים במצב הקודם בעזרת היסק מקומי.
+
+כל תא ידוע במצב המטרה מגביל את אריח ה-3x3 שסביבו במצב הקודם, וכל ריבוע
+2x2 ידוע במצב המטרה מגביל את אריח ה-4x4 שסביבו. לכל אריח שומרים את רשימת
+ההשמות שעדיין אפשריות (מתוך טבלאות שמחושבות פעם אחת), ומסננים אותה לפי
+התאים שכבר קובעו. תא שיש לו ערך אחד בלבד בכל ההשמות האפשריות של אריח
+כלשהו מקובע, והקיבוע מתפשט לאריחים השכנים עד שאין שינוי. אריח שלא נשארה
+לו אף השמה מוכיח שהמצב הוא גן עדן, בלי להריץ את ה-Solver.
+
+תאים מחוץ ללוח נחשבים מתים במצב הקודם, בדיוק כמו ב-encode_preimage.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from .encoding import cell_to_var
+from .rules import DONT_CARE, next_cell_value
+
+# ערך של תא במצב הקודם שעדיין לא קובע
+UNKNOWN = -1
+
+
+@lru_cache(maxsize=None)
+def tile_codes(size):
+    """
+    מחשב, לכל השמה של אריח size x size, את הקוד של הדור הבא בריבוע הפנימי שלו.
+
+    ביט i בהשמה הוא התא (i // size, i % size) באריח; ביט j בקוד הוא התא
+    (j // (size - 2), j % (size - 2)) בריבוע הפנימי.
+
+    Returns:
+        מערך NumPy באורך 2 ** (size * size)
+    """
+    patterns = np.arange(2 ** (size * size), dtype=np.uint32)
+    bits = ((patterns[:, None] >> np.arange(size * size, dtype=np.uint32)) & 1).reshape(-1, size, size)
+    alive_rule = np.array([[next_cell_value(alive, n) for n in range(9)] for alive in (False, True)])
+
+    inner = size - 2
+    codes = np.zeros(len(patterns), dtype=np.uint32)
+    for ir in range(inner):
+        for ic in range(inner):
+            block = bits[:, ir:ir + 3, ic:ic + 3]
+            center = block[:, 1, 1]
+            live_neighbors = block.sum(axis=(1, 2)) - center
+            codes |= alive_rule[center, live_neighbors].astype(np.uint32) << (ir * inner + ic)
+    return codes
+
+
+@lru_cache(maxsize=None)
+def tile_patterns(size, code):
+    """
+    מחזיר את כל ההשמות של אריח size x size שהדור הבא שלהן בריבוע הפנימי הוא code.
+    """
+    patterns = np.flatnonzero(tile_codes(size) == code).astype(np.uint32)
+    patterns.flags.writeable = False
+    return patterns
+
+
+class _Tile:
+    """
+    אריח אחד: התאים שלו במצב הקודם וההשמות שעדיין אפשריות להם.
+    """
+    __slots__ = ('cells', 'patterns')
+
+    def __init__(self, cells, patterns):
+        self.cells = cells  # רשימת (bit, r, c) לתאים שבתוך הלוח
+        self.patterns = patterns
+
+
+def _tiles(target_state, size):
+    """
+    בונה את האריחים בגודל size שהריבוע הפנימי שלהם ידוע כולו במצב המטרה.
+
+    תאים מחוץ ללוח מסוננים כבר כאן: ההשמות שבהן הם חיים נפסלות.
+    """
+    rows, cols = target_state.shape
+    inner = size - 2
+    tiles = []
+    for top in range(rows - inner + 1):
+        for left in range(cols - inner + 1):
+            window = target_state[top:top + inner, left:left + inner]
+            if (window == DONT_CARE).any():
+                continue
+            if size > 3 and not window.any():
+                continue  # אריח גדול על ריבוע מת כמעט אף פעם לא מקבע תאים, והוא היקר ביותר
+            code = sum(int(v) << j for j, v in enumerate(window.flat))
+            patterns = tile_patterns(size, code)
+
+            cells, outside = [], 0
+            for i in range(size * size):
+                r, c = top - 1 + i // size, left - 1 + i % size
+                if 0 <= r < rows and 0 <= c < cols:
+                    cells.append((i, r, c))
+                else:
+                    outside |= 1 << i
+            if outside:
+                patterns = patterns[(patterns & outside) == 0]
+            tiles.append(_Tile(cells, patterns))
+    return tiles
+
+
+def propagate(target_state, sizes=(3, 4), counters=None):
+    """
+    מקבע את התאים במצב הקודם שיש להם ערך אחד בלבד בכל האריחים.
+
+    Args:
+        target_state: מצב המטרה (1 חי, 0 מת, DONT_CARE לא משנה)
+        sizes: גדלי האריחים לשימוש (3 ו/או 4)
+        counters: מילון אופציונלי שאליו נוספים מוני העבודה ('tiles', 'revisions', 'forced')
+
+    Returns:
+        מערך int8 בגודל הלוח עם 0/1 לתאים שקובעו ו-UNKNOWN לשאר,
+        או None אם התגלה שהמצב הוא גן עדן
+    """
+    rows, cols = target_state.shape
+    values = np.full((rows, cols), UNKNOWN, dtype=np.int8)
+    tiles = [tile for size in sizes for tile in _tiles(target_state, size)]
+    watchers = {}
+    for index, tile in enumerate(tiles):
+        for _, r, c in tile.cells:
+            watchers.setdefault((r, c), []).append(index)
+
+    pending = list(range(len(tiles)))
+    queued = set(pending)
+    if counters is not None:
+        counters['tiles'] = counters.get('tiles', 0) + len(tiles)
+        counters.setdefault('revisions', 0)
+        counters.setdefault('forced', 0)
+
+    while pending:
+        index = pending.pop()
+        queued.discard(index)
+        tile = tiles[index]
+        if counters is not None:
+            counters['revisions'] += 1
+
+        ones = zeros = 0
+        for bit, r, c in tile.cells:
+            if values[r, c] == 1:
+                ones |= 1 << bit
+            elif values[r, c] == 0:
+                zeros |= 1 << bit
+        patterns = tile.patterns
+        if ones or zeros:
+            patterns = patterns[((patterns & ones) == ones) & ((patterns & zeros) == 0)]
+            tile.patterns = patterns
+        if len(patterns) == 0:
+            return None  # אין אף השמה לאריח: גן עדן
+
+        can_be_alive = int(np.bitwise_or.reduce(patterns))
+        can_be_dead = int(np.bitwise_or.reduce(~patterns))
+        for bit, r, c in tile.cells:
+            if values[r, c] != UNKNOWN:
+                continue
+            if not (can_be_alive >> bit) & 1:
+                values[r, c] = 0
+            elif not (can_be_dead >> bit) & 1:
+                values[r, c] = 1
+            else:
+                continue
+            if counters is not None:
+                counters['forced'] += 1
+            for other in watchers[(r, c)]:
+                if other not in queued:
+                    queued.add(other)
+                    pending.append(other)
+    return values
+
+
+def forced_literals(values):
+    """
+    ממיר את תוצאת propagate לליטרלים (פסוקיות יחידה) של משתני המצב הקודם.
+    """
+    cols = values.shape[1]
+    return [cell_to_var(int(r), int(c), cols) * (1 if values[r, c] else -1)
+            for r, c in zip(*np.nonzero(values != UNKNOWN))]
@@ -0,0 +1,62 @@
+"""
+חוקי משחק החיים וסימולציה של לוח צפוף צעד אחד קדימה.
+"""
+import numpy as np
+from itertools import product
+
+# ערך של תא במצב מטרה חלקי שלא משנה אם הוא חי או מת
+DONT_CARE = -1
+
+# שמונת הכיוונים לשכנים של תא
+NEIGHBOR_OFFSETS = [(dr, dc) for dr, dc in product([-1, 0, 1], [-1, 0, 1]) if (dr, dc) != (0, 0)]
+
+
+def next_cell_value(alive, live_neighbors):
+    """
+    מחזיר את ערך התא בדור הבא לפי מצבו הנוכחי ומספר השכנים החיים שלו.
+    """
+    if alive:
+        return 1 if 2 <= live_neighbors <= 3 else 0  # הישרדות
+    return 1 if live_neighbors == 3 else 0  # לידה
+
+
+def neighbor_cells(r, c, rows, cols):
+    """
+    מחזיר את רשימת השכנים של התא (r, c) שנמצאים בתוך הלוח.
+    """
+    cells = []
+    for dr, dc in NEIGHBOR_OFFSETS:
+        nr, nc = r + dr, c + dc
+        if 0 <= nr < rows and 0 <= nc < cols:
+            cells.append((nr, nc))
+    return cells
+
+
+def next_state(grid):
+    """
+    מחשב את המצב הבא לפי חוקי משחק החיים
+
+    Args:
+        grid: מערך דו ממדי NumPy המייצג את המצב הנוכחי
+
+    Returns:
+        new_grid: מערך דו ממדי NumPy המייצג את המצב הבא
+    """
+    rows, cols = grid.shape
+    new_grid = np.zeros_like(grid)
+
+    for r in range(rows):
+        for c in range(cols):
+            # סופר שכנים חיים
+            live_neighbors = sum(1 for nr, nc in neighbor_cells(r, c, rows, cols) if grid[nr, nc] == 1)
+            new_grid[r, c] = next_cell_value(grid[r, c] == 1, live_neighbors)
+
+    return new_grid
+
+
+def matches_target(grid, target_state):
+    """
+    בודק אם המצב הבא של grid תואם את מצב המטרה בכל התאים שאינם DONT_CARE.
+    """
+    known = target_state != DONT_CARE
+    return bool(np.array_equal(next_state(grid)[known], target_state[known]))
@@ -0,0 +1,132 @@
+"""
+דגימה של מצבים קודמים מגוונים, רחוקים זה מזה במרחק Hamming.
+
+מניה עם פסוקיות חסימה מחזירה פתרונות עוקבים שנבדלים לרוב בתא או שניים.
+כאן כל פתרון חדש נבחר כך שהמרחק המינימלי שלו מהפתרונות הקודמים יהיה
+גדול ככל האפשר (בחירה חמדנית של הנקודה הרחוקה ביותר).
+"""
+import random
+import time
+
+from pysat.card import ITotalizer
+
+from .encoding import preimage_vars
+from .preimage import encode_preimage
+from .search import limited_solve, model_to_grid, new_solver
+from .stats import SolveStats
+
+
+# גודל פרוסת הקונפליקטים בין דיווחי התקדמות
+PROGRESS_SLICE = 2000
+
+
+def _hamming(a, b):
+    return int((a != b).sum())
+
+
+def iter_samples(target_state, k=5, time_limit=30, seed=None, conflict_budget=1000,
+                 solver_name='glucose4', stats=None, cancel=None, on_progress=None):
+    """
+    מחזיר עד k מצבים קודמים שמפוזרים רחוק זה מזה, בזה אחר זה.
+
+    לכל פתרון קודם נבנה Totalizer אינקרמנטלי שסופר את התאים שבהם פתרון חדש
+    זהה לו. הדרישה "מרחק לפחות d מכל הפתרונות הקודמים" מועברת כהנחות בלבד,
+    ולכן חיפוש בינארי על d לא מוסיף פסוקיות ודורש O(log(rows * cols))
+    קריאות ל-Solver לכל פתרון, במקום למנות את כל הפתרונות. כל בדיקה בחיפוש
+    מוגבלת בתקציב קונפליקטים, כי הוכחה שמרחק גדול אינו אפשרי יקרה בהרבה
+    ממציאת פתרון טוב מספיק; תקציב שנגמר נחשב כתשובה שלילית. השלבים (phases)
+    של ה-Solver מוגרלים לפני כל קריאה, כדי שגם הפתרון הראשון יהיה אקראי.
+
+    Args:
+        target_state: מערך דו ממדי NumPy המייצג את מצב המטרה
+        k: מספר הפתרונות המבוקש
+        time_limit: מגבלת זמן בשניות
+        seed: זרע למחולל המספרים האקראיים
+        conflict_budget: תקציב הקונפליקטים לכל בדיקה בחיפוש הבינארי
+        solver_name: שם ה-Solver ב-pysat
+        stats: אובייקט SolveStats אופציונלי למילוי
+        cancel, on_progress: ביטול ודיווח התקדמות, כמו ב-limited_solve
+
+    Yields:
+        מצבים קודמים (ייתכן שפחות מ-k אם אין מספיק פתרונות)
+    """
+    rows, cols = target_state.shape
+    cells = preimage_vars(target_state)
+    if stats is None:
+        stats = SolveStats()
+    with stats.phase('encode'):
+        formula = encode_preimage(target_state)
+    stats.record_formula(formula)
+    rng = random.Random(seed)
+    start_time = time.time()
+    deadline = start_time + time_limit
+
+    solver = new_solver(solver_name)
+    solver.append_formula(formula)
+    top = max(formula.nv, len(cells))
+    counters = []  # לכל פתרון קודם: Totalizer על התאים הזהים לו
+    samples = []
+
+    def solve(distance, budget=None):
+        solver.set_phases([v if rng.random() < 0.5 else -v for v in cells])
+        # מרחק לפחות distance = לכל היותר n - distance תאים זהים לכל פתרון קודם
+        assumptions = [-counter.rhs[len(cells) - distance] for counter in counters] if distance > 0 else []
+        solve_start = time.perf_counter()
+        found = limited_solve(solver, assumptions, budget=budget, deadline=deadline, cancel=cancel,
+                              conflict_slice=PROGRESS_SLICE if on_progress else None,
+                              on_progress=on_progress)
+        stats.solve_times.append(time.perf_counter() - solve_start)
+        if found:
+            with stats.phase('decode'):
+                return model_to_grid(solver.get_model(), rows, cols)
+        return None  # אין פתרון, או שתקציב הקונפליקטים נגמר
+
+    try:
+        while len(samples) < k and time.time() <= deadline:
+            best = solve(1 if samples else 0)
+            if best is None:
+                break  # אין עוד פתרונות (או שהחיפוש בוטל)
+
+            if samples:
+                # חיפוש בינארי על המרחק המינימלי הגדול ביותר שאפשר להשיג
+                low = min(_hamming(best, s) for s in samples)
+                high = len(cells)
+                while low < high and time.time() <= deadline and not (cancel and cancel.is_set()):
+                    mid = (low + high + 1) // 2
+                    candidate = solve(mid, conflict_budget)
+                    if candidate is None:
+                        high = mid - 1
+                    else:
+                        best = candidate
+                        low = min(_hamming(candidate, s) for s in samples)
+
+            samples.append(best)
+            yield best
+            if not cells:
+                break  # כל התאים הם DONT_CARE: יש בדיוק פתרון אחד (הלוח הריק)
+            agree = [v if best.flat[v - 1] else -v for v in cells]
+            counter = ITotalizer(lits=agree, ubound=len(cells), top_id=top)
+            top = counter.top_id
+            solver.append_formula(counter.cnf.clauses)
+            stats.clauses += len(counter.cnf.clauses)
+            stats.variables = top
+            counters.append(counter)
+    finally:
+        stats.record_solver(solver)
+        solver.delete()
+        for counter in counters:
+            counter.delete()
+
+
+def sample_preimages(target_state, k=5, time_limit=30, seed=None, conflict_budget=1000,
+                     solver_name='glucose4', return_stats=False):
+    """
+    מחזיר עד k מצבים קודמים שמפוזרים רחוק זה מזה (ראו iter_samples).
+
+    Returns:
+        רשימה של מצבים קודמים (ייתכן שקצרה מ-k אם אין מספיק פתרונות),
+        או זוג (הרשימה, stats) אם return_stats=True
+    """
+    stats = SolveStats()
+    samples = list(iter_samples(target_state, k, time_limit, seed, conflict_budget, solver_name, stats))
+    return (samples, stats) if return_stats else samples
@@ -0,0 +1,185 @@
+"""
+מנגנון משותף למניית פתרונות: פתרון חוזר של אותו SAT Solver עם פסוקיות חסימה.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+
+def new_solver(name='glucose4'):
+    """
+    יוצר SAT Solver של pysat.
+
+    pysat.solvers טוען את כל ה-Solvers המקומפלים, ולכן הוא מיובא רק כאן, בפעם
+    הראשונה שבאמת צריך Solver, ולא בזמן הייבוא של המודולים.
+    """
+    from pysat.solvers import Solver
+    return Solver(name=name)
+
+
+def model_to_grid(model, rows, cols, offset=0):
+    """
+    ממיר מודל של ה-SAT Solver למערך NumPy של דור אחד.
+    """
+    positive = set(lit for lit in model if lit > 0)
+    grid = np.zeros((rows, cols), dtype=int)
+    for r in range(rows):
+        for c in range(cols):
+            if offset + 1 + r * cols + c in positive:  # חיובי במודל = התא חי
+                grid[r, c] = 1
+    return grid
+
+
+def blocking_clause(model, variables):
+    """
+    מחזיר פסוקית שמונעת חזרה על ההשמה של המודל למשתנים הנתונים.
+    """
+    positive = set(lit for lit in model if lit > 0)
+    # אם var היה 1, כעת הוא צריך להיות 0, ולהפך
+    return [-var if var in positive else var for var in variables]
+
+
+class Cancellation:
+    """
+    אות ביטול שמשותף בין threads.
+
+    cancel() מסמן שהחיפוש צריך להיעצר, ואם Solver רץ כרגע תחת attach הוא
+    נקטע מיד (solver.interrupt). הנעילה מבטיחה שלא קוטעים Solver שכבר נמחק.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._solver = None
+
+    def cancel(self):
+        with self._lock:
+            self._event.set()
+            if self._solver is not None:
+                self._solver.interrupt()
+
+    def is_set(self):
+        return self._event.is_set()
+
+    @contextmanager
+    def attach(self, solver):
+        with self._lock:
+            self._solver = solver
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._solver = None
+
+
+def limited_solve(solver, assumptions=(), budget=None, deadline=None, cancel=None,
+                  conflict_slice=None, on_progress=None):
+    """
+    קריאה אחת ל-solve שאפשר להגביל, לקטוע ולעקוב אחריה.
+
+    Args:
+        solver: מופע של pysat Solver
+        assumptions: הנחות לקריאה
+        budget: תקציב קונפליקטים כולל לקריאה (None = ללא הגבלה)
+        deadline: זמן (לפי time.time) שאחריו מפסיקים
+        cancel: אובייקט Cancellation אופציונלי
+        conflict_slice: אם ניתן, הפתרון רץ בפרוסות של מספר קונפליקטים זה,
+            ובין פרוסה לפרוסה נבדקים הביטול ומגבלת הזמן ונקרא on_progress
+        on_progress: פונקציה שמקבלת את ה-Solver אחרי כל פרוסה
+
+    Returns:
+        True אם יש פתרון, False אם אין, None אם הקריאה הופסקה לפני שהוכרע
+    """
+    assumptions = list(assumptions)
+    if budget is None and deadline is None and cancel is None and conflict_slice is None:
+        return solver.solve(assumptions=assumptions)
+
+    if cancel is not None and cancel.is_set():
+        return None
+
+    spent = 0
+    while True:
+        step = conflict_slice
+        if budget is not None:
+            step = budget - spent if step is None else min(step, budget - spent)
+        if step is not None:
+            solver.conf_budget(step)
+        conflicts_before = solver.accum_stats().get('conflicts', 0)
+
+        if cancel is not None:
+            with cancel.attach(solver):
+                result = solver.solve_limited(assumptions=assumptions, expect_interrupt=True)
+        else:
+            result = solver.solve_limited(assumptions=assumptions)
+
+        spent += solver.accum_stats().get('conflicts', 0) - conflicts_before
+        if on_progress is not None:
+            on_progress(solver)
+        if result is not None:
+            return result
+
+        if cancel is not None:
+            solver.clear_interrupt()
+            if cancel.is_set():
+                return None
+        if step is None or (budget is not None and spent >= budget):
+            return None
+        if deadline is not None and time.time() > deadline:
+            return None
+
+
+def iter_models(solver, variables, max_solutions=None, time_limit=None, assumptions=(), guard=None,
+                stats=None, cancel=None, conflict_slice=None, on_progress=None):
+    """
+    מחזיר את מודלי הנוסחה בזה אחר זה, כאשר כל מודל נחסם אחרי שהוחזר.
+
+    Args:
+        solver: מופע של pysat Solver שהנוסחה כבר נטענה אליו
+        variables: המשתנים שעליהם נחסמים הפתרונות (פתרונות נבדלים רק בהם)
+        max_solutions: מקסימום פתרונות להחזיר (None = ללא הגבלה)
+        time_limit: מגבלת זמן בשניות (None = ללא הגבלה)
+        assumptions: הנחות שמועברות לכל קריאה ל-solve
+        guard: משתנה בורר; אם ניתן, פסוקיות החסימה תקפות רק כשהוא דלוק,
+            כך שאותו Solver ממשיך לשמש שאילתות אחרות
+        stats: אובייקט SolveStats אופציונלי שאליו נרשם זמן כל קריאה ל-solve
+        cancel, conflict_slice, on_progress: כמו ב-limited_solve; כשאחד מהם ניתן,
+            מגבלת הזמן נבדקת גם באמצע קריאה ל-solve ולא רק בין פתרונות
+
+    Yields:
+        המודל (רשימת ליטרלים) של כל פתרון
+    """
+    start_time = time.time()
+    deadline = start_time + time_limit if time_limit is not None else None
+    limited = cancel is not None or conflict_slice is not None
+    found = 0
+
+    while True:
+        # בדיקת מגבלת זמן
+        if time_limit is not None and time.time() - start_time > time_limit:
+            break
+
+        solve_start = time.perf_counter()
+        if limited:
+            satisfiable = limited_solve(solver, assumptions, deadline=deadline, cancel=cancel,
+                                        conflict_slice=conflict_slice, on_progress=on_progress)
+        else:
+            satisfiable = solver.solve(assumptions=list(assumptions))
+        if stats is not None:
+            stats.solve_times.append(time.perf_counter() - solve_start)
+        if not satisfiable:
+            break
+
+        model = solver.get_model()
+        yield model
+
+        clause = blocking_clause(model, variables)
+        if guard is not None:
+            clause.append(-guard)
+        solver.add_clause(clause)
+
+        # בדיקה אם הגענו למספר מקסימלי של פתרונות
+        found += 1
+        if max_solutions is not None and found >= max_solutions:
+            break
@@ -0,0 +1,377 @@
+"""
+שירות HTTP מקומי לשאילתות מצב קודם, מעל מאגר התהליכים של pool.py.
+
+משתמש רק בספרייה הסטנדרטית (http.server), כך שאפשר להריץ אותו בכל מקום
+שבו רץ המנוע עצמו:
+
+    python -m life.service --port 8000
+
+נקודות הקצה:
+    POST   /jobs                 שליחת שאילתה; גוף JSON עם grid ופרמטרים אופציונליים
+    GET    /jobs/<id>            מצב העבודה
+    GET    /jobs/<id>/solutions  הפתרונות כ-NDJSON (שורת JSON לכל פתרון) ברגע שהם נמצאים
+    DELETE /jobs/<id>            ביטול
+    GET    /metrics              מונים בפורמט הטקסט של Prometheus
+"""
+import argparse
+import itertools
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from .pool import PoolBusy, SolverPool
+from .rules import DONT_CARE
+
+# גבולות הקלט של שאילתה אחת
+MAX_CELLS = 64 * 64
+MAX_SOLUTIONS = 1000
+MAX_TIME_LIMIT = 300
+
+# מספר העבודות שהסתיימו ששומרים כדי שאפשר יהיה עדיין לקרוא את התוצאות שלהן
+KEEP_FINISHED = 1000
+
+# גבולות הדליים (בשניות) של היסטוגרמת זמן הטיפול בעבודה
+LATENCY_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+# כל כמה זמן (בשניות) זרם הפתרונות בודק אם יש פתרונות חדשים
+STREAM_POLL = 0.1
+
+
+class BadRequest(ValueError):
+    """
+    קלט לא תקין בבקשה; מוחזר ללקוח כתשובת 400.
+    """
+
+
+def parse_query(body, default_user=''):
+    """
+    בודק את גוף הבקשה של POST /jobs וממיר אותו לפרמטרים של SolverPool.submit.
+
+    Args:
+        body: גוף הבקשה (JSON)
+        default_user: המשתמש כשהבקשה לא מציינת 'user'; השרת מעביר את כתובת
+            הלקוח, כדי שלקוחות אנונימיים לא יחלקו מכסה אחת של max_per_user
+
+    Raises:
+        BadRequest: אם הגוף לא תקין
+    """
+    try:
+        query = json.loads(body or b'{}')
+    except ValueError:
+        raise BadRequest("body must be JSON")
+    if not isinstance(query, dict) or 'grid' not in query:
+        raise BadRequest("missing 'grid'")
+
+    # null בתא פירושו שלא משנה מה יהיה בו (DONT_CARE)
+    try:
+        rows = [[DONT_CARE if v is None else v for v in row] for row in query['grid']]
+        grid = np.array(rows, dtype=int)
+    except (TypeError, ValueError):
+        raise BadRequest("'grid' must be a rectangular array of 0/1/null")
+    if grid.ndim != 2 or grid.size == 0 or not np.isin(grid, (0, 1, DONT_CARE)).all():
+        raise BadRequest("'grid' must be a rectangular array of 0/1/null")
+    if grid.size > MAX_CELLS:
+        raise BadRequest(f"'grid' has more than {MAX_CELLS} cells")
+
+    max_solutions = query.get('max_solutions', 10)
+    time_limit = query.get('time_limit', 10)
+    # bool הוא תת-מחלקה של int, ולכן true/false נדחים במפורש
+    if isinstance(max_solutions, bool) or not isinstance(max_solutions, int) or not 1 <= max_solutions <= MAX_SOLUTIONS:
+        raise BadRequest(f"'max_solutions' must be an integer between 1 and {MAX_SOLUTIONS}")
+    if isinstance(time_limit, bool) or not isinstance(time_limit, (int, float)) or not 0 < time_limit <= MAX_TIME_LIMIT:
+        raise BadRequest(f"'time_limit' must be a number between 0 and {MAX_TIME_LIMIT}")
+
+    return {
+        'target_state': grid,
+        'max_solutions': max_solutions,
+        'time_limit': time_limit,
+        'diverse': bool(query.get('diverse', False)),
+        'user': str(query['user']) if 'user' in query else default_user,
+    }
+
+
+class Metrics:
+    """
+    מונים ומדדים לחשיפה ב-/metrics.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.rejected = 0
+        self.coalesced = 0
+        self.finished = {}  # status -> count
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+        self.latency_count = 0
+
+    def count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def observe(self, job):
+        """
+        רושם עבודה שהסתיימה: הסטטוס שלה והזמן מהשליחה ועד הסיום.
+        """
+        latency = job.end_time - job.submit_time
+        with self._lock:
+            self.finished[job.status] = self.finished.get(job.status, 0) + 1
+            self.latency_sum += latency
+            self.latency_count += 1
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if latency <= bound:
+                    self.latency_buckets[i] += 1
+
+    def render(self, pool):
+        """
+        מחזיר את כל המדדים בפורמט הטקסט של Prometheus.
+        """
+        with self._lock:
+            lines = [
+                '# HELP preimage_jobs_submitted_total Queries accepted by the service.',
+                '# TYPE preimage_jobs_submitted_total counter',
+                f'preimage_jobs_submitted_total {self.submitted}',
+                '# HELP preimage_jobs_rejected_total Queries rejected because the pool was busy.',
+                '# TYPE preimage_jobs_rejected_total counter',
+                f'preimage_jobs_rejected_total {self.rejected}',
+                '# HELP preimage_jobs_coalesced_total Queries served by an identical in-flight job.',
+                '# TYPE preimage_jobs_coalesced_total counter',
+                f'preimage_jobs_coalesced_total {self.coalesced}',
+                '# HELP preimage_jobs_finished_total Jobs that finished, by final status.',
+                '# TYPE preimage_jobs_finished_total counter',
+            ]
+            for status, count in sorted(self.finished.items()):
+                lines.append(f'preimage_jobs_finished_total{{status="{status}"}} {count}')
+            lines += [
+                '# HELP preimage_job_latency_seconds Time from submission to completion.',
+                '# TYPE preimage_job_latency_seconds histogram',
+            ]
+            for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets):
+                lines.append(f'preimage_job_latency_seconds_bucket{{le="{bound}"}} {count}')
+            lines += [
+                f'preimage_job_latency_seconds_bucket{{le="+Inf"}} {self.latency_count}',
+                f'preimage_job_latency_seconds_sum {self.latency_sum:.6f}',
+                f'preimage_job_latency_seconds_count {self.latency_count}',
+            ]
+        lines += [
+            '# HELP preimage_queue_depth Jobs waiting for a worker.',
+            '# TYPE preimage_queue_depth gauge',
+            f'preimage_queue_depth {pool.queue_depth}',
+            '# HELP preimage_jobs_running Jobs currently running on a worker.',
+            '# TYPE preimage_jobs_running gauge',
+            f'preimage_jobs_running {pool.running_count}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+
+class PreimageService:
+    """
+    הלוגיקה של השירות, בנפרד משכבת ה-HTTP.
+
+    לכל שליחה יש מזהה משלה גם כשהיא אוחדה עם שאילתה זהה, כך שביטול של
+    לקוח אחד לא עוצר את העבודה עבור לקוח אחר.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.metrics = Metrics()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs = OrderedDict()  # id -> [PoolJob, cancelled]
+
+    def submit(self, query):
+        """
+        Returns:
+            המזהה של העבודה החדשה
+
+        Raises:
+            PoolBusy: אם המאגר דחה את השאילתה
+        """
+        try:
+            job = self.pool.submit(**query)
+        except PoolBusy:
+            self.metrics.count('rejected')
+            raise
+        self.metrics.count('submitted')
+        if job.subscribers > 1:
+            self.metrics.count('coalesced')
+        else:
+            job.add_done_callback(self.metrics.observe)
+
+        with self._lock:
+            job_id = str(next(self._ids))
+            self._jobs[job_id] = [job, False]
+            self._evict()
+        return job_id
+
+    def _evict(self):
+        finished = [i for i, (job, _) in self._jobs.items() if not job.running]
+        for job_id in finished[:max(0, len(finished) - KEEP_FINISHED)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            entry = self._jobs.get(job_id)
+        return entry[0] if entry else None
+
+    def cancel(self, job_id):
+        """
+        מבטל את השליחה job_id. מחזיר False אם אין עבודה כזו.
+        """
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None:
+                return False
+            already, entry[1] = entry[1], True
+        if not already:
+            entry[0].cancel()
+        return True
+
+    def status(self, job_id):
+        job = self.get(job_id)
+        if job is None:
+            return None
+        return {
+            'id': job_id,
+            'status': job.status,
+            'solutions': len(job.solutions),
+            'conflicts': job.conflicts,
+            'elapsed': round(job.elapsed, 3),
+            'error': str(job.error) if job.error else None,
+            'stats': None if job.running else job.stats.as_dict(),
+        }
+
+    def iter_solutions(self, job_id):
+        """
+        מחזיר את שורות ה-NDJSON של הפתרונות ברגע שהם נמצאים, ובסוף שורת מצב.
+        """
+        job = self.get(job_id)
+        sent = 0
+        while True:
+            running = job.running
+            solutions = job.solutions[sent:]
+            for solution in solutions:
+                yield json.dumps({'solution': solution.tolist()}) + '\n'
+            sent += len(solutions)
+            if not running:
+                break
+            job.join(STREAM_POLL)
+        yield json.dumps({'status': job.status, 'solutions': sent}) + '\n'
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """
+    ממפה את בקשות ה-HTTP לשירות (self.server.service).
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def _parts(self):
+        return [p for p in self.path.split('?')[0].split('/') if p]
+
+    def _send_json(self, code, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_found(self):
+        self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self._parts() != ['jobs']:
+            return self._not_found()
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            query = parse_query(self.rfile.read(length), default_user=self.client_address[0])
+            job_id = self.server.service.submit(query)
+        except BadRequest as e:
+            return self._send_json(400, {'error': str(e)})
+        except PoolBusy as e:
+            return self._send_json(503, {'error': str(e)})
+        self._send_json(202, self.server.service.status(job_id))
+
+    def do_GET(self):
+        service = self.server.service
+        parts = self._parts()
+        if parts == ['metrics']:
+            body = service.metrics.render(service.pool).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            status = service.status(parts[1])
+            if status is None:
+                return self._not_found()
+            self._send_json(200, status)
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'solutions':
+            if service.get(parts[1]) is None:
+                return self._not_found()
+            self._stream(service.iter_solutions(parts[1]))
+        else:
+            self._not_found()
+
+    def do_DELETE(self):
+        parts = self._parts()
+        if len(parts) != 2 or parts[0] != 'jobs' or not self.server.service.cancel(parts[1]):
+            return self._not_found()
+        self._send_json(200, self.server.service.status(parts[1]))
+
+    def _stream(self, lines):
+        # chunked, כדי שהלקוח יקבל כל פתרון מיד כשהוא נמצא
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for line in lines:
+            data = line.encode()
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+            self.wfile.flush()
+        self.wfile.write(b'0\r\n\r\n')
+
+    def log_message(self, format, *args):
+        pass  # השרת שקט; המדדים זמינים ב-/metrics
+
+
+def make_server(host='127.0.0.1', port=8000, pool=None):
+    """
+    יוצר שרת HTTP (בלי להפעיל אותו). port=0 בוחר פורט פנוי.
+
+    Returns:
+        מופע של ThreadingHTTPServer עם השדה service
+    """
+    server = ThreadingHTTPServer((host, port), ServiceHandler)
+    server.daemon_threads = True
+    server.service = PreimageService(pool or SolverPool())
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Game of Life preimage HTTP service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-queue', type=int, default=64)
+    parser.add_argument('--max-per-user', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    pool = SolverPool(workers=args.workers, max_queue=args.max_queue, max_per_user=args.max_per_user)
+    server = make_server(args.host, args.port, pool)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+סטטיסטיקות ומדידת זמנים לכל שלב בשאילתת מצב קודם.
+"""
+import time
+from contextlib import contextmanager
+
+
+class SolveStats:
+    """
+    מרכז את הזמנים והמונים של שאילתה אחת: קידוד, עיבוד מקדים, פתרון, פענוח ואימות.
+
+    כל הזמנים בשניות. solver_stats מכיל את המונים של accum_stats() של
+    ה-Solver (conflicts, decisions, propagations, restarts). preprocess מכיל
+    את מוני העיבוד המקדים (tiles, revisions, forced, eden).
+    """
+
+    def __init__(self):
+        self.encode_time = 0.0
+        self.preprocess_time = 0.0
+        self.decode_time = 0.0
+        self.verify_time = 0.0
+        self.variables = 0
+        self.clauses = 0
+        self.solve_times = []  # זמן הריצה של כל קריאה ל-solve
+        self.solver_stats = {}
+        self.preprocess = {}
+
+    @contextmanager
+    def phase(self, name):
+        """
+        מודד את זמן הריצה של הבלוק ומוסיף אותו ל-<name>_time.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            attr = f'{name}_time'
+            setattr(self, attr, getattr(self, attr) + time.perf_counter() - start)
+
+    def record_formula(self, formula):
+        self.variables = max(self.variables, formula.nv)
+        self.clauses += len(formula.clauses)
+
+    def record_solver(self, solver):
+        for key, value in solver.accum_stats().items():
+            self.solver_stats[key] = self.solver_stats.get(key, 0) + value
+
+    def merge(self, other):
+        """
+        מוסיף את הסטטיסטיקות של שאילתה אחרת (למשל קובייה שנפתרה בתהליך אחר).
+        """
+        self.encode_time += other.encode_time
+        self.preprocess_time += other.preprocess_time
+        self.decode_time += other.decode_time
+        self.verify_time += other.verify_time
+        self.variables = max(self.variables, other.variables)
+        self.clauses += other.clauses
+        self.solve_times.extend(other.solve_times)
+        for key, value in other.solver_stats.items():
+            self.solver_stats[key] = self.solver_stats.get(key, 0) + value
+        for key, value in other.preprocess.items():
+            self.preprocess[key] = self.preprocess.get(key, 0) + value
+
+    @property
+    def solve_time(self):
+        return sum(self.solve_times)
+
+    def as_dict(self):
+        return {
+            'encode_time': self.encode_time,
+            'preprocess_time': self.preprocess_time,
+            'preprocess': dict(self.preprocess),
+            'variables': self.variables,
+            'clauses': self.clauses,
+            'solve_calls': len(self.solve_times),
+            'solve_time': self.solve_time,
+            'solve_times': list(self.solve_times),
+            'decode_time': self.decode_time,
+            'verify_time': self.verify_time,
+            'solver_stats': dict(self.solver_stats),
+        }
+
+    def __repr__(self):
+        return (f"SolveStats(encode={self.encode_time:.4f}s, preprocess={self.preprocess_time:.4f}s, "
+                f"forced={self.preprocess.get('forced', 0)}, vars={self.variables}, "
+                f"clauses={self.clauses}, solves={len(self.solve_times)}, "
+                f"solve={self.solve_time:.4f}s, decode={self.decode_time:.4f}s, "
+                f"verify={self.verify_time:.4f}s, solver={self.solver_stats})")
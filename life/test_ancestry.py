@@ -0,0 +1,51 @@
+import itertools
+import unittest
+
+import numpy as np
+
+from life import eden_depth, next_state
+
+
+def brute_force_depth(target, limit):
+    """
+    העומק המדויק על לוח קטן, בחישוב קדימה של כל המצבים.
+    """
+    rows, cols = target.shape
+    states = [np.array(bits).reshape(rows, cols) for bits in itertools.product((0, 1), repeat=rows * cols)]
+    step = {s.tobytes(): next_state(s).tobytes() for s in states}
+    reachable = set(step)  # מצבים עם שרשרת אבות באורך depth לפחות
+    depth = 0
+    while depth < limit and target.tobytes() in {step[s] for s in reachable}:
+        reachable = {step[s] for s in reachable}
+        depth += 1
+    return depth
+
+
+class TestEdenDepth(unittest.TestCase):
+    def test_garden_of_eden(self):
+        depth, chain, exact = eden_depth(np.array([[1, 0]]))
+        self.assertEqual((depth, exact), (0, True))
+        self.assertEqual(len(chain), 1)
+
+    def test_chain_is_valid(self):
+        target = np.zeros((5, 5), dtype=int)
+        target[2, 1:4] = 1
+        depth, chain, exact, stats = eden_depth(target, max_depth=4, return_stats=True)
+        self.assertEqual((depth, exact), (4, False))  # הבלינקר מתנודד, אין לו גן עדן
+        for older, newer in zip(chain, chain[1:]):
+            self.assertTrue(np.array_equal(next_state(older), newer))
+        self.assertTrue(np.array_equal(chain[-1], target))
+        self.assertEqual(len(stats.solve_times), 4)
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(3)
+        for _ in range(12):
+            target = (rng.random((3, 3)) < 0.4).astype(int)
+            depth, chain, exact = eden_depth(target, max_depth=6)
+            self.assertEqual(depth, brute_force_depth(target, 6))
+            if depth < 6:
+                self.assertTrue(exact)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import copy
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from life.bench import (CORPUS_VERSION, check_import_budget, compare, corpus, import_times, load_baseline, run,
+                        save_baseline)
+
+
+class TestBench(unittest.TestCase):
+    def test_corpus_is_deterministic(self):
+        first, second = corpus(), corpus()
+        self.assertEqual([name for name, _ in first], [name for name, _ in second])
+        self.assertEqual(len({name for name, _ in first}), len(first))
+        for (_, a), (_, b) in zip(first, second):
+            self.assertTrue(np.array_equal(a, b))
+
+    def test_run_and_compare(self):
+        cases = [(name, target) for name, target in corpus(quick=True) if name.startswith(('example/', 'eden/'))]
+        results = run(solvers=['glucose4'], repeat=1, cases=cases, imports=False)
+        self.assertEqual(results['results']['eden/full_3x3@glucose4']['solutions'], 0)
+        self.assertEqual(results['results']['example/block@glucose4']['solutions'], 51)
+        self.assertTrue(all(r['valid'] for r in results['results'].values()))
+        self.assertEqual(compare(results, results), [])
+
+        slower = copy.deepcopy(results)
+        slower['results']['example/block@glucose4']['enumerate'] += 1.0
+        slower['results']['eden/full_3x3@glucose4']['solutions'] = 1
+        problems = compare(slower, results)
+        self.assertEqual(len(problems), 2)
+        self.assertTrue(problems[0].startswith('example/block@glucose4: enumerate'))
+
+        slower['corpus_version'] += 1
+        with self.assertRaises(ValueError):
+            compare(slower, results)
+
+    def test_committed_baseline_covers_the_corpus(self):
+        baseline = load_baseline()
+        self.assertIsNotNone(baseline, "no committed baseline for the current CORPUS_VERSION")
+        self.assertEqual(baseline['corpus_version'], CORPUS_VERSION)
+        names = {key.split('@')[0] for key in baseline['results']}
+        self.assertEqual(names, {name for name, _ in corpus()})
+
+    def test_save_baseline_keeps_other_versions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            self.assertIsNone(load_baseline(path))
+            save_baseline({'corpus_version': 1, 'results': {}}, path)
+            save_baseline({'corpus_version': 2, 'results': {}}, path)
+            self.assertEqual(load_baseline(path, version=1)['corpus_version'], 1)
+            self.assertEqual(load_baseline(path, version=2)['corpus_version'], 2)
+
+    def test_import_life_is_lazy(self):
+        imports = import_times(['life', 'life.pool'], repeat=1)
+        self.assertEqual(imports['life']['forbidden'], [])
+        self.assertEqual(imports['life.pool']['forbidden'], [])
+        self.assertEqual(check_import_budget({'life': {'seconds': 1.0, 'forbidden': ['numpy']}}),
+                         ['import life: 1000.0 ms, budget 10 ms', 'import life: loads numpy'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import stat
+import sys
+import tempfile
+import textwrap
+import unittest
+
+import numpy as np
+
+from life import encode_preimage, next_state, read_dimacs, solve_external, write_dimacs
+from life.dimacs import parse_solver_output
+
+# Solver "חיצוני" מינימלי שמדבר בפורמט של תחרויות SAT, לבדיקת הגשר
+FAKE_SOLVER = textwrap.dedent(f"""\
+    #!{sys.executable}
+    import sys
+    from pysat.formula import CNF
+    from pysat.solvers import Solver
+    with Solver(name='glucose4', bootstrap_with=CNF(from_file=sys.argv[-1]).clauses) as solver:
+        if solver.solve():
+            print('s SATISFIABLE')
+            print('v', ' '.join(map(str, solver.get_model())), '0')
+            sys.exit(10)
+        print('s UNSATISFIABLE')
+        sys.exit(20)
+""")
+
+
+class TestDimacs(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.target = np.zeros((5, 5), dtype=int)
+        self.target[2, 1:4] = 1
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip(self):
+        expected = encode_preimage(self.target)
+        for name in ('preimage.cnf', 'preimage.cnf.gz'):
+            path = os.path.join(self.tmp.name, name)
+            write_dimacs(self.target, path)
+            formula, target = read_dimacs(path)
+            self.assertEqual(formula.clauses, expected.clauses)
+            self.assertTrue(np.array_equal(target, self.target))
+
+    def test_parse_solver_output(self):
+        self.assertEqual(parse_solver_output("c hi\ns SATISFIABLE\nv 1 -2\nv 3 0\n"), (True, [1, -2, 3]))
+        self.assertEqual(parse_solver_output("s UNSATISFIABLE\n"), (False, None))
+        self.assertEqual(parse_solver_output("s UNKNOWN\n"), (None, None))
+
+    def test_external_solver(self):
+        solver = os.path.join(self.tmp.name, 'fake-solver')
+        with open(solver, 'w') as fp:
+            fp.write(FAKE_SOLVER)
+        os.chmod(solver, os.stat(solver).st_mode | stat.S_IEXEC)
+
+        preimage = solve_external(self.target, solver=solver, time_limit=60)
+        self.assertTrue(np.array_equal(next_state(preimage), self.target))
+
+        eden = np.ones((3, 3), dtype=int)
+        self.assertIsNone(solve_external(eden, solver=solver, time_limit=60))
+
+        with self.assertRaises(FileNotFoundError):
+            solve_external(self.target, solver='no-such-solver-binary')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from life import HashLife, next_state
+
+
+GLIDER = np.array([
+    [0, 1, 0],
+    [0, 0, 1],
+    [1, 1, 1],
+])
+
+
+class TestHashLife(unittest.TestCase):
+    def test_matches_next_state(self):
+        rng = np.random.default_rng(0)
+        for generations in (1, 2, 5, 13):
+            grid = (rng.random((6, 7)) < 0.4).astype(int)
+            margin = generations + 1
+            expected = np.pad(grid, margin)
+            for _ in range(generations):
+                expected = next_state(expected)
+
+            universe = HashLife.from_array(grid)
+            universe.advance(generations)
+            result = universe.to_array(-margin, -margin, *expected.shape)
+            self.assertTrue(np.array_equal(result, expected))
+            self.assertEqual(universe.generation, generations)
+
+    def test_round_trip(self):
+        grid = np.zeros((5, 9), dtype=int)
+        grid[1:4, 2:5] = GLIDER
+        self.assertTrue(np.array_equal(HashLife.from_array(grid).to_array(), grid))
+
+    def test_glider_jump(self):
+        universe = HashLife.from_array(GLIDER)
+        universe.step(10)
+        self.assertEqual(universe.generation, 1024)
+        self.assertEqual(universe.bounding_box(), (256, 256, 3, 3))
+        self.assertTrue(np.array_equal(universe.to_array(256, 256, 3, 3), GLIDER))
+
+    def test_collect_bounds_memory(self):
+        universe = HashLife.from_array(GLIDER, max_nodes=200)
+        for _ in range(8):
+            universe.step(4)
+        self.assertLessEqual(universe.node_count, 400)
+        self.assertEqual(universe.population, 5)
+        self.assertEqual(universe.bounding_box(), (32, 32, 3, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
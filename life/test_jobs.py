@@ -0,0 +1,55 @@
+import threading
+import time
+import unittest
+
+import numpy as np
+from pysat.examples.genhard import PHP
+from pysat.solvers import Solver
+
+from life import PreimageJob, next_state
+from life.search import Cancellation, limited_solve
+
+
+class TestPreimageJob(unittest.TestCase):
+    def test_runs_to_completion(self):
+        target = np.zeros((5, 5), dtype=int)
+        target[2, 1:4] = 1
+        job = PreimageJob(target, max_solutions=5, time_limit=10).start()
+        job.join(timeout=10)
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(len(job.solutions), 5)
+        self.assertEqual(job.verify(), [True] * 5)
+        self.assertEqual(job.progress, 1.0)
+        for solution in job.solutions:
+            self.assertTrue(np.array_equal(next_state(solution), target))
+
+    def test_cancel(self):
+        target = (np.random.default_rng(0).random((14, 14)) < 0.3).astype(int)
+        job = PreimageJob(target, max_solutions=10 ** 9, time_limit=60).start()
+        time.sleep(0.5)
+        self.assertTrue(job.running)
+        job.cancel()
+        job.join(timeout=5)
+        self.assertEqual(job.status, 'cancelled')
+        self.assertLess(job.elapsed, 5)
+
+    def test_cancel_interrupts_running_solver(self):
+        solver = Solver(name='glucose4', bootstrap_with=PHP(10).clauses)
+        cancel = Cancellation()
+        threading.Timer(0.3, cancel.cancel).start()
+        start = time.time()
+        self.assertIsNone(limited_solve(solver, cancel=cancel))
+        self.assertLess(time.time() - start, 3)
+        solver.delete()
+
+    def test_diverse(self):
+        target = np.zeros((5, 5), dtype=int)
+        target[2, 1:4] = 1
+        job = PreimageJob(target, max_solutions=3, diverse=True).start()
+        job.join(timeout=10)
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(job.verify(), [True] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
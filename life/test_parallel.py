@@ -0,0 +1,48 @@
+import time
+import unittest
+
+import numpy as np
+
+from life import find_preimage, find_preimage_parallel, next_state
+from life.parallel import iter_preimages_parallel, make_cubes
+
+
+class TestParallel(unittest.TestCase):
+    def test_cubes_are_disjoint_and_cover(self):
+        target = np.zeros((4, 4), dtype=int)
+        target[1, 1:3] = 1
+        cubes = make_cubes(target, 3)
+        self.assertEqual(len(cubes), 8)
+        self.assertEqual(len({tuple(cube) for cube in cubes}), 8)
+        self.assertEqual(len({abs(lit) for cube in cubes for lit in cube}), 3)
+
+    def test_matches_sequential_enumeration(self):
+        rng = np.random.default_rng(3)
+        for _ in range(3):
+            target = (rng.random((4, 4)) < 0.3).astype(int)
+            expected = find_preimage(target, return_first=False, max_solutions=None)
+            solutions = find_preimage_parallel(target, max_solutions=None, workers=2, cube_depth=3)
+            keys = [s.tobytes() for s in solutions]
+            self.assertEqual(len(keys), len(set(keys)))
+            self.assertEqual(set(keys), {s.tobytes() for s in expected})
+            for solution in solutions:
+                self.assertTrue(np.array_equal(next_state(solution), target))
+
+    def test_max_solutions(self):
+        target = np.zeros((5, 5), dtype=int)
+        target[2, 1:4] = 1
+        self.assertEqual(len(find_preimage_parallel(target, max_solutions=7, workers=2)), 7)
+
+    def test_close_stops_workers_without_time_limit(self):
+        # ללוח ריק 12x12 יש מספר עצום של מצבים קודמים; סגירת המחולל חייבת לקטוע את התהליכים
+        target = np.zeros((12, 12), dtype=int)
+        solutions = iter_preimages_parallel(target, time_limit=None, workers=2, cube_depth=2)
+        first = next(solutions)
+        self.assertTrue(np.array_equal(next_state(first), target))
+        start = time.time()
+        solutions.close()
+        self.assertLess(time.time() - start, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
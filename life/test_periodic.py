@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+
+from life import PeriodicSearch, find_periodic, next_state
+
+
+def run(pattern, generations, margin):
+    grid = np.pad(pattern, margin)
+    for _ in range(generations):
+        grid = next_state(grid)
+    return grid
+
+
+class TestPeriodic(unittest.TestCase):
+    def assertPeriodic(self, pattern, period, shift=(0, 0)):
+        dx, dy = shift
+        margin = period + 1
+        expected = np.roll(np.pad(pattern, margin), (dy, dx), axis=(0, 1))
+        self.assertTrue(np.array_equal(run(pattern, period, margin), expected))
+
+    def test_still_life(self):
+        pattern = find_periodic(4, 4, 1)
+        self.assertIsNotNone(pattern)
+        self.assertGreater(pattern.sum(), 0)
+        self.assertPeriodic(pattern, 1)
+
+    def test_oscillator_has_exact_period(self):
+        patterns = find_periodic(3, 3, 2, return_first=False, max_solutions=5)
+        self.assertGreater(len(patterns), 0)
+        for pattern in patterns:
+            self.assertPeriodic(pattern, 2)
+            self.assertFalse(np.array_equal(run(pattern, 1, 3)[3:-3, 3:-3], pattern))
+
+    def test_glider(self):
+        search = PeriodicSearch(5, 5, shift=(1, 1))
+        try:
+            period, pattern = search.search(4)
+        finally:
+            search.delete()
+        self.assertEqual(period, 4)
+        self.assertPeriodic(pattern, 4, (1, 1))
+
+    def test_population_bounds(self):
+        self.assertIsNone(find_periodic(4, 4, 1, max_population=3))
+        pattern = find_periodic(4, 4, 1, min_population=5)
+        self.assertGreaterEqual(pattern.sum(), 5)
+        self.assertPeriodic(pattern, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import time
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+
+import numpy as np
+
+from life import PoolBusy, SolverPool, next_state
+
+
+def blinker():
+    target = np.zeros((5, 5), dtype=int)
+    target[2, 1:4] = 1
+    return target
+
+
+class TestSolverPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = SolverPool(workers=1, max_queue=3, max_per_user=3)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_solutions_are_valid(self):
+        target = blinker()
+        job = self.pool.submit(target, max_solutions=5, time_limit=10, user='a')
+        job.join(timeout=30)
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(len(job.solutions), 5)
+        self.assertEqual(job.verify(), [True] * 5)
+        for solution in job.solutions:
+            self.assertTrue(np.array_equal(next_state(solution), target))
+
+    def test_identical_queries_are_coalesced(self):
+        first = self.pool.submit(blinker(), max_solutions=3, user='a')
+        second = self.pool.submit(blinker(), max_solutions=3, user='b')
+        self.assertIs(first, second)
+        # ביטול של שולח אחד לא עוצר את העבודה עבור השני
+        first.cancel()
+        second.join(timeout=30)
+        self.assertEqual(second.status, 'done')
+
+    def test_round_robin_between_users(self):
+        blocker = (np.random.default_rng(0).random((14, 14)) < 0.3).astype(int)
+        running = self.pool.submit(blocker, max_solutions=10 ** 9, time_limit=60, user='x')
+        jobs = {}
+        for name, user, n in [('a1', 'a', 1), ('a2', 'a', 2), ('b1', 'b', 3)]:
+            target = np.zeros((6, 6), dtype=int)
+            target[1:1 + n, 2] = 1
+            target[4, 1:4] = 1
+            jobs[name] = self.pool.submit(target, max_solutions=1, user=user)
+        self.assertEqual(self.pool.queue_depth, 3)
+        running.cancel()
+        for job in jobs.values():
+            job.join(timeout=30)
+        order = sorted(jobs, key=lambda name: jobs[name].start_time)
+        self.assertEqual(order, ['a1', 'b1', 'a2'])
+
+    def test_admission_control(self):
+        pool = SolverPool(workers=1, max_queue=1, max_per_user=1)
+        try:
+            blocker = (np.random.default_rng(0).random((14, 14)) < 0.3).astype(int)
+            running = pool.submit(blocker, max_solutions=10 ** 9, time_limit=60, user='a')
+            with self.assertRaises(PoolBusy):
+                pool.submit(blinker(), user='a')  # יותר מדי עבודות למשתמש
+            queued = pool.submit(blinker(), user='b')
+            self.assertEqual(queued.status, 'queued')
+            with self.assertRaises(PoolBusy):
+                pool.submit(blinker(), max_solutions=2, user='c')  # התור מלא
+            queued.cancel()
+            self.assertEqual(queued.status, 'cancelled')
+            start = time.time()
+            running.cancel()
+            running.join(timeout=10)
+            self.assertEqual(running.status, 'cancelled')
+            self.assertLess(time.time() - start, 5)
+        finally:
+            pool.close()
+
+    def test_callbacks_may_use_the_pool(self):
+        # ה-callbacks רצים אחרי שחרור הנעילה, כך שמותר להם לפנות למאגר
+        seen = []
+        job = self.pool.submit(blinker(), max_solutions=2, user='a')
+        job.add_done_callback(lambda j: seen.append((j.position, self.pool.queue_depth)))
+        job.join(timeout=30)
+        for _ in range(50):
+            if seen:
+                break
+            time.sleep(0.1)
+        self.assertEqual(seen, [(None, 0)])
+
+    def test_submit_with_a_future_that_is_already_done(self):
+        # add_done_callback של future שכבר הסתיים קורא ל-_on_done מיד, כשהנעילה מוחזקת
+        def failed_submit(*args, **kwargs):
+            future = Future()
+            future.set_exception(RuntimeError("worker died"))
+            return future
+
+        with mock.patch.object(self.pool._executor, 'submit', failed_submit):
+            job = self.pool.submit(blinker(), user='a')
+        self.assertEqual(job.status, 'error')
+        self.assertEqual(self.pool.running_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+
+from life import DONT_CARE, encode_preimage, find_preimage, matches_target, next_state
+
+
+BLINKER = np.array([
+    [0, 0, 0, 0, 0],
+    [0, 0, 1, 0, 0],
+    [0, 0, 1, 0, 0],
+    [0, 0, 1, 0, 0],
+    [0, 0, 0, 0, 0],
+])
+
+
+class TestPreimage(unittest.TestCase):
+    def test_first_solution_is_valid(self):
+        solution = find_preimage(BLINKER)
+        self.assertIsNotNone(solution)
+        self.assertTrue(np.array_equal(next_state(solution), BLINKER))
+
+    def test_all_solutions_are_valid_and_distinct(self):
+        solutions = find_preimage(BLINKER, return_first=False, max_solutions=20)
+        self.assertEqual(len(solutions), 20)
+        self.assertEqual(len({s.tobytes() for s in solutions}), len(solutions))
+        for solution in solutions:
+            self.assertTrue(np.array_equal(next_state(solution), BLINKER))
+
+    def test_garden_of_eden(self):
+        # תא חי יחיד בפינה של לוח 1x2 עם שכן מת: אין לו מצב קודם
+        target = np.array([[1, 0]])
+        self.assertIsNone(find_preimage(target))
+        self.assertEqual(find_preimage(target, return_first=False), [])
+
+    def test_dont_care_cells(self):
+        target = np.full((12, 12), DONT_CARE)
+        target[1:6, 1:6] = BLINKER
+        self.assertLess(len(encode_preimage(target).clauses), len(encode_preimage(np.zeros((12, 12))).clauses) / 3)
+
+        solutions = find_preimage(target, return_first=False, max_solutions=50)
+        self.assertEqual(len(solutions), 50)
+        self.assertEqual(len({s.tobytes() for s in solutions}), len(solutions))
+        for solution in solutions:
+            self.assertTrue(matches_target(solution, target))
+            self.assertFalse(solution[8:, :].any())  # תאים שלא משפיעים על אף תא ידוע
+
+
+if __name__ == '__main__':
+    unittest.main()
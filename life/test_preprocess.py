@@ -0,0 +1,47 @@
+import unittest
+
+import numpy as np
+
+from life import find_preimage
+from life.preimage import iter_preimages
+from life.preprocess import UNKNOWN, propagate, tile_codes
+
+
+class TestPreprocess(unittest.TestCase):
+    def test_tile_tables(self):
+        # תא שחי בדור הבא: לידה (מרכז מת, 3 שכנים) או הישרדות (מרכז חי, 2 או 3 שכנים)
+        self.assertEqual(int(tile_codes(3).sum()), 56 + 28 + 56)
+        self.assertEqual(len(tile_codes(4)), 2 ** 16)
+        self.assertTrue(set(np.unique(tile_codes(4))) <= set(range(16)))
+
+    def test_forced_cells_agree_with_all_solutions(self):
+        rng = np.random.default_rng(1)
+        for _ in range(40):
+            target = (rng.random(tuple(rng.integers(3, 6, size=2))) < 0.3).astype(int)
+            solutions = list(iter_preimages(target, preprocess=False))
+            values = propagate(target)
+            if values is None:
+                self.assertEqual(solutions, [])
+                continue
+            known = values != UNKNOWN
+            for solution in solutions:
+                self.assertTrue(np.array_equal(solution[known], values[known]))
+            self.assertEqual(len(list(iter_preimages(target))), len(solutions))
+
+    def test_garden_of_eden_without_solver(self):
+        target = np.array([[1, 0]])
+        solution, stats = find_preimage(target, return_stats=True)
+        self.assertIsNone(solution)
+        self.assertEqual(stats.preprocess['eden'], 1)
+        self.assertEqual(stats.solve_times, [])
+
+    def test_live_cell_with_two_neighbors_is_forced(self):
+        # לתא האמצעי בלוח 1x3 יש רק שני שכנים: הוא יכול לחיות רק אם הוא ושניהם חיים
+        counters = {}
+        values = propagate(np.array([[0, 1, 0]]), counters=counters)
+        self.assertEqual(values.tolist(), [[1, 1, 1]])
+        self.assertEqual(counters['forced'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
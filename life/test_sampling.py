@@ -0,0 +1,34 @@
+import itertools
+import unittest
+
+import numpy as np
+
+from life import find_preimage, next_state, sample_preimages
+
+
+class TestSampling(unittest.TestCase):
+    def test_samples_are_valid_and_spread(self):
+        target = np.zeros((6, 6), dtype=int)
+        target[2, 1:4] = 1
+        samples = sample_preimages(target, k=4, seed=0)
+        self.assertEqual(len(samples), 4)
+        for sample in samples:
+            self.assertTrue(np.array_equal(next_state(sample), target))
+
+        spread = min(int((a != b).sum()) for a, b in itertools.combinations(samples, 2))
+        first = find_preimage(target, return_first=False, max_solutions=4)
+        first_spread = min(int((a != b).sum()) for a, b in itertools.combinations(first, 2))
+        self.assertGreater(spread, first_spread)
+
+    def test_stops_when_solutions_run_out(self):
+        target = np.array([[0, 0, 0], [1, 1, 1], [0, 0, 0]])
+        expected = find_preimage(target, return_first=False)
+        samples = sample_preimages(target, k=5)
+        self.assertEqual(len(samples), len(expected))
+
+    def test_garden_of_eden(self):
+        self.assertEqual(sample_preimages(np.array([[1, 0]])), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import threading
+import unittest
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+from life.pool import SolverPool
+from life.service import BadRequest, make_server, parse_query
+
+
+class TestPreimageService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = SolverPool(workers=1, max_queue=1, max_per_user=1)
+        cls.server = make_server(port=0, pool=cls.pool)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.pool.close()
+
+    def request(self, method, path, payload=None):
+        data = json.dumps(payload).encode() if payload is not None else None
+        request = urllib.request.Request(self.url + path, data=data, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, response.read().decode()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode()
+
+    def test_submit_and_stream(self):
+        blinker = [[0] * 5, [0] * 5, [0, 1, 1, 1, 0], [0] * 5, [0] * 5]
+        code, body = self.request('POST', '/jobs', {'grid': blinker, 'max_solutions': 3, 'user': 'a'})
+        self.assertEqual(code, 202)
+        job_id = json.loads(body)['id']
+
+        code, body = self.request('GET', f'/jobs/{job_id}/solutions')
+        self.assertEqual(code, 200)
+        lines = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[-1], {'status': 'done', 'solutions': 3})
+        self.assertEqual(len(lines[0]['solution']), 5)
+
+        code, body = self.request('GET', f'/jobs/{job_id}')
+        status = json.loads(body)
+        self.assertEqual(status['status'], 'done')
+        self.assertIsNotNone(status['stats'])
+
+        code, body = self.request('GET', '/metrics')
+        self.assertIn('preimage_jobs_finished_total{status="done"} 1', body)
+        self.assertIn('preimage_queue_depth 0', body)
+
+    def test_cancel_and_errors(self):
+        code, _ = self.request('POST', '/jobs', {'grid': [[0, 2]]})
+        self.assertEqual(code, 400)
+        code, _ = self.request('GET', '/jobs/999')
+        self.assertEqual(code, 404)
+
+        grid = (np.random.default_rng(0).random((14, 14)) < 0.3).astype(int).tolist()
+        code, body = self.request('POST', '/jobs', {'grid': grid, 'max_solutions': 1000,
+                                                    'time_limit': 60, 'user': 'b'})
+        self.assertEqual(code, 202)
+        job_id = json.loads(body)['id']
+        code, _ = self.request('POST', '/jobs', {'grid': grid, 'max_solutions': 999, 'user': 'b'})
+        self.assertEqual(code, 503)
+
+        code, _ = self.request('DELETE', f'/jobs/{job_id}')
+        self.assertEqual(code, 200)
+        code, body = self.request('GET', f'/jobs/{job_id}/solutions')
+        self.assertEqual(json.loads(body.splitlines()[-1])['status'], 'cancelled')
+
+
+class TestParseQuery(unittest.TestCase):
+    def test_booleans_are_not_numbers(self):
+        for field in ('max_solutions', 'time_limit'):
+            with self.subTest(field=field):
+                with self.assertRaises(BadRequest):
+                    parse_query(json.dumps({'grid': [[0, 1]], field: True}).encode())
+
+    def test_default_user(self):
+        self.assertEqual(parse_query(b'{"grid": [[1]]}', default_user='10.0.0.1')['user'], '10.0.0.1')
+        self.assertEqual(parse_query(b'{"grid": [[1]], "user": "a"}', default_user='10.0.0.1')['user'], 'a')
+
+
+if __name__ == '__main__':
+    unittest.main()
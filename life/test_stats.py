@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+from life import find_preimage, find_preimage_parallel, sample_preimages
+from life.stats import SolveStats
+
+
+TARGET = np.array([
+    [0, 0, 0, 0],
+    [0, 1, 1, 0],
+    [0, 1, 0, 0],
+    [0, 0, 0, 0],
+])
+
+
+class TestStats(unittest.TestCase):
+    def test_find_preimage_stats(self):
+        solutions, stats = find_preimage(TARGET, return_first=False, max_solutions=3, return_stats=True)
+        self.assertEqual(len(solutions), 3)
+        self.assertEqual(stats.variables, TARGET.size)
+        self.assertGreater(stats.clauses, 0)
+        self.assertEqual(len(stats.solve_times), 3)
+        self.assertGreater(stats.encode_time, 0)
+        self.assertIn('conflicts', stats.solver_stats)
+        self.assertIn('decisions', stats.solver_stats)
+
+    def test_result_unchanged_without_stats(self):
+        self.assertIsInstance(find_preimage(TARGET), np.ndarray)
+        solution, stats = find_preimage(TARGET, return_stats=True)
+        self.assertIsInstance(stats, SolveStats)
+
+    def test_phase_accumulates(self):
+        stats = SolveStats()
+        with stats.phase('verify'):
+            pass
+        first = stats.verify_time
+        with stats.phase('verify'):
+            sum(range(1000))
+        self.assertGreater(stats.verify_time, first)
+
+    def test_other_engines(self):
+        samples, stats = sample_preimages(TARGET, k=2, return_stats=True)
+        self.assertGreater(len(stats.solve_times), 0)
+        solutions, stats = find_preimage_parallel(TARGET, max_solutions=None, workers=2, cube_depth=2,
+                                                  return_stats=True)
+        self.assertEqual(len(stats.solve_times), len(solutions) + 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
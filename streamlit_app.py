@@ -1,9 +1,11 @@
+import time
+import uuid
+
 import streamlit as st
 import numpy as np
-from pysat.formula import CNF
-from pysat.solvers import Solver
-from itertools import product, combinations as iter_combinations
-import time
+
+from grid_widget import grid_editor, grid_svg
+from life import DONT_CARE, PoolBusy, SolverPool
 
 st.set_page_config(
     page_title="מציאת מצב קודם במשחק החיים",
@@ -11,6 +13,16 @@ st.set_page_config(
     layout="wide"
 )
 
+
+@st.cache_resource
+def get_solver_pool():
+    # מאגר תהליכים אחד לכל השרת, משותף לכל ה-sessions
+    return SolverPool()
+
+
+if 'user_id' not in st.session_state:
+    st.session_state.user_id = uuid.uuid4().hex
+
 # CSS לכיוון טקסט מימין לשמאל ועיצוב נוסף
 st.markdown("""
 <style>
@@ -24,22 +36,6 @@ st.markdown("""
     .stButton>button {
         width: 100%;
     }
-    .alive-cell {
-        background-color: #4CAF50;
-        color: white;
-        border-radius: 5px;
-        padding: 10px;
-        text-align: center;
-        margin: 2px;
-    }
-    .dead-cell {
-        background-color: #f8f9fa;
-        border: 1px solid #ddd;
-        border-radius: 5px;
-        padding: 10px;
-        text-align: center;
-        margin: 2px;
-    }
     h1, h2, h3 {
         direction: rtl;
         text-align: right;
@@ -65,252 +61,30 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# --- פונקציות הליבה מהקוד המקורי ---
-
-def find_preimage(target_state, return_first=True, max_solutions=100, time_limit=30):
-    """
-    מחפש מצב קודם שיוביל למצב המטרה אחרי צעד אחד במשחק החיים.
-    
-    Args:
-        target_state: מערך דו ממדי NumPy המייצג את מצב המטרה (1 לתאים חיים, 0 לתאים מתים)
-        return_first: האם להחזיר רק את הפתרון הראשון (True) או את כל הפתרונות (False)
-        max_solutions: מקסימום פתרונות לחפש אם return_first=False
-        time_limit: מגבלת זמן בשניות
-    
-    Returns:
-        אם return_first=True: preimage_state מצב קודם כמערך NumPy, או None אם לא נמצא פתרון
-        אם return_first=False: רשימה של preimage_states וגם מספר כולל אם יותר מ-max_solutions
-    """
-    rows, cols = target_state.shape
-    
-    # יוצר נוסחת CNF
-    formula = CNF()
-    
-    # פונקציית עזר להמרת מיקום תא למספר משתנה
-    def cell_to_var(r, c):
-        return 1 + r * cols + c
-    
-    # מכין מיפוי הפוך ממשתנה למיקום תא
-    var_to_cell = {}
-    for r in range(rows):
-        for c in range(cols):
-            var_to_cell[cell_to_var(r, c)] = (r, c)
-    
-    # יוצר אילוצים עבור כל תא במצב המטרה
-    for r in range(rows):
-        for c in range(cols):
-            target_cell = target_state[r, c]
-            center_var = cell_to_var(r, c)
-            
-            # אוסף את כל השכנים האפשריים
-            neighbors = []
-            for dr, dc in product([-1, 0, 1], [-1, 0, 1]):
-                if dr == 0 and dc == 0:  # דילוג על התא עצמו
-                    continue
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < rows and 0 <= nc < cols:
-                    neighbors.append(cell_to_var(nr, nc))
-            
-            # יוצר אילוצים לפי חוקי משחק החיים
-            if target_cell == 1:  # התא חי במצב המטרה
-                # מקרה 1: התא היה חי וישרוד לדור הבא (2-3 שכנים)
-                # מקרה 2: התא היה מת ונולד בדור הבא (בדיוק 3 שכנים)
-                
-                # יוצרים את כל המצבים הלא חוקיים ומוסיפים את ההיפוך שלהם
-                not_valid_cases = []
-                
-                # תא חי עם פחות מ-2 שכנים (מת מבדידות)
-                for alive_count in range(2):
-                    for alive_combo in iter_combinations(neighbors, alive_count):
-                        clause = [center_var]  # התא חי
-                        for n in neighbors:
-                            if n in alive_combo:
-                                clause.append(n)  # שכן חי
-                            else:
-                                clause.append(-n)  # שכן מת
-                        not_valid_cases.append(clause)
-                
-                # תא חי עם יותר מ-3 שכנים (מת מצפיפות)
-                for alive_count in range(4, len(neighbors) + 1):
-                    for alive_combo in iter_combinations(neighbors, alive_count):
-                        clause = [center_var]  # התא חי
-                        for n in neighbors:
-                            if n in alive_combo:
-                                clause.append(n)  # שכן חי
-                            else:
-                                clause.append(-n)  # שכן מת
-                        not_valid_cases.append(clause)
-                
-                # תא מת שלא בדיוק 3 שכנים (לא נולד)
-                for alive_count in range(len(neighbors) + 1):
-                    if alive_count != 3:  # כל מקרה חוץ מ-3 שכנים חיים
-                        for alive_combo in iter_combinations(neighbors, alive_count):
-                            clause = [-center_var]  # התא מת
-                            for n in neighbors:
-                                if n in alive_combo:
-                                    clause.append(n)  # שכן חי
-                                else:
-                                    clause.append(-n)  # שכן מת
-                            not_valid_cases.append(clause)
-                
-                # הופכים את כל המקרים הלא חוקיים לאילוצי "לפחות אחד מהם חייב להתקיים"
-                for clause in not_valid_cases:
-                    formula.append([-lit for lit in clause])
-                    
-            else:  # התא מת במצב המטרה
-                # מקרה 1: התא היה חי ומת (פחות מ-2 או יותר מ-3 שכנים)
-                # מקרה 2: התא היה מת ונשאר מת (לא בדיוק 3 שכנים)
-                
-                # יוצרים את כל המצבים הלא חוקיים ומוסיפים את ההיפוך שלהם
-                not_valid_cases = []
-                
-                # תא חי עם 2-3 שכנים (חי בדור הבא - לא מתאים)
-                for alive_count in range(2, 4):
-                    for alive_combo in iter_combinations(neighbors, alive_count):
-                        clause = [center_var]  # התא חי
-                        for n in neighbors:
-                            if n in alive_combo:
-                                clause.append(n)  # שכן חי
-                            else:
-                                clause.append(-n)  # שכן מת
-                        not_valid_cases.append(clause)
-                
-                # תא מת עם בדיוק 3 שכנים (נולד בדור הבא - לא מתאים)
-                for alive_combo in iter_combinations(neighbors, 3):
-                    clause = [-center_var]  # התא מת
-                    for n in neighbors:
-                        if n in alive_combo:
-                            clause.append(n)  # שכן חי
-                        else:
-                            clause.append(-n)  # שכן מת
-                    not_valid_cases.append(clause)
-                
-                # הופכים את כל המקרים הלא חוקיים
-                for clause in not_valid_cases:
-                    formula.append([-lit for lit in clause])
-    
-    # פותר את הנוסחה
-    solver = Solver(name='glucose4')
-    solver.append_formula(formula)
-    
-    if return_first:
-        # רק הפתרון הראשון
-        if solver.solve():
-            model = solver.get_model()
-            
-            # המרת המודל בחזרה למצב משחק
-            preimage = np.zeros((rows, cols), dtype=int)
-            for r in range(rows):
-                for c in range(cols):
-                    var = cell_to_var(r, c)
-                    if var in model:  # חיובי במודל = התא חי
-                        preimage[r, c] = 1
-            
-            solver.delete()
-            return preimage
-        else:
-            solver.delete()
-            return None  # אין פתרון
-    else:
-        # מחפש מספר פתרונות
-        solutions = []
-        start_time = time.time()
-        
-        while True:
-            # בדיקת מגבלת זמן
-            if time.time() - start_time > time_limit:
-                break
-                
-            # פתרון
-            if solver.solve():
-                model = solver.get_model()
-                
-                # המרת המודל בחזרה למצב משחק
-                preimage = np.zeros((rows, cols), dtype=int)
-                for r in range(rows):
-                    for c in range(cols):
-                        var = cell_to_var(r, c)
-                        if var in model:  # חיובי במודל = התא חי
-                            preimage[r, c] = 1
-                
-                solutions.append(preimage.copy())
-                
-                # מוסיף פסוקית שמונעת חזרה על פתרון זה
-                blocking_clause = []
-                for var in range(1, rows * cols + 1):
-                    if var in model:
-                        blocking_clause.append(-var)  # אם var היה 1, כעת הוא צריך להיות 0
-                    else:
-                        blocking_clause.append(var)   # אם var היה 0, כעת הוא צריך להיות 1
-                
-                solver.add_clause(blocking_clause)
-                
-                # בדיקה אם הגענו למספר מקסימלי של פתרונות
-                if len(solutions) >= max_solutions:
-                    break
-            else:
-                break
-        
-        solver.delete()
-        return solutions
-
-def next_state(grid):
-    """
-    מחשב את המצב הבא לפי חוקי משחק החיים
-    
-    Args:
-        grid: מערך דו ממדי NumPy המייצג את המצב הנוכחי
-        
-    Returns:
-        new_grid: מערך דו ממדי NumPy המייצג את המצב הבא
-    """
-    rows, cols = grid.shape
-    new_grid = np.zeros_like(grid)
-    
-    for r in range(rows):
-        for c in range(cols):
-            # סופר שכנים חיים
-            live_neighbors = 0
-            for dr, dc in product([-1, 0, 1], [-1, 0, 1]):
-                if dr == 0 and dc == 0:
-                    continue  # מדלג על התא עצמו
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < rows and 0 <= nc < cols and grid[nr, nc] == 1:
-                    live_neighbors += 1
-            
-            # מיישם את חוקי משחק החיים
-            if grid[r, c] == 1:  # תא חי
-                if 2 <= live_neighbors <= 3:
-                    new_grid[r, c] = 1  # הישרדות
-            else:  # תא מת
-                if live_neighbors == 3:
-                    new_grid[r, c] = 1  # לידה
-    
-    return new_grid
-
 # --- ממשק משתמש של Streamlit ---
 
 st.markdown('<h2 class="rtl">בחר את מצב המטרה</h2>', unsafe_allow_html=True)
 
-# סלקטור לבחירת גודל הלוח (3x3 עד 8x8)
+# סלקטור לבחירת גודל הלוח (3x3 עד 64x64)
 col1, col2 = st.columns([1, 3])
 with col1:
-    grid_size = st.slider("גודל הלוח:", min_value=3, max_value=8, value=5, step=1)
+    grid_size = st.slider("גודל הלוח:", min_value=3, max_value=64, value=5, step=1)
 
 with col2:
     st.markdown("""
     <div class="rtl">
-    <p>בחר גודל לוח והגדר את מצב המטרה על ידי לחיצה על התאים שברצונך שיהיו חיים (צבועים בירוק). לאחר מכן, לחץ על כפתור "מצא מצב קודם" כדי לחשב את המצב הקודם.</p>
+    <p>בחר גודל לוח והגדר את מצב המטרה על ידי לחיצה על התאים שברצונך שיהיו חיים (צבועים בירוק), או גרירה על פני כמה תאים. לאחר מכן, לחץ על כפתור "מצא מצב קודם" כדי לחשב את המצב הקודם.</p>
     <p>מצב "גן עדן" הוא מצב שלא ניתן להגיע אליו מאף מצב קודם.</p>
+    <p>במצב צביעה "לא משנה" מסמנים תאים (באפור) שלא משנה אם יהיו חיים או מתים. החיפוש מתעלם מהם, ולכן הוא מהיר יותר כשרק אזור אחד של הלוח חשוב.</p>
     </div>
     """, unsafe_allow_html=True)
 
 # יצירת לוח אינטראקטיבי
-st.markdown('<div class="rtl">לחץ על תאים כדי לסמן אותם כ"חיים":</div>', unsafe_allow_html=True)
+st.markdown('<div class="rtl">לחץ או גרור על תאים כדי לסמן אותם כ"חיים" (גרירה שמתחילה בתא חי מוחקת):</div>', unsafe_allow_html=True)
 
 # מסדר את הנתונים בתוך לוח (מטריצה)
 if 'grid_data' not in st.session_state:
-    st.session_state.grid_data = np.zeros((8, 8), dtype=int)  # מקסימום 8x8
+    st.session_state.grid_data = np.zeros((grid_size, grid_size), dtype=int)
 
 # עדכון גודל הנתונים אם משתנה גודל הלוח
 if st.session_state.grid_data.shape[0] != grid_size:
@@ -321,20 +95,12 @@ if st.session_state.grid_data.shape[0] != grid_size:
     temp[:min_rows, :min_cols] = st.session_state.grid_data[:min_rows, :min_cols]
     st.session_state.grid_data = temp
 
-# מציג את הלוח כרשת של כפתורים
-for r in range(grid_size):
-    cols = st.columns(grid_size)
-    for c in range(grid_size):
-        with cols[c]:
-            key = f"cell_{r}_{c}"
-            if st.button(
-                "⬤" if st.session_state.grid_data[r, c] == 1 else "○", 
-                key=key,
-                help=f"תא בשורה {r+1}, עמודה {c+1}"
-            ):
-                # מחליף את מצב התא בין חי למת
-                st.session_state.grid_data[r, c] = 1 - st.session_state.grid_data[r, c]
-                st.rerun()
+paint_mode = st.radio("מצב צביעה:", ["חי / מת", "לא משנה"], horizontal=True)
+
+# מציג את הלוח כרכיב יחיד; כל גרירה מגיעה כעדכון אחד
+edited_grid = grid_editor(st.session_state.grid_data, key="target_grid", dont_care_mode=paint_mode == "לא משנה")
+if edited_grid is not None:
+    st.session_state.grid_data = edited_grid
 
 # כפתורים לשליטה במצב הלוח
 col1, col2, col3 = st.columns(3)
@@ -348,7 +114,8 @@ with col2:
         st.rerun()
 with col3:
     if st.button("הפוך הכל"):
-        st.session_state.grid_data = 1 - st.session_state.grid_data
+        grid = st.session_state.grid_data
+        st.session_state.grid_data = np.where(grid == DONT_CARE, grid, 1 - grid)
         st.rerun()
 
 # דוגמאות מוכנות מראש
@@ -413,66 +180,101 @@ target_matrix = st.session_state.grid_data[:grid_size, :grid_size].copy()
 
 # כפתור לחיפוש מצב קודם
 st.markdown("<hr>", unsafe_allow_html=True)
+diverse_solutions = st.checkbox(
+    "פתרונות מגוונים",
+    help="מחזיר פתרונות שרחוקים זה מזה ככל האפשר, במקום הפתרונות הראשונים שנמצאו (שלרוב נבדלים בתא או שניים)"
+)
 if st.button("מצא מצב קודם", type="primary"):
-    if np.sum(target_matrix) == 0:
+    if not np.any(target_matrix == 1):
         st.warning("הלוח ריק. אנא בחר לפחות תא אחד כ'חי'.")
     else:
-        with st.spinner("מחפש את המצב הקודם..."):
-            max_solutions_to_find = 10
-            time_limit_seconds = 10
-            
-            # מציג את הספירה לאחור
-            progress_text = "חיפוש פתרון בעזרת SAT Solver..."
-            progress_bar = st.progress(0)
-            
-            solutions = []
-            solutions = find_preimage(
-                target_matrix, 
-                return_first=False, 
-                max_solutions=max_solutions_to_find,
-                time_limit=time_limit_seconds
+        # מבטל חיפוש קודם שעדיין רץ ושולח חיפוש חדש למאגר התהליכים המשותף
+        previous_job = st.session_state.get('preimage_job')
+        if previous_job is not None and previous_job.running:
+            previous_job.cancel()
+            st.session_state.preimage_job = None
+        try:
+            st.session_state.preimage_job = get_solver_pool().submit(
+                target_matrix,
+                max_solutions=5 if diverse_solutions else 10,
+                time_limit=10,
+                diverse=diverse_solutions,
+                user=st.session_state.user_id
             )
-            
-            progress_bar.progress(100)
+        except PoolBusy:
+            st.error("השרת עמוס כרגע. אנא נסה שוב בעוד כמה שניות.")
+
+job = st.session_state.get('preimage_job')
+if job is not None and job.status == 'queued':
+    # כל התהליכים תפוסים; הדף מתרענן עד שהחיפוש מתחיל
+    st.info(f"ממתין בתור... {get_solver_pool().queue_depth} חיפושים ממתינים")
+    if st.button("ביטול"):
+        job.cancel()
+    else:
+        time.sleep(0.5)
+    st.rerun()
+
+elif job is not None and job.running:
+    # החיפוש רץ בתהליך נפרד; הדף מתרענן כל חצי שנייה ומציג את ההתקדמות
+    st.progress(
+        job.progress,
+        text=f"מחפש את המצב הקודם... נמצאו {len(job.solutions)} פתרונות | "
+             f"{job.elapsed:.1f} שניות | {job.conflicts} קונפליקטים"
+    )
+    if st.button("ביטול"):
+        job.cancel()
+        job.join(timeout=1)
+    else:
+        time.sleep(0.5)
+    st.rerun()
+
+elif job is not None:
+    solutions = job.solutions
+    valid = job.verify()
+
+    if job.status == 'cancelled':
+        st.warning(f"החיפוש בוטל אחרי {job.elapsed:.1f} שניות.")
+    elif job.status == 'error':
+        st.error(f"שגיאה בחיפוש: {job.error}")
+
+    # הדפסת התוצאות
+    if solutions and len(solutions) > 0:
+        st.success(f"נמצאו {len(solutions)} פתרונות!")
+        st.markdown('<h2 class="rtl">התוצאות:</h2>', unsafe_allow_html=True)
         
-        # הדפסת התוצאות
-        if solutions and len(solutions) > 0:
-            st.success(f"נמצאו {len(solutions)} פתרונות!")
-            st.markdown('<h2 class="rtl">התוצאות:</h2>', unsafe_allow_html=True)
+        # מציג מספר פתרונות ראשונים
+        for i, solution in enumerate(solutions[:5]):
+            st.markdown(f'<h3 class="rtl">פתרון {i+1}:</h3>', unsafe_allow_html=True)
             
-            # מציג מספר פתרונות ראשונים
-            for i, solution in enumerate(solutions[:5]):
-                st.markdown(f'<h3 class="rtl">פתרון {i+1}:</h3>', unsafe_allow_html=True)
-                
-                # הצגה גרפית של הפתרון
-                for r in range(grid_size):
-                    cols = st.columns(grid_size)
-                    for c in range(grid_size):
-                        with cols[c]:
-                            if solution[r, c] == 1:
-                                st.markdown('<div class="alive-cell">⬤</div>', unsafe_allow_html=True)
-                            else:
-                                st.markdown('<div class="dead-cell">○</div>', unsafe_allow_html=True)
-                
-                # אימות הפתרון
-                next_gen = next_state(solution)
-                is_valid = np.array_equal(next_gen, target_matrix)
-                
-                if is_valid:
-                    st.success("✓ פתרון תקף! המצב הבא של פתרון זה תואם את מצב המטרה.")
-                else:
-                    st.error("✗ פתרון לא תקף! המצב הבא של פתרון זה אינו תואם את מצב המטרה.")
-                
-                st.markdown("<hr>", unsafe_allow_html=True)
+            # הצגה גרפית של הפתרון כתמונת SVG אחת
+            st.markdown(grid_svg(solution), unsafe_allow_html=True)
             
-            if len(solutions) > 5:
-                st.info(f"קיימים עוד {len(solutions) - 5} פתרונות נוספים שלא מוצגים כאן.")
-        else:
-            st.error("""
-            לא נמצא מצב קודם למצב המטרה!
+            # אימות הפתרון
+            if valid[i]:
+                st.success("✓ פתרון תקף! המצב הבא של פתרון זה תואם את מצב המטרה.")
+            else:
+                st.error("✗ פתרון לא תקף! המצב הבא של פתרון זה אינו תואם את מצב המטרה.")
             
-            זהו כנראה מצב "גן עדן" (Garden of Eden) - מצב שלא יכול להתקבל מאף מצב קודם לפי חוקי משחק החיים.
-            """)
+            st.markdown("<hr>", unsafe_allow_html=True)
+        
+        if len(solutions) > 5:
+            st.info(f"קיימים עוד {len(solutions) - 5} פתרונות נוספים שלא מוצגים כאן.")
+    elif job.status == 'done':
+        st.error("""
+        לא נמצא מצב קודם למצב המטרה!
+        
+        זהו כנראה מצב "גן עדן" (Garden of Eden) - מצב שלא יכול להתקבל מאף מצב קודם לפי חוקי משחק החיים.
+        """)
+
+    # סטטיסטיקות של השאילתה: זמן כל שלב ומוני ה-SAT Solver
+    solve_stats = job.stats
+    with st.expander("סטטיסטיקות פתרון"):
+        stats_col1, stats_col2, stats_col3, stats_col4 = st.columns(4)
+        stats_col1.metric("קידוד", f"{solve_stats.encode_time:.3f} שנ'")
+        stats_col2.metric("פתרון", f"{solve_stats.solve_time:.3f} שנ'")
+        stats_col3.metric("פענוח", f"{solve_stats.decode_time:.3f} שנ'")
+        stats_col4.metric("אימות", f"{solve_stats.verify_time:.3f} שנ'")
+        st.json(solve_stats.as_dict())
 
 # מידע נוסף
 st.markdown("<hr>", unsafe_allow_html=True)